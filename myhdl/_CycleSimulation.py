@@ -0,0 +1,503 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the CycleSimulation class """
+from __future__ import absolute_import
+from __future__ import print_function
+
+from myhdl import StopSimulation
+from myhdl._compat import integer_types
+from myhdl import _simulator, SimulationError
+from myhdl._simulator import _SimState, _local
+from myhdl._Signal import _Signal, _DelayedSignal
+from myhdl._ShadowSignal import _ShadowSignal
+from myhdl._memory import Memory, _MemoryWord
+from myhdl._always import _Always
+from myhdl._always_seq import _AlwaysSeq
+from myhdl._always_comb import _AlwaysComb, _levelize
+from myhdl._block import _Block
+from myhdl._intbv import intbv
+from myhdl._Simulation import Simulation, _flatten, _bindSignals
+from myhdl._restore import _restore
+from myhdl._util import _printExcInfo
+from myhdl.conversion._toPython import _toPython, _raw, _lanesIntbv, _lanesBool
+from myhdl.conversion._toPython import numpy
+
+
+class _error:
+    pass
+_error.ArgType = "CycleSimulation argument should be a block instance"
+_error.ProcType = "Process %s is not an always_seq, always_comb or single edge always block"
+_error.EdgeDriven = "Clock or reset signal is driven by a process"
+_error.SigType = "Shadow and delayed signals are not supported"
+_error.MemType = "Memory objects are not supported, use a list of signals"
+_error.NoClock = "Design has no clock"
+_error.Duration = "A cycle-based simulation needs a duration"
+_error.Until = "A cycle-based simulation can only run until a time"
+_error.NoNumpy = "Lanes mode requires NumPy"
+_error.LanesTrace = "Signal tracing is not supported in lanes mode"
+_error.NoLanes = "Simulation is not in lanes mode"
+_error.LaneSig = "Signal is not part of the compiled design"
+_error.LaneEdge = "Edge-sensitive signals can't differ between lanes"
+
+
+class CycleSimulation(Simulation):
+
+    """ Cycle-based simulation of a fully synchronous block.
+
+    Every process should be an always_seq block, an always_comb block,
+    or an always block sensitive to a single edge. The simulator drives
+    the clocks itself. On each clock edge it calls the sequential
+    functions directly, and then evaluates the always_comb functions
+    whose inputs changed in dependency order. Signal assignments have
+    the same semantics as in an event-driven simulation.
+
+    Input signals can be assigned between calls to run. Such changes are
+    applied before the next clock edge.
+
+    In compiled mode, the process bodies are first translated into
+    Python functions that work on plain int values (see
+    myhdl.conversion._toPython). This is much faster, but the process
+    bodies are restricted to the convertible subset.
+
+    Lanes mode simulates N copies of the design at once. It is a
+    compiled mode in which every signal value is a NumPy array of N lane
+    values, so that each process body runs once per edge for all lanes.
+    The lanes can be given different values with drive, and read back
+    with values. The signal objects keep their values, and clocks and
+    other edge-sensitive signals are common to all lanes.
+
+    Methods:
+    run -- run a simulation for some duration
+    values -- return the lane values of a signal (lanes mode)
+    drive -- set the lane values of a signal (lanes mode)
+    restore -- load the signal values at some time from a VCD file
+
+    """
+
+    def __init__(self, top, period=10, compiled=False, lanes=None):
+        """ Construct a cycle-based simulation object.
+
+        top -- block instance
+        period -- clock period for all clocks, or a sequence of
+                  (clock, period) pairs (default: 10)
+        compiled -- compile the processes into Python functions
+                    (default: off)
+        lanes -- number of design copies to simulate in lanes mode
+                 (default: off)
+
+        """
+        if not isinstance(top, _Block):
+            raise SimulationError(_error.ArgType, str(type(top)))
+        state = self._state = _simulator._pending()
+        _bindSignals(state, [top])
+        self._top = top
+        self._elaborate(_flatten(top), period)
+        self._design = None
+        self._lanes = lanes
+        self._drives = {}
+        if lanes is not None:
+            if numpy is None:
+                raise SimulationError(_error.NoNumpy)
+            if state.tracing:
+                raise SimulationError(_error.LanesTrace)
+            compiled = True
+        if compiled:
+            self._compile()
+        self._cosims = []
+        self._started = False
+        self._finished = False
+        self._nbranches = 0
+        self._suspendTime = None
+        state.owned = True
+        _local.pending = _SimState()
+        _local.current = state
+        state.time = 0
+        del state.futureEvents[:]
+        for s in state.siglist:
+            s._queued = False
+        del state.siglist[:]
+
+    def _elaborate(self, insts, period):
+        combs = []
+        seqs = []
+        for inst in insts:
+            if isinstance(inst, _AlwaysComb):
+                combs.append(inst)
+            elif isinstance(inst, _AlwaysSeq) or \
+                    (type(inst) is _Always and len(inst.senslist) == 1 and
+                     hasattr(inst.senslist[0], 'sig')):
+                seqs.append(inst)
+            else:
+                raise SimulationError(_error.ProcType %
+                                      getattr(inst, 'name', type(inst).__name__))
+            for n, m in inst.losdict.items():
+                if isinstance(m, Memory):
+                    raise SimulationError(_error.MemType, n)
+            for s in _sigs(inst):
+                if isinstance(s, _MemoryWord):
+                    raise SimulationError(_error.MemType, s._name or repr(s))
+                if isinstance(s, (_ShadowSignal, _DelayedSignal)):
+                    raise SimulationError(_error.SigType, s._name or repr(s))
+
+        driven = set()
+        for inst in insts:
+            for n in inst.outputs:
+                v = inst.symdict[n]
+                if isinstance(v, _Signal):
+                    driven.add(id(v))
+                elif isinstance(v, list):
+                    driven.update(id(s) for s in v)
+
+        # processes by edge: key is (id(sig), posedge)
+        edgeinsts = {}
+        edgeprocs = {}
+        clocks = []
+        for inst in seqs:
+            edges = list(inst.senslist)
+            func = _seqFunc(inst)
+            clk = edges[0].sig
+            if not any(c is clk for c in clocks):
+                clocks.append(clk)
+            for e in edges:
+                if id(e.sig) in driven:
+                    raise SimulationError(_error.EdgeDriven, e.sig._name or '')
+                posedge = e is e.sig._posedgeWaiters
+                edgeinsts.setdefault((id(e.sig), posedge), []).append(inst)
+                edgeprocs.setdefault((id(e.sig), posedge), []).append(func)
+        if not clocks:
+            raise SimulationError(_error.NoClock)
+        self._edgeinsts = edgeinsts
+        self._edgeprocs = edgeprocs
+
+        combs = self._combinsts = _levelize(combs)
+        readers = {}
+        for i, c in enumerate(combs):
+            for s in c.senslist:
+                readers.setdefault(id(s), []).append(i)
+        self._combs = [(c.func, c.outsigs) for c in combs]
+        self._readers = readers
+
+        periods = {}
+        if isinstance(period, (list, tuple)):
+            for clk, p in period:
+                periods[id(clk)] = p
+            period = None
+        # each clock entry: [next edge time, clock, low time, high time,
+        #                      posedge functions, negedge functions]
+        self._clocks = []
+        for clk in clocks:
+            p = periods.get(id(clk), period)
+            if p is None:
+                p = 10
+            half = p // 2
+            self._clocks.append([half, clk, half, p - half,
+                                 edgeprocs.get((id(clk), True), []),
+                                 edgeprocs.get((id(clk), False), [])])
+
+    def _compile(self):
+        trace = None
+        if self._state.tracing:
+            trace = self._trace
+        design = self._design = _toPython(self._edgeinsts, self._combinsts,
+                                          trace, self._lanes)
+        # compiled clock entries: [next edge time, clock slot, low time,
+        #   high time, posedge function, negedge function, comb readers]
+        self._cclocks = []
+        for c in self._clocks:
+            clk = c[1]
+            k = design.slot(clk)
+            self._cclocks.append([c[0], k, c[2], c[3],
+                                  design.procs.get((id(clk), True)),
+                                  design.procs.get((id(clk), False)),
+                                  k in design.combreads])
+        design.load()
+
+    def _slot(self, sig):
+        if self._lanes is None:
+            raise SimulationError(_error.NoLanes)
+        k = self._design._slots.get(id(sig))
+        if k is None:
+            raise SimulationError(_error.LaneSig, sig._name or repr(sig))
+        return k
+
+    def values(self, sig):
+        """ Return the lane values of a signal as a NumPy array. """
+        return self._design.values(self._slot(sig))
+
+    def drive(self, sig, values):
+        """ Set the values of a signal in each lane.
+
+        sig -- signal of the design
+        values -- sequence of lane values, or a single value for all lanes
+
+        The values are applied before the next clock edge, like a signal
+        assignment between runs.
+
+        """
+        k = self._slot(sig)
+        if k in self._design.edgeslots:
+            raise SimulationError(_error.LaneEdge, sig._name or repr(sig))
+        values = numpy.asarray(values, dtype=self._design.laneType(sig))
+        values = numpy.array(numpy.broadcast_to(values, (self._lanes,)))
+        if sig._type is bool:
+            _lanesBool(values, True)
+        elif isinstance(sig._val, intbv):
+            _lanesIntbv(values, sig._min, sig._max, True)
+        self._drives[k] = values
+
+    def restore(self, vcdpath, time, name=None):
+        """ Start the simulation from the signal values in a VCD file.
+
+        As Simulation.restore. The clocks continue from the start of
+        their period at time.
+
+        """
+        _restore(self, [self._top], vcdpath, time, name,
+                 self._started or self._finished)
+        for c in self._clocks:
+            c[0] += time
+        if self._design is not None:
+            for c in self._cclocks:
+                c[0] += time
+            self._design.load()
+
+    def _trace(self, k):
+        s = self._design.sigs[k]
+        if s._tracing:
+            self._design.store(k)
+            s._printVcd()
+
+    def _commit(self, dirty):
+        """ Update pending signals and return the triggered processes. """
+        procs = []
+        seen = set()
+        edgeprocs = self._edgeprocs
+        readers = self._readers
+        siglist = self._state.siglist
+        for s in siglist:
+            s._queued = False
+            val, next = s._val, s._next
+            if val != next:
+                posedge = not val and next
+                negedge = not next and val
+                s._update()
+                dirty.update(readers.get(id(s), ()))
+                if posedge or negedge:
+                    for f in edgeprocs.get((id(s), bool(posedge)), ()):
+                        if id(f) not in seen:
+                            seen.add(id(f))
+                            procs.append(f)
+        del siglist[:]
+        return procs
+
+    def _settle(self, dirty):
+        """ Run edge-triggered and combinatorial functions until stable. """
+        combs = self._combs
+        readers = self._readers
+        siglist = self._state.siglist
+        while siglist or dirty:
+            if siglist:
+                # sequential functions read the settled values of this delta
+                for f in self._commit(dirty):
+                    f()
+            # combinatorial functions in dependency order
+            while dirty:
+                i = min(dirty)
+                dirty.discard(i)
+                func, outsigs = combs[i]
+                func()
+                for s in outsigs:
+                    if s._val != s._next:
+                        s._update()
+                        dirty.update(readers.get(id(s), ()))
+
+    def _condition(self, until):
+        # a time is handled as the maximum time of the run
+        if until is None or isinstance(until, integer_types):
+            return None
+        raise SimulationError(_error.Until)
+
+    def _run(self, maxTime, quiet, cond):
+        if maxTime is None:
+            raise SimulationError(_error.Duration)
+        if self._design is not None:
+            return self._runCompiled(maxTime, quiet)
+        clocks = self._clocks
+        readers = self._readers
+        state = self._state
+        tracing = state.tracing
+        tracefile = state.tf
+        try:
+            if self._started:
+                dirty = set()
+            else:
+                dirty = set(range(len(self._combs)))
+            self._started = True
+            self._settle(dirty)
+            while 1:
+                t = min(c[0] for c in clocks)
+                if t > maxTime:
+                    state.time = maxTime
+                    if tracing:
+                        tracefile.flush()
+                    return 1
+                state.time = t
+                if tracing:
+                    print("#%s" % t, file=tracefile)
+                # clocks are not driven by processes: update them directly
+                procs = []
+                for c in clocks:
+                    if c[0] == t:
+                        clk = c[1]
+                        clk._setNextVal(not clk._val)
+                        clk._update()
+                        dirty.update(readers.get(id(clk), ()))
+                        if clk._val:
+                            c[0] = t + c[3]
+                            procs.extend(c[4])
+                        else:
+                            c[0] = t + c[2]
+                            procs.extend(c[5])
+                for f in procs:
+                    f()
+                self._settle(dirty)
+
+        except StopSimulation:
+            if not quiet:
+                _printExcInfo()
+            self._finalize()
+            return 0
+
+        except Exception:
+            self._finalize()
+            raise
+
+    def _runCompiled(self, maxTime, quiet):
+        design = self._design
+        cur, next = design.cur, design.next
+        commit = design.commit
+        clocks = self._cclocks
+        state = self._state
+        siglist = state.siglist
+        tracing = state.tracing
+        tracefile = state.tf
+        try:
+            # apply the input changes made since the previous run
+            full = not self._started
+            self._started = True
+            procs = []
+            for s in siglist:
+                s._queued = False
+                k = design._slots.get(id(s))
+                if k is not None and design.lanes is not None and \
+                        k not in design.edgeslots:
+                    # the signal value doesn't reflect the lane values
+                    cur[k] = next[k] = design.laneValues(k, _raw(s._next))
+                    full = True
+                elif k is not None and s._val != s._next:
+                    val = _raw(s._next)
+                    posedge = not cur[k] and val
+                    negedge = not val and cur[k]
+                    cur[k] = next[k] = val
+                    full = True
+                    if posedge or negedge:
+                        f = design.procs.get((id(s), bool(posedge)))
+                        if f is not None:
+                            procs.append(f)
+                s._update()
+            del siglist[:]
+            for k, values in self._drives.items():
+                cur[k] = next[k] = values
+                full = True
+            self._drives.clear()
+            for f in procs:
+                f()
+            commit(full)
+            while 1:
+                t = min(c[0] for c in clocks)
+                if t > maxTime:
+                    state.time = maxTime
+                    design.store()
+                    if tracing:
+                        tracefile.flush()
+                    return 1
+                state.time = t
+                if tracing:
+                    print("#%s" % t, file=tracefile)
+                full = False
+                procs = []
+                for c in clocks:
+                    if c[0] == t:
+                        k = c[1]
+                        val = not cur[k]
+                        if design.sigs[k]._type is not bool:
+                            val = int(val)
+                        cur[k] = next[k] = val
+                        if tracing:
+                            self._trace(k)
+                        full = full or c[6]
+                        if val:
+                            c[0] = t + c[3]
+                            f = c[4]
+                        else:
+                            c[0] = t + c[2]
+                            f = c[5]
+                        if f is not None:
+                            procs.append(f)
+                for f in procs:
+                    f()
+                commit(full)
+
+        except StopSimulation:
+            design.store()
+            if not quiet:
+                _printExcInfo()
+            self._finalize()
+            return 0
+
+        except Exception:
+            self._finalize()
+            raise
+
+
+def _sigs(inst):
+    for s in inst.sigdict.values():
+        yield s
+    for l in inst.losdict.values():
+        for s in l:
+            yield s
+
+
+def _seqFunc(inst):
+    if isinstance(inst, _AlwaysSeq) and inst.reset is not None:
+        reset = inst.reset
+        active = reset.active
+        func = inst.func
+        reset_sigs = inst.reset_sigs
+        reset_vars = inst.reset_vars
+
+        def seqFunc():
+            if reset._val == active:
+                reset_sigs()
+                reset_vars()
+            else:
+                func()
+        return seqFunc
+    return inst.func
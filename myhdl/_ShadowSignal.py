@@ -27,10 +27,10 @@ import warnings
 from copy import deepcopy
 
 from myhdl._compat import long
+from myhdl._simulator import _claim
 from myhdl._Signal import _Signal
 from myhdl._Waiter import _SignalWaiter, _SignalTupleWaiter
 from myhdl._intbv import intbv
-from myhdl._simulator import _siglist
 from myhdl._bin import bin
 
 # shadow signals
@@ -298,7 +298,12 @@ class _TristateSignal(_ShadowSignal):
                     res = None
                     break
             self._next = res
-            _siglist.append(self)
+            if not self._queued:
+                self._queued = True
+                sim = self._sim
+                if not sim.running:
+                    sim = _claim(self)
+                sim.siglist.append(self)
 
     def toVerilog(self):
         lines = []
@@ -335,4 +340,9 @@ class _TristateDriver(_Signal):
             # restore original value to cater for intbv handler
             self._next = self._sig._orival
             self._setNextVal(val)
-        _siglist.append(self)
+        if not self._queued:
+            self._queued = True
+            sim = self._sim
+            if not sim.running:
+                sim = _claim(self)
+            sim.siglist.append(self)
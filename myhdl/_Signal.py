@@ -31,18 +31,14 @@ from __future__ import print_function
 
 from copy import copy, deepcopy
 
-from myhdl._compat import integer_types, long
-from myhdl import _simulator as sim
-from myhdl._simulator import _futureEvents
-from myhdl._simulator import _siglist
-from myhdl._simulator import _signals
+from myhdl._compat import integer_types, long, string_types
+from myhdl._simulator import _pending, _claim
 from myhdl._intbv import intbv
+from myhdl._modbv import modbv
 from myhdl._bin import bin
 
 # from myhdl._enum import EnumItemType
 
-_schedule = _futureEvents.append
-
 
 def _isListOfSigs(obj):
     """ Check if obj is a non-empty list of signals. """
@@ -57,10 +53,18 @@ def _isListOfSigs(obj):
 
 class _WaiterList(list):
 
+    # number of times the waiters were released; waiters on several
+    # lists use it to find out which ones fired
+    fired = 0
+
     def purge(self):
         if self:
             self[:] = [w for w in self if not w.hasRun]
 
+    # support for 'await' in coroutine processes
+    def __await__(self):
+        yield self
+
 
 class _PosedgeWaiterList(_WaiterList):
 
@@ -86,6 +90,16 @@ class _NegedgeWaiterList(_WaiterList):
         return "falling_edge(%s)" % self.sig._name
 
 
+# flags of the waiter lists that a signal has allocated
+_EVENT = 1
+_POSEDGE = 2
+_NEGEDGE = 4
+
+_waiterLists = {'_eventWaiters': _EVENT,
+                '_posedgeWaiters': _POSEDGE,
+                '_negedgeWaiters': _NEGEDGE}
+
+
 def posedge(sig):
     """ Return a posedge trigger object """
     return sig.posedge
@@ -95,6 +109,26 @@ def negedge(sig):
     """ Return a negedge trigger object """
     return sig.negedge
 
+# value types that are propagated by reference
+_immutableTypes = set([float, complex, bytes, frozenset, type(None)])
+_immutableTypes.update(string_types)
+
+
+def immutable(cls):
+    """ Register cls as an immutable signal value type, and return it.
+
+    Signals propagate values of registered types by reference instead
+    of copying them. The class, or its subclasses, should not change
+    their instances in place. It can be used as a class decorator.
+
+    """
+    _immutableTypes.add(cls)
+    return cls
+
+
+def _isImmutable(cls):
+    return any(issubclass(cls, t) for t in _immutableTypes)
+
 # signal factory function
 
 
@@ -124,7 +158,8 @@ class _Signal(object):
                  '_setNextVal', '_copyVal2Next', '_printVcd',
                  '_driven', '_read', '_name', '_used', '_inList',
                  '_waiter', 'toVHDL', 'toVerilog', '_slicesigs',
-                 '_numeric'
+                 '_numeric', '_queued', '_sim', '_waiterFlags', '_mutable',
+                 '__weakref__'
                  )
 
     def __init__(self, val=None):
@@ -132,10 +167,29 @@ class _Signal(object):
 
         val -- initial value
 
+        A value class can define a __myhdl_freeze__ method, that returns
+        the value in a form that is not changed afterwards. Such values,
+        and values of types registered with immutable, are propagated
+        by reference instead of copied.
+
         """
-        self._init = deepcopy(val)
-        self._val = deepcopy(val)
-        self._next = deepcopy(val)
+        cls = type(val)
+        freeze = hasattr(cls, '__myhdl_freeze__')
+        self._mutable = True
+        if isinstance(val, intbv):
+            # the most common value type: skip the deepcopy machinery
+            self._init = val.__deepcopy__(None)
+            self._val = val.__deepcopy__(None)
+            self._next = val.__deepcopy__(None)
+        elif freeze or _isImmutable(cls):
+            if freeze:
+                val = val.__myhdl_freeze__()
+            self._init = self._val = self._next = val
+            self._mutable = False
+        else:
+            self._init = deepcopy(val)
+            self._val = deepcopy(val)
+            self._next = deepcopy(val)
         self._min = self._max = None
         self._name = self._driven = None
         self._read = self._used = False
@@ -148,67 +202,92 @@ class _Signal(object):
             self._setNextVal = self._setNextBool
             self._printVcd = self._printVcdBit
             self._nrbits = 1
+            self._mutable = False
         elif isinstance(val, integer_types):
             self._type = integer_types
             self._setNextVal = self._setNextInt
+            self._mutable = False
         elif isinstance(val, intbv):
             self._type = intbv
             self._min = val._min
             self._max = val._max
             self._nrbits = val._nrbits
-            self._setNextVal = self._setNextIntbv
+            self._setNextVal = _intbvSetter(self, val)
             if self._nrbits:
                 self._printVcd = self._printVcdVec
             else:
                 self._printVcd = self._printVcdHex
         else:
-            self._type = type(val)
-            if isinstance(val, EnumItemType):
+            self._type = cls
+            if freeze:
+                self._setNextVal = self._setNextFrozen
+            elif isinstance(val, EnumItemType) or not self._mutable:
                 self._setNextVal = self._setNextNonmutable
+                self._mutable = False
             else:
                 self._setNextVal = self._setNextMutable
             if hasattr(val, '_nrbits'):
                 self._nrbits = val._nrbits
-        self._eventWaiters = _WaiterList()
-        self._posedgeWaiters = _PosedgeWaiterList(self)
-        self._negedgeWaiters = _NegedgeWaiterList(self)
+        # waiter lists are allocated on first use, see __getattr__
+        self._waiterFlags = 0
         self._code = ""
-        self._slicesigs = []
+        self._slicesigs = ()
         self._tracing = 0
-        _signals.append(self)
+        self._queued = False
+        _pending().bind(self)
 
     def _clear(self):
-        del self._eventWaiters[:]
-        del self._posedgeWaiters[:]
-        del self._negedgeWaiters[:]
-        self._val = deepcopy(self._init)
-        self._next = deepcopy(self._init)
+        flags = self._waiterFlags
+        if flags:
+            for attr, flag in _waiterLists.items():
+                if flags & flag:
+                    wl = getattr(self, attr)
+                    del wl[:]
+                    wl.fired += 1
+        if self._mutable:
+            self._val = deepcopy(self._init)
+            self._next = deepcopy(self._init)
+        else:
+            self._val = self._next = self._init
         self._name = self._driven = None
         self._read = False # dont clear self._used
         self._inList = False 
         self._numeric = True
+        self._queued = False
         for s in self._slicesigs:
             s._clear()
 
     def _update(self):
         val, next = self._val, self._next
         if val != next:
-            waiters = self._eventWaiters[:]
-            del self._eventWaiters[:]
-            if not val and next:
-                waiters.extend(self._posedgeWaiters[:])
-                del self._posedgeWaiters[:]
-            elif not next and val:
-                waiters.extend(self._negedgeWaiters[:])
-                del self._negedgeWaiters[:]
+            waiters = []
+            flags = self._waiterFlags
+            if flags:
+                if flags & _EVENT:
+                    wl = self._eventWaiters
+                    if wl:
+                        waiters.extend(wl)
+                        del wl[:]
+                        wl.fired += 1
+                # edge tests only for signals with edge waiters
+                if flags & _POSEDGE and not val and next:
+                    wl = self._posedgeWaiters
+                elif flags & _NEGEDGE and not next and val:
+                    wl = self._negedgeWaiters
+                else:
+                    wl = None
+                if wl:
+                    waiters.extend(wl)
+                    del wl[:]
+                    wl.fired += 1
             if next is None:
                 self._val = None
             elif isinstance(val, intbv):
                 self._val._val = next._val
-            elif isinstance(val, (integer_types, EnumItemType)):
-                self._val = next
-            else:
+            elif self._mutable:
                 self._val = deepcopy(next)
+            else:
+                self._val = next
             if self._tracing:
                 self._printVcd()
             return waiters
@@ -225,7 +304,12 @@ class _Signal(object):
     def next(self):
         #        if self._next is self._val:
         #            self._next = deepcopy(self._val)
-        _siglist.append(self)
+        if not self._queued:
+            self._queued = True
+            sim = self._sim
+            if not sim.running:
+                sim = _claim(self)
+            sim.siglist.append(self)
         return self._next
 
     @next.setter
@@ -233,7 +317,13 @@ class _Signal(object):
         if isinstance(val, _Signal):
             val = val._val
         self._setNextVal(val)
-        _siglist.append(self)
+        # queue the signal for update at most once per delta cycle
+        if not self._queued:
+            self._queued = True
+            sim = self._sim
+            if not sim.running:
+                sim = _claim(self)
+            sim.siglist.append(self)
 
     # support for the 'posedge' attribute
     @property
@@ -245,6 +335,10 @@ class _Signal(object):
     def negedge(self):
         return self._negedgeWaiters
 
+    # support for 'await' in coroutine processes
+    def __await__(self):
+        yield self
+
     # support for the 'min' and 'max' attribute
     @property
     def max(self):
@@ -316,31 +410,38 @@ class _Signal(object):
             raise TypeError("Expected %s, got %s" % (self._type, type(val)))
         self._next = deepcopy(val)
 
+    def _setNextFrozen(self, val):
+        if not isinstance(val, self._type):
+            raise TypeError("Expected %s, got %s" % (self._type, type(val)))
+        self._next = val.__myhdl_freeze__()
+
     # vcd print methods
     def _printVcdStr(self):
-        print("s%s %s" % (str(self._val), self._code), file=sim._tf)
+        print("s%s %s" % (str(self._val), self._code), file=self._sim.tf)
 
     def _printVcdHex(self):
         if self._val is None:
-            print("sz %s" % self._code, file=sim._tf)
+            print("sz %s" % self._code, file=self._sim.tf)
         else:
-            print("s%s %s" % (hex(self._val), self._code), file=sim._tf)
+            print("s%s %s" % (hex(self._val), self._code), file=self._sim.tf)
 
     def _printVcdBit(self):
         if self._val is None:
-            print("z%s" % self._code, file=sim._tf)
+            print("z%s" % self._code, file=self._sim.tf)
         else:
-            print("%d%s" % (self._val, self._code), file=sim._tf)
+            print("%d%s" % (self._val, self._code), file=self._sim.tf)
 
     def _printVcdVec(self):
         if self._val is None:
-            print("b%s %s" % ('z' * self._nrbits, self._code), file=sim._tf)
+            print("b%s %s" % ('z' * self._nrbits, self._code), file=self._sim.tf)
         else:
-            print("b%s %s" % (bin(self._val, self._nrbits), self._code), file=sim._tf)
+            print("b%s %s" % (bin(self._val, self._nrbits), self._code), file=self._sim.tf)
 
     ### use call interface for shadow signals ###
     def __call__(self, left, right=None):
         s = _SliceSignal(self, left, right)
+        if not self._slicesigs:
+            self._slicesigs = []
         self._slicesigs.append(s)
         return s
 
@@ -529,6 +630,18 @@ class _Signal(object):
 
     # method lookup delegation
     def __getattr__(self, attr):
+        flag = _waiterLists.get(attr)
+        if flag is not None:
+            # allocate a waiter list on first use
+            if flag == _EVENT:
+                wl = _WaiterList()
+            elif flag == _POSEDGE:
+                wl = _PosedgeWaiterList(self)
+            else:
+                wl = _NegedgeWaiterList(self)
+            setattr(self, attr, wl)
+            self._waiterFlags |= flag
+            return wl
         return getattr(self._val, attr)
 
     # representation
@@ -578,6 +691,58 @@ class _Signal(object):
         self.toVerilog = toVerilog
 
 
+def _intbvSetter(sig, val):
+    """ Return the set next function of an intbv signal.
+
+    The function is specialized to the value type and bounds, so that an
+    assignment does the minimum work. A full range modbv wraps with a
+    mask instead of a modulo.
+
+    """
+    lo, hi = val._min, val._max
+    if lo is None or hi is None or type(val) not in (intbv, modbv):
+        return sig._setNextIntbv
+
+    def _checkType(val):
+        if isinstance(val, intbv):
+            return val._val
+        if not isinstance(val, integer_types):
+            raise TypeError("Expected int or intbv, got %s" % type(val))
+        return val
+
+    if type(val) is intbv:
+        def setNext(val):
+            if type(val) is not int:
+                val = _checkType(val)
+            if val >= hi:
+                raise ValueError("intbv value %s >= maximum %s" % (val, hi))
+            if val < lo:
+                raise ValueError("intbv value %s < minimum %s" % (val, lo))
+            sig._next._val = val
+    elif lo == 0 and hi & hi - 1 == 0:
+        mask = hi - 1
+
+        def setNext(val):
+            if type(val) is not int:
+                val = _checkType(val)
+            sig._next._val = val & mask
+    elif lo == -hi and hi & hi - 1 == 0:
+        mask = 2 * hi - 1
+
+        def setNext(val):
+            if type(val) is not int:
+                val = _checkType(val)
+            sig._next._val = (val + hi & mask) - hi
+    else:
+        def setNext(val):
+            if type(val) is not int:
+                val = _checkType(val)
+            if val < lo or val >= hi:
+                val = (val - lo) % (hi - lo) + lo
+            sig._next._val = val
+    return setNext
+
+
 class _DelayedSignal(_Signal):
 
     __slots__ = ('_nextZ', '_delay', '_timeStamp',
@@ -597,24 +762,38 @@ class _DelayedSignal(_Signal):
 
     def _update(self):
         if self._next != self._nextZ:
-            self._timeStamp = sim._time
+            self._timeStamp = self._sim.time
         self._nextZ = self._next
-        t = sim._time + self._delay
-        _schedule((t, _SignalWrap(self, self._next, self._timeStamp)))
+        t = self._sim.time + self._delay
+        self._sim.schedule(t, _SignalWrap(self, self._next, self._timeStamp))
         return []
 
     def _apply(self, next, timeStamp):
         val = self._val
         if timeStamp == self._timeStamp and val != next:
-            waiters = self._eventWaiters[:]
-            del self._eventWaiters[:]
-            if not val and next:
-                waiters.extend(self._posedgeWaiters[:])
-                del self._posedgeWaiters[:]
-            elif not next and val:
-                waiters.extend(self._negedgeWaiters[:])
-                del self._negedgeWaiters[:]
-            self._val = copy(next)
+            waiters = []
+            flags = self._waiterFlags
+            if flags:
+                if flags & _EVENT:
+                    wl = self._eventWaiters
+                    if wl:
+                        waiters.extend(wl)
+                        del wl[:]
+                        wl.fired += 1
+                if flags & _POSEDGE and not val and next:
+                    wl = self._posedgeWaiters
+                elif flags & _NEGEDGE and not next and val:
+                    wl = self._negedgeWaiters
+                else:
+                    wl = None
+                if wl:
+                    waiters.extend(wl)
+                    del wl[:]
+                    wl.fired += 1
+            if self._mutable:
+                self._val = copy(next)
+            else:
+                self._val = next
             if self._tracing:
                 self._printVcd()
             return waiters
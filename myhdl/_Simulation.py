@@ -22,21 +22,32 @@ from __future__ import absolute_import
 from __future__ import print_function
 
 import os
-from operator import itemgetter
+from heapq import heappop
 from types import GeneratorType
 
 from myhdl import StopSimulation, _SuspendSimulation
 from myhdl import _simulator, SimulationError
 from myhdl._Cosimulation import Cosimulation
-from myhdl._simulator import _signals, _siglist, _futureEvents
+from myhdl._simulator import _SimState, _local
 from myhdl._Waiter import _Waiter
 from myhdl._Waiter import _inferWaiter
 from myhdl._Waiter import _SignalTupleWaiter
-from myhdl._util import _printExcInfo
+from myhdl._Waiter import _DomainWaiter
+from myhdl._Signal import _Signal, _WaiterList
+from myhdl._memory import Memory, _MemoryWord
+from myhdl._compat import integer_types
+from myhdl._util import _printExcInfo, _isCoroutine
 from myhdl._instance import _Instantiator
+from myhdl._always_comb import _AlwaysComb, _AlwaysCombNetwork
 from myhdl._block import _Block
+from myhdl._checkpoint import SimulationCheckpoint, _branch
+from myhdl._restore import _restore
 
-schedule = _futureEvents.append
+# optional C version of the event loop
+try:
+    from myhdl import _simrunc
+except ImportError:
+    _simrunc = None
 
 
 class _error:
@@ -46,6 +57,7 @@ class _error:
 _error.ArgType = "Inappriopriate argument type"
 _error.MultipleCosim = "Only a single cosimulator argument allowed"
 _error.DuplicatedArg = "Duplicated argument"
+_error.UntilType = "run condition should be a Signal, an edge, a predicate or a time"
 
 # flatten Block objects out
 
@@ -63,35 +75,69 @@ def _flatten(*args):
     return arglist
 
 
-_error.MultipleSim = "Only a single Simulation instance is allowed"
+def _blocks(args):
+    # the top level block instances in args
+    blocks = []
+    for arg in args:
+        if isinstance(arg, _Block):
+            blocks.append(arg)
+        elif isinstance(arg, (list, tuple, set)):
+            blocks.extend(_blocks(arg))
+    return blocks
 
 
 class Simulation(object):
 
     """ Simulation class.
 
+    Each simulation has its own time, event queues and trace file. It
+    owns the signals created since the previous simulation object in
+    the same thread, and the signals of the block instances passed to
+    it. Several simulations can therefore coexist, and be run in turns
+    or in separate threads, as long as they don't share signals.
+
     Methods:
     run -- run a simulation for some duration
+    arun -- run a simulation in an asyncio event loop
+    branch -- run a scenario in a forked copy of the simulation
+    checkpoint -- take a snapshot to branch from later
+    restore -- load the signal values at some time from a VCD file
 
     """
-    _no_of_instances = 0
 
-    def __init__(self, *args):
+    def __init__(self, *args, **kwargs):
         """ Construct a simulation object.
 
         *args -- list of arguments. Each argument is a generator or
                  a nested sequence of generators.
+        levelize -- evaluate always_comb blocks once per activation
+                    in dependency order (default: off)
 
         """
-        _simulator._time = 0
+        levelize = kwargs.pop('levelize', False)
+        if kwargs:
+            raise TypeError("Simulation: unexpected keyword argument %r"
+                            % sorted(kwargs)[0])
+        state = _simulator._pending()
+        _bindSignals(state, args)
         arglist = _flatten(*args)
-        self._waiters, self._cosims = _makeWaiters(arglist)
-        if Simulation._no_of_instances > 0:
-            raise SimulationError(_error.MultipleSim)
-        Simulation._no_of_instances += 1
+        self._waiters, self._cosims = _makeWaiters(arglist, state, levelize)
+        self._tops = _blocks(args)
         self._finished = False
-        del _futureEvents[:]
-        del _siglist[:]
+        self._nbranches = 0
+        self._suspendTime = None
+        self._state = state
+        state.owned = True
+        # signals created from now on belong to a next simulation
+        _local.pending = _SimState()
+        _local.current = state
+        state.time = 0
+        del state.futureEvents[:]
+        del state.postponed[:]
+        state.awaiting.clear()
+        for s in state.siglist:
+            s._queued = False
+        del state.siglist[:]
 
     def _finalize(self):
         cosims = self._cosims
@@ -100,23 +146,86 @@ class Simulation(object):
                 os.close(cosim._rt)
                 os.close(cosim._wf)
                 cosim._child.wait()
-        if _simulator._tracing:
-            _simulator._tracing = 0
-            _simulator._tf.close()
+        state = self._state
+        if state.tracing:
+            state.tracing = 0
+            state.tf.close()
         # clean up for potential new run with same signals
-        for s in _signals:
+        for s in state.signals.values():
             s._clear()
-        Simulation._no_of_instances = 0
         self._finished = True
+        if _local.pending is not state:
+            self._release()
+
+    def _release(self):
+        # hand the signals over to the next simulation in this thread
+        pending = _local.pending
+        for s in list(self._state.signals.values()):
+            pending.bind(s)
+        self._state.signals.clear()
 
     def quit(self):
         self._finalize()
 
-    def run(self, duration=None, quiet=0):
-        """ Run the simulation for some duration.
+    def branch(self, fn, name=None):
+        """ Run a scenario in a forked copy of the simulation.
+
+        fn -- scenario, called with the copied simulation object
+        name -- suffix of the branch trace file (default: branch<n>)
+
+        The copy starts at the current time, and this simulation can
+        continue independently. Returns a SimulationBranch object; its
+        result method waits for the scenario and returns its return
+        value.
+
+        """
+        return _branch(self, fn, name)
+
+    def checkpoint(self):
+        """ Take a snapshot of the simulation at the current time.
+
+        Returns a SimulationCheckpoint object; its branch method runs
+        a scenario in a copy of the snapshot.
+
+        """
+        return SimulationCheckpoint(self)
+
+    def restore(self, vcdpath, time, name=None):
+        """ Start the simulation from the signal values in a VCD file.
+
+        vcdpath -- VCD file written by traceSignals
+        time -- time of the values to load
+        name -- name of the top level scope in the file (default: the
+                name of the top level block function)
+
+        The signals of the block instances of the simulation are set to
+        their values at the end of timestep time, mapped by hierarchical
+        name, and the simulation continues from that time. The processes
+        start from the beginning: this is meant for designs that hold all
+        their state in signals, restored at a time at which the clocks
+        are at the start of their period.
+
+        """
+        started = self._finished or self._suspendTime is not None
+        _restore(self, self._tops, vcdpath, time, name, started)
+
+    def run(self, duration=None, quiet=0, until=None, max_time=None):
+        """ Run the simulation for some duration, or until a condition.
 
         duration -- specified simulation duration (default: forever)
         quiet -- don't print StopSimulation messages (default: off)
+        until -- condition that suspends the simulation (default: none)
+        max_time -- time at which to suspend at the latest (default: none)
+
+        The until condition can be a Signal, that is met when it changes,
+        an edge, a time, or a predicate function without arguments. A
+        predicate is checked at the end of each timestep after the one in
+        which the simulation was suspended. The simulation suspends at the
+        end of the timestep in which the condition is met, and can be
+        continued with another run call.
+
+        Returns 1 when the simulation is suspended, and 0 when it has
+        finished.
 
         """
 
@@ -124,29 +233,107 @@ class Simulation(object):
         # From this point it will propagate to the caller, that can catch it.
         if self._finished:
             raise StopSimulation("Simulation has already finished")
-        waiters = self._waiters
+        maxTime = self._maxTime(duration, until, max_time)
+        return self._resume(maxTime, quiet, self._condition(until))
+
+    def arun(self, duration=None, until=None, max_time=None, step=1):
+        """ Run the simulation in an asyncio event loop.
+
+        duration, until and max_time are the same as for run. The
+        simulation runs step timesteps at a time, and lets the other
+        tasks of the event loop run in between. Coroutine processes can
+        then await asyncio objects as well as simulator triggers.
+
+        Returns an awaitable, with the return value of run. StopSimulation
+        messages are not printed.
+
+        """
+        from myhdl._asyncsim import _arun
+        return _arun(self, duration, until, max_time, step)
+
+    def _maxTime(self, duration, until, max_time):
+        """ Return the time at which to suspend at the latest, or None. """
+        time = self._state.time
         maxTime = None
         if duration:
-            stop = _Waiter(None)
-            stop.hasRun = 1
-            maxTime = _simulator._time + duration
-            schedule((maxTime, stop))
+            maxTime = time + duration
+        if isinstance(until, integer_types):
+            maxTime = until if maxTime is None else min(maxTime, until)
+        if max_time is not None:
+            maxTime = max_time if maxTime is None else min(maxTime, max_time)
+        if maxTime is not None and maxTime < time:
+            maxTime = time
+        return maxTime
+
+    def _condition(self, until):
+        """ Return the object that watches a run condition, or None. """
+        if until is None or isinstance(until, integer_types):
+            return None
+        if isinstance(until, _Signal):
+            return _UntilWaiter(until._eventWaiters)
+        if isinstance(until, _WaiterList):
+            return _UntilWaiter(until)
+        if callable(until):
+            return _UntilCheck(until, self._state, self._suspendTime)
+        raise TypeError(_error.UntilType)
+
+    def _resume(self, maxTime, quiet, cond):
+        state = self._state
+        # signals created while running belong to this simulation
+        pending = _local.pending
+        _local.current = _local.pending = state
+        state.running = True
+        try:
+            return self._run(maxTime, quiet, cond)
+        finally:
+            state.running = False
+            if cond is not None:
+                cond.disarm()
+            if _local.pending is state:
+                _local.pending = pending
+            if self._finished:
+                self._release()
+
+    def _run(self, maxTime, quiet, cond):
+        state = self._state
+        siglist = state.siglist
+        futureEvents = state.futureEvents
+        postponed = state.postponed
+        waiters = self._waiters
+        duration = None
+        if maxTime is not None:
+            duration = maxTime - state.time
+            if duration > 0:
+                stop = _Waiter(None)
+                stop.hasRun = 1
+                state.schedule(maxTime, stop)
         cosims = self._cosims
-        t = _simulator._time
+        t = state.time
         actives = {}
-        tracing = _simulator._tracing
-        tracefile = _simulator._tf
+        tracing = state.tracing
+        tracefile = state.tf
         exc = []
+        if cond is not None:
+            cond.arm(exc)
         _pop = waiters.pop
         _append = waiters.append
         _extend = waiters.extend
+        # the C kernel runs the same loop, and only returns by raising
+        kernel = None
+        if _simrunc is not None and not cosims:
+            kernel = _simrunc.run
 
         while 1:
             try:
 
-                for s in _siglist:
+                if kernel is not None:
+                    kernel(state, waiters, actives, exc, maxTime, duration,
+                           tracefile if tracing else None)
+
+                for s in siglist:
+                    s._queued = False
                     _extend(s._update())
-                del _siglist[:]
+                del siglist[:]
 
                 while waiters:
                     waiter = _pop()
@@ -162,7 +349,7 @@ class Simulation(object):
                             any_cosim_changes or cosim._hasChange
                     for cosim in cosims:
                         cosim._get()
-                    if _siglist or any_cosim_changes:
+                    if siglist or any_cosim_changes:
                         # It should be safe to _put a cosim with no changes
                         # because _put with the same values should be
                         # idempotent. We need to _put them all here because
@@ -170,7 +357,7 @@ class Simulation(object):
                         for cosim in cosims:
                             cosim._put(t)
                         continue
-                elif _siglist:
+                elif siglist:
                     continue
 
                 if actives:
@@ -178,32 +365,32 @@ class Simulation(object):
                         wl.purge()
                     actives = {}
 
+                if postponed:
+                    state.runPostponed()
+
                 # at this point it is safe to potentially suspend a simulation
                 if exc:
                     raise exc[0]
 
                 # future events
-                if _futureEvents:
+                if futureEvents:
                     if t == maxTime:
                         raise _SuspendSimulation(
                             "Simulated %s timesteps" % duration)
-                    _futureEvents.sort(key=itemgetter(0))
-                    t = _simulator._time = _futureEvents[0][0]
+                    t = state.time = futureEvents[0][0]
                     if tracing:
                         print("#%s" % t, file=tracefile)
                     if cosims:
                         for cosim in cosims:
                             cosim._put(t)
-                    while _futureEvents:
-                        newt, event = _futureEvents[0]
-                        if newt == t:
-                            if isinstance(event, _Waiter):
-                                _append(event)
-                            else:
-                                _extend(event.apply())
-                            del _futureEvents[0]
+                    while futureEvents and futureEvents[0][0] == t:
+                        event = heappop(futureEvents)[2]
+                        if isinstance(event, _Waiter):
+                            _append(event)
                         else:
-                            break
+                            _extend(event.apply())
+                elif state.awaiting:
+                    raise _SuspendSimulation("Waiting for asyncio objects")
                 else:
                     raise StopSimulation("No more events")
 
@@ -212,6 +399,7 @@ class Simulation(object):
                     _printExcInfo()
                 if tracing:
                     tracefile.flush()
+                self._suspendTime = state.time
                 return 1
 
             except StopSimulation:
@@ -233,15 +421,137 @@ class Simulation(object):
                 raise
 
 
-def _makeWaiters(arglist):
+class _UntilWaiter(_Waiter):
+
+    """ Waiter that suspends a run when a signal changes or an edge occurs.
+
+    It is only woken up by the condition, so that watching costs nothing
+    in the meantime.
+
+    """
+
+    __slots__ = ('wl', 'exc', 'met', 'hasRun')
+
+    def __init__(self, wl):
+        self.wl = wl
+        self.exc = None
+        self.met = False
+        self.hasRun = 0
+
+    def arm(self, exc):
+        self.exc = exc
+        self.wl.append(self)
+
+    def disarm(self):
+        self.exc = None
+        if not self.met:
+            # runs that end otherwise shouldn't leave waiters behind
+            try:
+                self.wl.remove(self)
+            except ValueError:
+                # released, but the run ended before it ran
+                pass
+
+    def next(self, waiters, actives, exc):
+        if self.exc is exc:
+            exc.append(_SuspendSimulation("Run condition met"))
+            self.exc = None
+            self.met = True
+
+
+class _UntilCheck(object):
+
+    """ Postponed region entry that checks a predicate for a run. """
+
+    __slots__ = ('predicate', 'state', 'skip', 'exc', 'met', 'pending')
+
+    def __init__(self, predicate, state, skip):
+        self.predicate = predicate
+        self.state = state
+        # the timestep in which the simulation was suspended is done
+        self.skip = skip
+        self.exc = None
+        self.met = False
+        self.pending = 0
+
+    def arm(self, exc):
+        self.exc = exc
+        self.state.postponed.append(self)
+
+    def disarm(self):
+        self.exc = None
+        postponed = self.state.postponed
+        if self in postponed:
+            postponed.remove(self)
+
+    def func(self):
+        state = self.state
+        if state.time != self.skip and self.predicate():
+            self.exc.append(_SuspendSimulation("Run condition met"))
+            self.met = True
+        else:
+            state.postponed.append(self)
+
+
+def _bindSignals(state, args):
+    """ Bind the signals of block instances to a simulation state. """
+    def bind(sig):
+        state.bind(sig)
+        for s in sig._slicesigs:
+            bind(s)
+    for arg in args:
+        if isinstance(arg, (list, tuple, set)):
+            _bindSignals(state, arg)
+            continue
+        if isinstance(arg, _Block):
+            sigs, mems = arg.sigdict, arg.memdict
+            _bindSignals(state, arg.subs)
+        elif isinstance(arg, _Instantiator):
+            sigs, mems = arg.sigdict, arg.losdict
+        else:
+            continue
+        for s in sigs.values():
+            if isinstance(s, _MemoryWord):
+                # a word passed as a port
+                state.bind(s._mem)
+            elif isinstance(s, _Signal):
+                bind(s)
+        for m in mems.values():
+            m = getattr(m, 'mem', m)
+            if isinstance(m, Memory):
+                # the words of a memory are views on it
+                state.bind(m)
+                continue
+            for s in m:
+                if isinstance(s, _Signal):
+                    bind(s)
+
+
+def _makeWaiters(arglist, state, levelize=False):
     waiters = []
     ids = set()
     cosims = []
+    combs = []
+    domains = {}
     for arg in arglist:
         if isinstance(arg, GeneratorType):
             waiters.append(_inferWaiter(arg))
+        elif _isCoroutine(arg):
+            from myhdl._asyncsim import _CoroutineWaiter
+            waiters.append(_CoroutineWaiter(arg))
+        elif levelize and isinstance(arg, _AlwaysComb):
+            combs.append(arg)
         elif isinstance(arg, _Instantiator):
-            waiters.append(arg.waiter)
+            clocked = arg._clocked()
+            if clocked is None:
+                waiters.append(arg.waiter)
+            else:
+                # clocked processes of an edge share a single waiter
+                edges, func = clocked
+                for edge in edges:
+                    if id(edge) not in domains:
+                        domains[id(edge)] = _DomainWaiter(edge)
+                    domains[id(edge)].funcs.append(func)
         elif isinstance(arg, Cosimulation):
             cosims.append(arg)
             waiters.append(_SignalTupleWaiter(arg._waiter()))
@@ -254,8 +564,12 @@ def _makeWaiters(arglist):
         if id(arg) in ids:
             raise SimulationError(_error.DuplicatedArg)
         ids.add(id(arg))
+    if combs:
+        waiters.append(_AlwaysCombNetwork(combs).waiter)
+    for domain in domains.values():
+        domain.edge.append(domain)
     # add waiters for shadow signals
-    for sig in _signals:
+    for sig in list(state.signals.values()):
         if hasattr(sig, '_waiter'):
             waiters.append(sig._waiter)
     return waiters, cosims
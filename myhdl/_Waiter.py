@@ -32,15 +32,89 @@ from myhdl._delay import delay
 from myhdl._join import join
 from myhdl._Signal import _Signal, _WaiterList, posedge, negedge
 from myhdl import _simulator
-from myhdl._simulator import _futureEvents
 
 
-schedule = _futureEvents.append
+
+
+def _waiterLists(clauses):
+    """ Return the waiter lists of a tuple of signals and edges.
+
+    Return None if the tuple contains other clauses.
+
+    """
+    wls = []
+    for clause in clauses:
+        if isinstance(clause, _WaiterList):
+            wls.append(clause)
+        elif isinstance(clause, _Signal):
+            wls.append(clause._eventWaiters)
+        else:
+            return None
+    return wls
+
+
+def _sameClauses(clauses, previous):
+    if clauses is previous:
+        return True
+    if previous is None or len(clauses) != len(previous):
+        return False
+    for a, b in zip(clauses, previous):
+        if a is not b:
+            return False
+    return True
+
+
+# A waiter on several waiter lists is registered in each of them, and
+# remembers the fired stamp of each list. A list that fired since has
+# moved the waiter to a delta cycle; the other lists still hold it. The
+# waiter runs on the first copy, and skips copies when none of its lists
+# fired since it registered again. On the next wait on the same lists,
+# it only registers again in the lists that fired.
+
+def _fired(wls, stamps):
+    for wl, stamp in zip(wls, stamps):
+        if wl.fired != stamp:
+            return True
+    return False
+
+
+def _arm(waiter, wls):
+    for wl in wls:
+        wl.append(waiter)
+    return [wl.fired for wl in wls]
+
+
+def _rearm(waiter, wls, stamps):
+    for i, wl in enumerate(wls):
+        if wl.fired != stamps[i]:
+            wl.append(waiter)
+            stamps[i] = wl.fired
+
+
+def _disarm(waiter, wls, stamps):
+    for wl, stamp in zip(wls, stamps):
+        if wl.fired == stamp:
+            wl.remove(waiter)
+
+
+def _rewait(waiter, clauses, wls):
+    """ Register a waiter on other waiter lists. """
+    _unwait(waiter)
+    waiter.stamps = _arm(waiter, wls)
+    waiter.wls = wls
+    waiter.clauses = clauses
+
+
+def _unwait(waiter):
+    if waiter.wls is not None:
+        _disarm(waiter, waiter.wls, waiter.stamps)
+        waiter.wls = waiter.clauses = None
 
 
 class _Waiter(object):
 
-    __slots__ = ('caller', 'generator', 'hasRun', 'nrTriggers', 'semaphore')
+    __slots__ = ('caller', 'generator', 'hasRun', 'nrTriggers', 'semaphore',
+                 'clauses', 'wls', 'stamps')
 
     def __init__(self, generator, caller=None):
         self.caller = caller
@@ -48,12 +122,16 @@ class _Waiter(object):
         self.hasRun = 0
         self.nrTriggers = 1
         self.semaphore = 0
+        self.clauses = self.wls = self.stamps = None
 
     def next(self, waiters, actives, exc):
 
         if self.hasRun:
             raise StopIteration
 
+        if self.wls is not None and not _fired(self.wls, self.stamps):
+            raise StopIteration
+
         if self.semaphore:
             self.semaphore -= 1
             raise StopIteration
@@ -67,10 +145,30 @@ class _Waiter(object):
         try:
             clause = next(self.generator)
         except StopIteration:
+            _unwait(self)
+            self.hasRun = 1
             if self.caller:
                 waiters.append(self.caller)
             raise  # again
 
+        if isinstance(clause, (tuple, list)) and \
+                not isinstance(clause, _WaiterList) and len(clause) > 1:
+            if clone.wls is not None and \
+                    _sameClauses(clause, clone.clauses):
+                _rearm(clone, clone.wls, clone.stamps)
+                clone.clauses = clause
+                return
+            wls = _waiterLists(clause)
+            if wls is not None:
+                _rewait(clone, clause, wls)
+                return
+        if clone.wls is not None:
+            # copies queued by the other lists that fired are rejected
+            # by the stamps only: retire the waiter and use a clone
+            _unwait(clone)
+            clone.hasRun = 1
+            clone = _Waiter(self.generator, self.caller)
+
         if isinstance(clause, _WaiterList):
             clauses = (clause,)
         elif isinstance(clause, (tuple, list)):
@@ -97,8 +195,8 @@ class _Waiter(object):
                 if nr > 1:
                     actives[id(wl)] = wl
             elif isinstance(clause, delay):
-                t = _simulator._time
-                schedule((t + clause._time, clone))
+                sim = _simulator._current()
+                sim.schedule(sim.time + clause._time, clone)
             elif isinstance(clause, GeneratorType):
                 waiters.append(_Waiter(clause, clone))
             elif isinstance(clause, _Instantiator):
@@ -125,7 +223,8 @@ class _DelayWaiter(_Waiter):
 
     def next(self, waiters, actives, exc):
         clause = next(self.generator)
-        schedule((_simulator._time + clause._time, self))
+        sim = _simulator._current()
+        sim.schedule(sim.time + clause._time, self)
 
 
 class _EdgeWaiter(_Waiter):
@@ -143,21 +242,171 @@ class _EdgeWaiter(_Waiter):
 
 class _EdgeTupleWaiter(_Waiter):
 
-    __slots__ = ('generator', 'hasRun')
+    __slots__ = ('generator', 'hasRun', 'clauses', 'wls', 'stamps')
 
     def __init__(self, generator):
         self.generator = generator
         self.hasRun = 0
+        self.clauses = self.wls = self.stamps = None
 
     def next(self, waiters, actives, exc):
-        if self.hasRun:
+        if self.wls is not None and not _fired(self.wls, self.stamps):
             raise StopIteration
-        clauses = next(self.generator)
-        self.hasRun = 1
-        clone = _EdgeTupleWaiter(self.generator)
-        for clause in clauses:
-            clause.append(clone)
-            actives[id(clause)] = clause
+        try:
+            clauses = next(self.generator)
+        except StopIteration:
+            _unwait(self)
+            raise
+        if self.wls is not None and _sameClauses(clauses, self.clauses):
+            _rearm(self, self.wls, self.stamps)
+            self.clauses = clauses
+        else:
+            _rewait(self, clauses, list(clauses))
+
+
+class _DomainWaiter(_Waiter):
+
+    """ Waiter that calls the clocked processes of an edge.
+
+    The processes are plain functions, registered once, and called in
+    order on each edge. The waiter itself is the only entry in the
+    edge waiter list.
+
+    """
+
+    __slots__ = ('edge', 'funcs', 'hasRun')
+
+    def __init__(self, edge):
+        self.edge = edge
+        self.funcs = []
+        self.hasRun = 0
+
+    def next(self, waiters, actives, exc):
+        self.edge.append(self)
+        for func in self.funcs:
+            func()
+
+
+class _FuncWaiter(_Waiter):
+
+    """ Waiter that calls a process function on a single waiter list.
+
+    Decorator based processes wrap a plain function. Their waiters call
+    it directly instead of resuming a generator, and keep the
+    sensitivity list themselves. Unless started is set, the first
+    activation only registers the waiter, like the first yield of the
+    generator.
+
+    """
+
+    __slots__ = ('func', 'wl', 'started', 'hasRun')
+
+    def __init__(self, func, wl, started=0):
+        self.func = func
+        self.wl = wl
+        self.started = started
+        self.hasRun = 0
+
+    def next(self, waiters, actives, exc):
+        if self.started:
+            self.func()
+        else:
+            self.started = 1
+        self.wl.append(self)
+
+
+class _FuncTupleWaiter(_Waiter):
+
+    __slots__ = ('func', 'wls', 'started', 'stamps', 'hasRun')
+
+    def __init__(self, func, wls, started=0):
+        self.func = func
+        self.wls = wls
+        self.started = started
+        self.stamps = None
+        self.hasRun = 0
+
+    def next(self, waiters, actives, exc):
+        wls = self.wls
+        stamps = self.stamps
+        if stamps is None:
+            if self.started:
+                self.func()
+            else:
+                self.started = 1
+            self.stamps = _arm(self, wls)
+        elif _fired(wls, stamps):
+            self.func()
+            _rearm(self, wls, stamps)
+
+
+class _FuncDelayWaiter(_Waiter):
+
+    __slots__ = ('func', 'time', 'started', 'hasRun')
+
+    def __init__(self, func, time, started=0):
+        self.func = func
+        self.time = time
+        self.started = started
+        self.hasRun = 0
+
+    def next(self, waiters, actives, exc):
+        if self.started:
+            self.func()
+        else:
+            self.started = 1
+        sim = _simulator._current()
+        sim.schedule(sim.time + self.time, self)
+
+
+class _PostponedWaiter(_Waiter):
+
+    """ Waiter of a postponed process.
+
+    A change of one of the signals schedules the process in the
+    postponed region of the current timestep, once.
+
+    """
+
+    __slots__ = ('func', 'wls', 'stamps', 'pending', 'hasRun')
+
+    def __init__(self, func, wls):
+        self.func = func
+        self.wls = wls
+        self.stamps = None
+        self.pending = 0
+        self.hasRun = 0
+
+    def next(self, waiters, actives, exc):
+        stamps = self.stamps
+        if stamps is None:
+            self.stamps = _arm(self, self.wls)
+            return
+        if not self.pending:
+            self.pending = 1
+            _simulator._current().postponed.append(self)
+        _rearm(self, self.wls, stamps)
+
+
+def _makeFuncWaiter(func, senslist, started=0):
+    """ Return a waiter that calls func on each activation.
+
+    Return None if the sensitivity list mixes delays with other items.
+
+    """
+    if len(senslist) == 1 and isinstance(senslist[0], delay):
+        return _FuncDelayWaiter(func, senslist[0]._time, started)
+    wls = []
+    for s in senslist:
+        if isinstance(s, _Signal):
+            wls.append(s._eventWaiters)
+        elif isinstance(s, _WaiterList):
+            wls.append(s)
+        else:
+            return None
+    if len(wls) == 1:
+        return _FuncWaiter(func, wls[0], started)
+    return _FuncTupleWaiter(func, tuple(wls), started)
 
 
 class _SignalWaiter(_Waiter):
@@ -175,22 +424,26 @@ class _SignalWaiter(_Waiter):
 
 class _SignalTupleWaiter(_Waiter):
 
-    __slots__ = ('generator', 'hasRun')
+    __slots__ = ('generator', 'hasRun', 'clauses', 'wls', 'stamps')
 
     def __init__(self, generator):
         self.generator = generator
         self.hasRun = 0
+        self.clauses = self.wls = self.stamps = None
 
     def next(self, waiters, actives, exc):
-        if self.hasRun:
+        if self.wls is not None and not _fired(self.wls, self.stamps):
             raise StopIteration
-        clauses = next(self.generator)
-        self.hasRun = 1
-        clone = _SignalTupleWaiter(self.generator)
-        for clause in clauses:
-            wl = clause._eventWaiters
-            wl.append(clone)
-            actives[id(wl)] = wl
+        try:
+            clauses = next(self.generator)
+        except StopIteration:
+            _unwait(self)
+            raise
+        if self.wls is not None and _sameClauses(clauses, self.clauses):
+            _rearm(self, self.wls, self.stamps)
+            self.clauses = clauses
+        else:
+            _rewait(self, clauses, [c._eventWaiters for c in clauses])
 
 
 #_kind = enum("SIGNAL_TUPLE", "EDGE_TUPLE", "SIGNAL", "EDGE", "DELAY", "UNDEFINED")
@@ -203,25 +456,69 @@ class _kind(object):
     UNDEFINED = 6
 
 
+def _symKind(obj):
+    """ Return the kind of a name in a yield statement. """
+    if isinstance(obj, _Signal):
+        return _kind.SIGNAL
+    if obj is delay:
+        return _kind.DELAY
+    if obj is posedge or obj is negedge:
+        return _kind.EDGE
+    return _kind.UNDEFINED
+
+
+# The inferred kind of a generator only depends on its code, and on the
+# kinds of the names in its yield statements. Instances of the same
+# generator function are therefore only analyzed once.
+_yieldInfo = {}
+_waiterKinds = {}
+
+
+def _getYieldInfo(f):
+    """ Return the AST of a generator frame, and its yielded names. """
+    code = f.f_code
+    info = _yieldInfo.get(code)
+    if info is None:
+        s = inspect.getsource(f)
+        s = _dedent(s)
+        root = ast.parse(s)
+        names = set()
+        for node in ast.walk(root):
+            if isinstance(node, ast.Yield) and node.value is not None:
+                for n in ast.walk(node.value):
+                    if isinstance(n, ast.Name):
+                        names.add(n.id)
+        info = _yieldInfo[code] = (root, tuple(names))
+    return info
+
+
 def _inferWaiter(gen):
     f = gen.gi_frame
-    s = inspect.getsource(f)
-    s = _dedent(s)
-    root = ast.parse(s)
-    root.symdict = f.f_globals.copy()
-    root.symdict.update(f.f_locals)
-    # print ast.dump(root)
-    v = _YieldVisitor(root)
-    v.visit(root)
-    if v.kind == _kind.EDGE_TUPLE:
+    root, names = _getYieldInfo(f)
+    f_locals, f_globals = f.f_locals, f.f_globals
+    symdict = {}
+    for n in names:
+        if n in f_locals:
+            symdict[n] = f_locals[n]
+        elif n in f_globals:
+            symdict[n] = f_globals[n]
+    key = (f.f_code,) + tuple([_symKind(symdict.get(n)) for n in names])
+    kind = _waiterKinds.get(key)
+    if kind is None:
+        root.symdict = symdict
+        # print ast.dump(root)
+        v = _YieldVisitor(root)
+        v.visit(root)
+        kind = _waiterKinds[key] = v.kind or _kind.UNDEFINED
+    if kind == _kind.EDGE_TUPLE:
         return _EdgeTupleWaiter(gen)
-    if v.kind == _kind.SIGNAL_TUPLE:
+    if kind == _kind.SIGNAL_TUPLE:
         return _SignalTupleWaiter(gen)
-    if v.kind == _kind.DELAY:
+    if kind == _kind.DELAY:
         return _DelayWaiter(gen)
-    if v.kind == _kind.EDGE:
+    if kind == _kind.EDGE:
         return _EdgeWaiter(gen)
-    if v.kind == _kind.SIGNAL:
+    if kind == _kind.SIGNAL:
         return _SignalWaiter(gen)
     # default
     return _Waiter(gen)
@@ -268,16 +565,7 @@ class _YieldVisitor(ast.NodeVisitor):
         node.kind = fn.kind
 
     def visit_Name(self, node):
-        n = node.id
-        node.kind = _kind.UNDEFINED
-        if n in self.root.symdict:
-            obj = self.root.symdict[n]
-            if isinstance(obj, _Signal):
-                node.kind = _kind.SIGNAL
-            elif obj is delay:
-                node.kind = _kind.DELAY
-            elif obj is posedge or obj is negedge:
-                node.kind = _kind.EDGE
+        node.kind = _symKind(self.root.symdict.get(node.id))
 
     def visit_Attribute(self, node):
         node.kind = _kind.UNDEFINED
@@ -21,12 +21,16 @@
 
 This module provides the following myhdl objects:
 Simulation -- simulation class
+CycleSimulation -- cycle-based simulation class for synchronous designs
+PartitionedSimulation -- simulation class for designs split in partitions
 StopSimulation -- exception that stops a simulation
 now -- function that returns the current time
 Signal -- factory function to model hardware signals
 SignalType -- Signal base class
+immutable -- registers a value type that signals propagate by reference
 ConcatSignal --  factory function that models a concatenation shadow signal
 TristateSignal -- factory function that models a tristate shadow signal
+Memory -- array of intbv words with compact storage, to model RAMs
 delay -- callable to model delay in a yield statement
 posedge -- callable to model a rising edge on a signal in a yield statement
 negedge -- callable to model a falling edge on a signal in a yield statement
@@ -44,6 +48,7 @@ always --
 always_comb -- decorator that returns an input-sensitive generator
 always_seq --
 ResetSignal --
+Clock -- periodic clock source toggled by the simulator
 enum -- function that returns an enumeration type
 traceSignals -- function that enables signal tracing in a VCD file
 toVerilog -- function that converts a design to Verilog
@@ -150,9 +155,10 @@ from ._concat import concat
 from ._intbv import intbv
 from ._modbv import modbv
 from ._join import join
-from ._Signal import posedge, negedge, Signal, SignalType
+from ._Signal import posedge, negedge, Signal, SignalType, immutable
 from ._ShadowSignal import ConcatSignal
 from ._ShadowSignal import TristateSignal
+from ._memory import Memory
 from ._simulator import now
 from ._delay import delay
 from ._Cosimulation import Cosimulation
@@ -160,11 +166,16 @@ from ._Simulation import Simulation
 from ._misc import instances, downrange
 from ._always_comb import always_comb
 from ._always_seq import always_seq, ResetSignal
+from ._always_postponed import always_postponed
 from ._always import always
 from ._instance import instance
+from ._clock import Clock
 from ._block import block
 from ._enum import enum, EnumType, EnumItemType
 from ._traceSignals import traceSignals
+from ._CycleSimulation import CycleSimulation
+from ._partition import PartitionedSimulation
+from ._regress import regress
 
 from myhdl import conversion
 from .conversion import toVerilog
@@ -182,21 +193,28 @@ __all__ = ["bin",
            "negedge",
            "Signal",
            "SignalType",
+           "immutable",
            "ConcatSignal",
            "TristateSignal",
+           "Memory",
            "now",
            "delay",
            "downrange",
            "StopSimulation",
            "Cosimulation",
            "Simulation",
+           "CycleSimulation",
+           "PartitionedSimulation",
+           "regress",
            "instances",
            "instance",
+           "Clock",
            "block",
            "always_comb",
            "always_seq",
            "ResetSignal",
            "always",
+           "always_postponed",
            "enum",
            "EnumType",
            "EnumItemType",
@@ -0,0 +1,94 @@
+""" Run testbenches in parallel from the command line.
+
+Usage: python -m myhdl [options] module:factory [module:factory ...]
+
+Each factory is called with every combination of the --param values,
+and the resulting testbenches are simulated in a pool of worker
+processes. For example:
+
+    python -m myhdl -j 8 -p seed=1,2,3,4 -p width=8,16 tb_fifo:tb_fifo
+
+runs 8 simulations. The exit status is 1 if any of them failed.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import argparse
+import ast
+import importlib
+import itertools
+import os
+import sys
+
+from myhdl._regress import regress, _label
+
+
+def _value(s):
+    try:
+        return ast.literal_eval(s)
+    except (ValueError, SyntaxError):
+        return s
+
+
+def _param(s):
+    name, sep, values = s.partition('=')
+    if not sep or not name:
+        raise argparse.ArgumentTypeError("expected name=value[,value...]: %r" % s)
+    return name, [_value(v) for v in values.split(',')]
+
+
+def _factory(s):
+    modname, sep, name = s.partition(':')
+    if not sep:
+        raise argparse.ArgumentTypeError("expected module:factory: %r" % s)
+    return getattr(importlib.import_module(modname), name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m myhdl",
+        description="Run MyHDL testbenches in parallel worker processes.")
+    parser.add_argument('factories', nargs='+', metavar='module:factory',
+                        help="testbench factory")
+    parser.add_argument('-p', '--param', action='append', type=_param,
+                        default=[], metavar='NAME=V1,V2,...',
+                        help="parameter values to sweep")
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help="number of worker processes (default: all cores)")
+    parser.add_argument('-d', '--duration', type=int, default=None,
+                        help="simulation duration of each run")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="show the output of all runs, not only failures")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.getcwd())
+    try:
+        factories = [_factory(s) for s in args.factories]
+    except (ImportError, AttributeError) as e:
+        parser.error(str(e))
+
+    names = [name for name, values in args.param]
+    combos = [dict(zip(names, values)) for values in
+              itertools.product(*[values for name, values in args.param])]
+    tests = [(f, params) for f in factories for params in combos]
+
+    def report(result):
+        status = "PASS" if result.passed else "FAIL"
+        print("%s %-50s %8.2fs" % (status, _label(result.name, result.params),
+                                    result.time))
+        if args.verbose or not result.passed:
+            if result.output:
+                print(result.output, end='')
+            if result.error:
+                print(result.error, end='')
+        sys.stdout.flush()
+
+    results = regress(tests, processes=args.processes,
+                      duration=args.duration, callback=report)
+    failed = sum(1 for r in results if not r.passed)
+    print("%d passed, %d failed" % (len(results) - failed, failed))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -29,7 +29,7 @@ from myhdl._delay import delay
 from myhdl._Signal import _Signal
 from myhdl._Signal import _WaiterList
 from myhdl._Waiter import _Waiter, _SignalWaiter, _SignalTupleWaiter, \
-    _DelayWaiter, _EdgeWaiter, _EdgeTupleWaiter
+    _DelayWaiter, _EdgeWaiter, _EdgeTupleWaiter, _makeFuncWaiter
 from myhdl._instance import _Instantiator, _getCallInfo
 
 
@@ -88,6 +88,9 @@ def always(*args):
 
 class _Always(_Instantiator):
 
+    # run the function before the first wait
+    _started = 0
+
     def __init__(self, func, senslist, callinfo, sigdict=None):
         self.func = func
         self.senslist = tuple(senslist)
@@ -100,6 +103,25 @@ class _Always(_Instantiator):
     def funcobj(self):
         return self.func
 
+    @property
+    def waiter(self):
+        func = self._target()
+        if func is not None:
+            w = _makeFuncWaiter(func, self.senslist, self._started)
+            if w is not None:
+                return w
+        return self._waiter()(self.gen)
+
+    def _target(self):
+        """ Return the function to call on each activation.
+
+        Return None if a subclass defines its own generator function.
+
+        """
+        if getattr(self.genfunc, '__func__', None) is not _Always.genfunc:
+            return None
+        return self.func
+
     def _waiter(self):
         # infer appropriate waiter class
         # first infer base type of arguments
@@ -126,6 +148,13 @@ class _Always(_Instantiator):
                 w = _EdgeTupleWaiter
         return w
 
+    def _clocked(self):
+        func = self._target()
+        if func is None or len(self.senslist) != 1 or \
+                not isinstance(self.senslist[0], _WaiterList):
+            return None
+        return self.senslist, func
+
     def genfunc(self):
         senslist = self.senslist
         if len(senslist) == 1:
@@ -24,9 +24,11 @@ from types import FunctionType
 
 from myhdl import AlwaysCombError
 from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._memory import Memory, _MemoryWord
 from myhdl._util import _isGenFunc
 from myhdl._instance import _getCallInfo
 from myhdl._always import _Always
+from myhdl._Waiter import _makeFuncWaiter
 
 
 class _error:
@@ -37,6 +39,7 @@ _error.Scope = "always_comb argument should be a local function"
 _error.SignalAsInout = "signal (%s) used as inout in always_comb function argument"
 _error.EmbeddedFunction = "embedded functions in always_comb function argument not supported"
 _error.EmptySensitivityList = "sensitivity list is empty"
+_error.CombLoop = "combinational loop through always_comb blocks"
 
 
 def always_comb(func):
@@ -68,12 +71,38 @@ class _AlwaysComb(_Always):
             s = self.symdict[n]
             if isinstance(s, _Signal):
                 senslist.append(s)
+            elif isinstance(s, Memory):
+                # wait on any word, without a waiter list per word
+                senslist.append(s._eventWaiters)
             elif _isListOfSigs(s):
                 senslist.extend(s)
         self.senslist = tuple(senslist)
         if len(self.senslist) == 0:
             raise AlwaysCombError(_error.EmptySensitivityList)
 
+        # memory words are not levelized: readers wait on the memory
+        outsigs = []
+        for n in self.outputs:
+            s = self.symdict[n]
+            if isinstance(s, _MemoryWord):
+                pass
+            elif isinstance(s, _Signal):
+                outsigs.append(s)
+            elif _isListOfSigs(s):
+                outsigs.extend(s)
+        self.outsigs = tuple(outsigs)
+
+    _started = 1
+
+    def _target(self):
+        if getattr(self.genfunc, '__func__', None) is not _AlwaysComb.genfunc:
+            return None
+        return self.func
+
+    def _clocked(self):
+        # a memory is a waiter list too, but the initial run is required
+        return None
+
     def genfunc(self):
         senslist = self.senslist
         if len(senslist) == 1:
@@ -82,3 +111,77 @@ class _AlwaysComb(_Always):
         while 1:
             func()
             yield senslist
+
+
+def _levelize(combs):
+    """ Return always_comb blocks sorted in dependency order.
+
+    A block depends on another block when it reads one of its output
+    signals. Raise an AlwaysCombError on a combinational loop.
+    """
+    drivers = {}
+    for c in combs:
+        for s in c.outsigs:
+            drivers.setdefault(id(s), []).append(c)
+    fanout = dict((id(c), []) for c in combs)
+    indegree = dict((id(c), 0) for c in combs)
+    for c in combs:
+        for s in c.senslist:
+            for d in drivers.get(id(s), ()):
+                fanout[id(d)].append(c)
+                indegree[id(c)] += 1
+    order = []
+    ready = [c for c in combs if not indegree[id(c)]]
+    while ready:
+        c = ready.pop(0)
+        order.append(c)
+        for f in fanout[id(c)]:
+            indegree[id(f)] -= 1
+            if not indegree[id(f)]:
+                ready.append(f)
+    if len(order) < len(combs):
+        loop = sorted(c.name for c in combs if indegree[id(c)])
+        raise AlwaysCombError(_error.CombLoop, ", ".join(loop))
+    return order
+
+
+class _AlwaysCombNetwork(object):
+
+    """ Levelized network of always_comb blocks.
+
+    The blocks are evaluated once per activation in dependency order,
+    instead of one delta cycle per logic level. The network waits on
+    the signals that are read but not driven by its blocks.
+    """
+
+    def __init__(self, combs):
+        self.combs = _levelize(combs)
+        driven = set()
+        for c in self.combs:
+            for s in c.outsigs:
+                driven.add(id(s))
+        senslist = []
+        seen = set()
+        for c in self.combs:
+            for s in c.senslist:
+                if id(s) not in driven and id(s) not in seen:
+                    seen.add(id(s))
+                    senslist.append(s)
+        self.senslist = tuple(senslist)
+
+    @property
+    def waiter(self):
+        return _makeFuncWaiter(self.step, self.senslist, 1)
+
+    def step(self):
+        # Downstream blocks see the next value of internal signals.
+        # Current values are restored afterwards, so that all outputs
+        # change together in the next delta cycle as usual.
+        saved = []
+        for c in self.combs:
+            c.func()
+            for s in c.outsigs:
+                saved.append((s, s._val))
+                s._val = s._next
+        for s, val in saved:
+            s._val = val
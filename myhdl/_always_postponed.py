@@ -0,0 +1,97 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2012 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module with the always_postponed decorator. """
+from __future__ import absolute_import
+
+
+from types import FunctionType
+
+from myhdl import AlwaysError
+from myhdl._util import _isGenFunc
+from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._memory import Memory
+from myhdl._Waiter import _PostponedWaiter
+from myhdl._always import _Always, _get_sigdict
+from myhdl._instance import _getCallInfo
+
+
+class _error:
+    pass
+_error.DecArgType = "always_postponed argument should be a Signal or a list of Signals"
+_error.DecNrOfArgs = "always_postponed decorator should have arguments"
+_error.ArgType = "decorated object should be a classic (non-generator) function"
+_error.NrOfArgs = "decorated function should not have arguments"
+_error.SignalAssign = "always_postponed function should not drive signals"
+
+
+def always_postponed(*args):
+    """ Decorator for processes that run at the end of a timestep.
+
+    The function runs after the last delta cycle of each timestep in
+    which one of the argument signals changed, and sees their settled
+    values. It runs at most once per timestep, and should not drive
+    signals. This is meant for monitors and checkers.
+
+    """
+    callinfo = _getCallInfo()
+    if not args:
+        raise AlwaysError(_error.DecNrOfArgs)
+    senslist = []
+    for arg in args:
+        if isinstance(arg, _Signal):
+            senslist.append(arg)
+        elif _isListOfSigs(arg):
+            senslist.extend(arg)
+        else:
+            raise AlwaysError(_error.DecArgType)
+    for s in senslist:
+        s._read = True
+        s._used = True
+    sigdict = _get_sigdict(senslist, callinfo.symdict)
+
+    def _always_postponed_decorator(func):
+        if not isinstance(func, FunctionType):
+            raise AlwaysError(_error.ArgType)
+        if _isGenFunc(func):
+            raise AlwaysError(_error.ArgType)
+        if func.__code__.co_argcount > 0:
+            raise AlwaysError(_error.NrOfArgs)
+        return _AlwaysPostponed(func, senslist, callinfo=callinfo,
+                                sigdict=sigdict)
+    return _always_postponed_decorator
+
+
+class _AlwaysPostponed(_Always):
+
+    def __init__(self, func, senslist, callinfo, sigdict):
+        super(_AlwaysPostponed, self).__init__(
+            func, senslist, callinfo=callinfo, sigdict=sigdict)
+        for n in self.outputs | self.inouts:
+            s = self.symdict[n]
+            if isinstance(s, (_Signal, Memory)) or _isListOfSigs(s):
+                raise AlwaysError(_error.SignalAssign, n)
+
+    @property
+    def waiter(self):
+        return _PostponedWaiter(self.func, [s._eventWaiters
+                                            for s in self.senslist])
+
+    def _clocked(self):
+        return None
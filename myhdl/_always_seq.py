@@ -26,6 +26,7 @@ from types import FunctionType
 from myhdl import AlwaysError, intbv
 from myhdl._util import _isGenFunc
 from myhdl._Signal import _Signal, _WaiterList, _isListOfSigs
+from myhdl._memory import Memory, _MemoryWord
 from myhdl._always import _Always, _get_sigdict
 from myhdl._instance import _getCallInfo
 
@@ -113,7 +114,9 @@ class _AlwaysSeq(_Always):
         varregs = self.varregs = []
         for n in self.outputs:
             reg = self.symdict[n]
-            if isinstance(reg, _Signal):
+            if isinstance(reg, (Memory, _MemoryWord)):
+                pass  # memory contents are not reset, as in a RAM
+            elif isinstance(reg, _Signal):
                 sigregs.append(reg)
             elif isinstance(reg, intbv):
                 varregs.append((n, reg, int(reg)))
@@ -132,6 +135,34 @@ class _AlwaysSeq(_Always):
             _, reg, init = v
             reg._val = init
 
+    def _clocked(self):
+        # with an asynchronous reset, both edges may occur in the same
+        # timestep, but a second call has the same effect as the first
+        func = self._target()
+        if func is None:
+            return None
+        return self.senslist, func
+
+    def _target(self):
+        genfunc = getattr(self.genfunc, '__func__', None)
+        if genfunc is _AlwaysSeq.genfunc_no_reset:
+            return self.func
+        if genfunc is not _AlwaysSeq.genfunc_reset:
+            return None
+        reset = self.reset
+        active = reset.active
+        reset_sigs = self.reset_sigs
+        reset_vars = self.reset_vars
+        func = self.func
+
+        def step():
+            if reset == active:
+                reset_sigs()
+                reset_vars()
+            else:
+                func()
+        return step
+
     def genfunc_reset(self):
         senslist = self.senslist
         if len(senslist) == 1:
@@ -0,0 +1,132 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Simulation with asyncio
+
+Coroutine processes (async def) await simulator triggers: signals,
+edges, delays and join objects. They can also await asyncio objects,
+when the simulation is run with Simulation.arun. The simulation then
+continues without the process, until the asyncio object is done.
+
+This module requires Python 3.5 or later, and is only imported when a
+simulation has coroutine processes or is run with arun.
+
+"""
+from __future__ import absolute_import
+
+import asyncio
+
+from myhdl import SimulationError, StopSimulation
+from myhdl._compat import integer_types
+from myhdl._delay import delay
+from myhdl._join import join
+from myhdl._Signal import _Signal, _WaiterList
+from myhdl._Waiter import _Waiter
+from myhdl import _simulator
+
+
+class _error:
+    pass
+_error.NoLoop = "Coroutine process awaits an asyncio object outside of Simulation.arun"
+_error.Step = "arun step should be a positive integer"
+
+
+class _CoroutineWaiter(_Waiter):
+
+    """ Waiter of a coroutine process. """
+
+    __slots__ = ('waiters',)
+
+    def __init__(self, coro):
+        _Waiter.__init__(self, _triggers(coro, self))
+        # the waiters of the simulation, to continue after an asyncio object
+        self.waiters = None
+
+    def next(self, waiters, actives, exc):
+        self.waiters = waiters
+        _Waiter.next(self, waiters, actives, exc)
+
+
+def _triggers(coro, waiter):
+    """ Generate the clauses that a coroutine process waits for. """
+    while 1:
+        try:
+            clause = coro.send(None)
+        except StopIteration:
+            return
+        if isinstance(clause, (delay, join, _Signal, _WaiterList)):
+            yield clause
+        else:
+            yield _external(clause, waiter)
+
+
+def _external(fut, waiter):
+    """ Return a waiter list that fires when an asyncio future is done.
+
+    A bare yield, as in asyncio.sleep(0), lets the other tasks run.
+
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        raise SimulationError(_error.NoLoop)
+    if fut is None:
+        fut = loop.create_future()
+        loop.call_soon(fut.set_result, None)
+    elif asyncio.isfuture(fut):
+        # like an asyncio task, take over the wait
+        fut._asyncio_future_blocking = False
+    else:
+        raise TypeError("await of %s has type %s" % (repr(fut), type(fut)))
+    state = _simulator._current()
+    state.awaiting.add(fut)
+    wl = _WaiterList()
+
+    def resume(fut):
+        state.awaiting.discard(fut)
+        # continue in a delta cycle at the start of the next run
+        waiter.waiters.extend(wl)
+        del wl[:]
+
+    fut.add_done_callback(resume)
+    return wl
+
+
+async def _arun(sim, duration, until, max_time, step):
+    if not isinstance(step, integer_types) or step <= 0:
+        raise ValueError(_error.Step)
+    if sim._finished:
+        raise StopSimulation("Simulation has already finished")
+    state = sim._state
+    maxTime = sim._maxTime(duration, until, max_time)
+    while 1:
+        if state.awaiting and not (state.futureEvents or sim._waiters or
+                                   state.siglist):
+            # only an asyncio object can wake the simulation up
+            await asyncio.wait(list(state.awaiting),
+                               return_when=asyncio.FIRST_COMPLETED)
+        limit = state.time + step
+        if maxTime is not None and maxTime < limit:
+            limit = maxTime
+        cond = sim._condition(until)
+        if not sim._resume(limit, 1, cond):
+            return 0
+        if cond is not None and cond.met or state.time == maxTime:
+            return 1
+        await asyncio.sleep(0)
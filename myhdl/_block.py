@@ -34,6 +34,7 @@ from myhdl._extractHierarchy import (_makeMemInfo,
                                      _UserVerilogCode, _UserVhdlCode,
                                      _UserVerilogInstance, _UserVhdlInstance)
 from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._memory import Memory
 
 from weakref import WeakValueDictionary
 
@@ -270,7 +271,7 @@ class _Block(object):
                 self.sigdict[n] = v
                 if n in usedsigdict:
                     v._markUsed()
-            if _isListOfSigs(v):
+            if isinstance(v, Memory) or _isListOfSigs(v):
                 m = _makeMemInfo(v)
                 self.memdict[n] = m
                 if n in usedlosdict:
@@ -348,12 +349,32 @@ class _Block(object):
                 setattr(myhdl.traceSignals, k, v)
             myhdl.traceSignals(self)
 
-    def run_sim(self, duration=None, quiet=0):
+    def run_sim(self, duration=None, quiet=0, engine='event', **kwargs):
+        """Runs a simulation of this BlockInstance
+
+        Args:
+            duration (Optional[int]): Simulation duration. Defaults to
+                forever for the event-driven engine.
+            quiet (Optional[bool]): Don't print StopSimulation messages.
+            engine (Optional[str]): 'event' for the event-driven simulator,
+                'cycle' for the cycle-based simulator of fully synchronous
+                designs, 'compiled' for the cycle-based simulator with
+                compiled processes. Defaults to 'event'.
+            kwargs: Passed to the simulator constructor on the first call.
+        """
         if self.sim is None:
             sim = self
             #if self._config_sim['trace']:
             #    sim = myhdl.traceSignals(self)
-            self.sim = myhdl._Simulation.Simulation(sim)
+            if engine == 'event':
+                self.sim = myhdl._Simulation.Simulation(sim, **kwargs)
+            elif engine == 'cycle':
+                self.sim = myhdl._CycleSimulation.CycleSimulation(sim, **kwargs)
+            elif engine == 'compiled':
+                self.sim = myhdl._CycleSimulation.CycleSimulation(
+                    sim, compiled=True, **kwargs)
+            else:
+                raise BlockInstanceError('unknown simulation engine %s' % engine)
         self.sim.run(duration, quiet)
 
     def quit_sim(self):
@@ -0,0 +1,272 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Fork based simulation branches and checkpoints
+
+Generators can't be copied or pickled, but a forked process is a copy
+of the whole interpreter. A branch runs a scenario in a forked copy of
+a simulation, and sends the result back through a pipe. A checkpoint
+is a forked copy that waits, and forks a branch for each scenario it
+is sent.
+
+"""
+from __future__ import absolute_import
+
+import array
+import os
+import pickle
+import signal
+import socket
+import struct
+import sys
+import traceback
+
+from myhdl import SimulationError, StopSimulation
+
+
+class _error:
+    pass
+_error.NoFork = "Simulation branches require os.fork"
+_error.Cosim = "Cannot branch a simulation with a cosimulation"
+_error.Closed = "Checkpoint is closed"
+_error.BranchExit = "Simulation branch exited without a result"
+_error.BranchResult = "Simulation branch result cannot be pickled"
+
+
+class SimulationBranch(object):
+
+    """ Handle to a scenario running in a forked copy of a simulation.
+
+    Methods:
+    result -- wait for the scenario and return its result
+
+    """
+
+    def __init__(self, rfd, pid=None):
+        self._rfd = rfd
+        self._pid = pid
+        self._result = None
+        self.traceback = None
+
+    def result(self):
+        """ Wait for the scenario and return its return value.
+
+        An exception raised by the scenario is raised again. Its formatted
+        traceback in the child process is available as the traceback
+        attribute.
+
+        """
+        if self._rfd is not None:
+            with os.fdopen(self._rfd, 'rb') as f:
+                self._rfd = None
+                data = f.read()
+            if self._pid is not None:
+                os.waitpid(self._pid, 0)
+            if not data:
+                self._result = (False, SimulationError(_error.BranchExit), None)
+            else:
+                self._result = pickle.loads(data)
+        ok, value, self.traceback = self._result
+        if not ok:
+            raise value
+        return value
+
+
+class SimulationCheckpoint(object):
+
+    """ Snapshot of a simulation at the time it was taken.
+
+    The snapshot is a forked copy of the process that waits for
+    scenarios. The simulation itself can continue. Scenarios are sent
+    to the snapshot with pickle, so they should be module level
+    functions.
+
+    Methods:
+    branch -- run a scenario in a copy of the snapshot
+    close -- end the snapshot process
+
+    """
+
+    def __init__(self, sim):
+        tracepos = _prepare(sim)
+        parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        pid = os.fork()
+        if pid == 0:
+            parent.close()
+            _serve(sim, child, tracepos)
+        child.close()
+        self._sock = parent
+        self._pid = pid
+        self.time = sim._state.time
+
+    def branch(self, fn, name=None):
+        """ Run fn(sim) in a copy of the snapshot.
+
+        fn -- scenario, called with the copied simulation object
+        name -- suffix of the branch trace file (default: a number)
+
+        Returns a SimulationBranch.
+
+        """
+        if self._sock is None:
+            raise SimulationError(_error.Closed)
+        rfd, wfd = os.pipe()
+        try:
+            _send(self._sock, pickle.dumps((fn, name), pickle.HIGHEST_PROTOCOL),
+                  wfd)
+        finally:
+            os.close(wfd)
+        return SimulationBranch(rfd)
+
+    def close(self):
+        """ End the snapshot process. Running branches continue. """
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            os.waitpid(self._pid, 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _branch(sim, fn, name):
+    tracepos = _prepare(sim)
+    sim._nbranches += 1
+    if name is None:
+        name = "branch%d" % sim._nbranches
+    rfd, wfd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(rfd)
+        _child(sim, fn, name, wfd, tracepos)
+    os.close(wfd)
+    return SimulationBranch(rfd, pid)
+
+
+def _prepare(sim):
+    """ Check that sim can be forked, and flush buffered output. """
+    if not hasattr(os, 'fork'):
+        raise SimulationError(_error.NoFork)
+    if sim._finished:
+        raise StopSimulation("Simulation has already finished")
+    if sim._cosims:
+        raise SimulationError(_error.Cosim)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    state = sim._state
+    if state.tracing:
+        state.tf.flush()
+        return state.tf.tell()
+    return None
+
+
+def _detach(sim, name, tracepos):
+    """ Continue the trace of the parent in a file of our own. """
+    state = sim._state
+    if not state.tracing:
+        return
+    path = state.tf.name
+    base = path[:-4] if path.endswith('.vcd') else path
+    # the parent continues to write the original file
+    state.tf = open("%s_%s.vcd" % (base, name), 'w')
+    with open(path, 'rb') as f:
+        state.tf.write(f.read(tracepos).decode())
+
+
+def _child(sim, fn, name, wfd, tracepos):
+    status = 1
+    try:
+        _detach(sim, name, tracepos)
+        try:
+            result = (True, fn(sim), None)
+        except Exception as e:
+            result = (False, e, traceback.format_exc())
+        try:
+            data = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+            pickle.loads(data)
+        except Exception:
+            e = SimulationError(_error.BranchResult, result[2] or "")
+            data = pickle.dumps((False, e, result[2]), pickle.HIGHEST_PROTOCOL)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        with os.fdopen(wfd, 'wb') as f:
+            f.write(data)
+        status = 0
+    finally:
+        os._exit(status)
+
+
+def _serve(sim, sock, tracepos):
+    status = 1
+    try:
+        # branches are not waited for: let the system reap them
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        n = 0
+        while 1:
+            data, wfd = _recv(sock)
+            if data is None:
+                break
+            n += 1
+            pid = os.fork()
+            if pid == 0:
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                sock.close()
+                fn, name = pickle.loads(data)
+                if name is None:
+                    name = "branch%d" % n
+                _child(sim, fn, name, wfd, tracepos)
+            os.close(wfd)
+        status = 0
+    finally:
+        os._exit(status)
+
+
+def _send(sock, data, fd):
+    header = struct.pack('!I', len(data))
+    fds = array.array('i', [fd])
+    sock.sendmsg([header], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, fds)])
+    sock.sendall(data)
+
+
+def _recvall(sock, n):
+    chunks = []
+    while n:
+        chunk = sock.recv(n)
+        if not chunk:
+            raise EOFError
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(sock):
+    fds = array.array('i')
+    header, ancdata, flags, addr = sock.recvmsg(
+        4, socket.CMSG_LEN(fds.itemsize))
+    if not header:
+        return None, None
+    for level, kind, d in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(d[:len(d) - (len(d) % fds.itemsize)])
+    header += _recvall(sock, 4 - len(header))
+    n = struct.unpack('!I', header)[0]
+    return _recvall(sock, n), fds[0]
@@ -0,0 +1,137 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the Clock class """
+from __future__ import absolute_import
+
+from myhdl._compat import integer_types
+from myhdl._delay import delay
+from myhdl._Signal import _Signal
+from myhdl._Waiter import _Waiter
+from myhdl._always import _get_sigdict
+from myhdl._instance import _Instantiator, _getCallInfo
+from myhdl import _simulator
+
+
+class _error:
+    pass
+_error.SigType = "Clock signal should be a Signal"
+_error.Period = "Clock period should be a positive integer"
+_error.Phase = "Clock phase should be a natural integer"
+_error.Duty = "Clock duty cycle should leave a high and a low time of at least 1"
+
+
+class Clock(_Instantiator):
+
+    """ Periodic clock source.
+
+    The simulator toggles the clock signal from its event queue, without
+    a generator process. Clocks with related periods are simply several
+    Clock instances.
+
+    """
+
+    def __init__(self, sig, period, phase=0, duty=0.5):
+        """ Construct a clock source.
+
+        sig -- clock signal, low at the start
+        period -- clock period, a positive integer
+        phase -- delay of the waveform (default: 0)
+        duty -- fraction of the period that the clock is high (default: 0.5)
+
+        The clock is low first: with the default phase and duty cycle,
+        the waveform is that of a generator that toggles the clock every
+        half period.
+
+        """
+        callinfo = _getCallInfo()
+        if not isinstance(sig, _Signal):
+            raise TypeError(_error.SigType)
+        if not isinstance(period, integer_types) or period <= 0:
+            raise ValueError(_error.Period)
+        if not isinstance(phase, integer_types) or phase < 0:
+            raise ValueError(_error.Phase)
+        high = int(round(period * duty))
+        low = period - high
+        if high < 1 or low < 1:
+            raise ValueError(_error.Duty)
+        self.sig = sig
+        self.period = period
+        self.phase = phase
+        self.high = high
+        self.low = low
+
+        # equivalent generator, for tools that look at processes
+        def clock():
+            yield delay(phase + low)
+            while 1:
+                sig.next = 1
+                yield delay(high)
+                sig.next = 0
+                yield delay(low)
+
+        super(Clock, self).__init__(clock, callinfo=callinfo)
+        sig._driven = 'reg'
+        self.sigdict = _get_sigdict([sig], callinfo.symdict)
+        self.losdict = {}
+        self.inputs = set()
+        self.outputs = set(self.sigdict)
+
+    @property
+    def waiter(self):
+        return _ClockWaiter(self.sig, self.phase + self.low, self.high,
+                            self.low)
+
+    def __repr__(self):
+        return "Clock(%s, period=%d, phase=%d, high=%d)" % (
+            self.sig._name or repr(self.sig), self.period, self.phase,
+            self.high)
+
+
+class _ClockWaiter(_Waiter):
+
+    """ Waiter that drives a clock from the future events. """
+
+    __slots__ = ('sig', 'start', 'high', 'low', 'level', 'sim', 'hasRun')
+
+    def __init__(self, sig, start, high, low):
+        self.sig = sig
+        self.start = start
+        self.high = high
+        self.low = low
+        self.level = None
+        self.sim = None
+        self.hasRun = 0
+
+    def next(self, waiters, actives, exc):
+        sim = self.sim
+        level = self.level
+        if level is None:
+            # a waiter belongs to a single simulation
+            self.sim = sim = _simulator._current()
+            self.level = 1
+            sim.schedule(sim.time + self.start, self)
+        elif level:
+            self.sig.next = 1
+            self.level = 0
+            sim.schedule(sim.time + self.high, self)
+        else:
+            self.sig.next = 0
+            self.level = 1
+            sim.schedule(sim.time + self.low, self)
@@ -25,7 +25,7 @@
 from __future__ import absolute_import
 
 from myhdl._compat import integer_types
-from myhdl._intbv import intbv
+from myhdl._intbv import intbv, _newbv
 from myhdl._Signal import _Signal
 from myhdl._compat import long
 
@@ -80,6 +80,9 @@ def concat(base, *args):
         val = val << w | v & (long(1) << w) - 1
 
     if basewidth:
-        return intbv(val, _nrbits=basewidth + width)
+        width += basewidth
+        res = _newbv(intbv, val, 0, 1 << width, width)
+        res._handleBounds()
+        return res
     else:
         return intbv(val)
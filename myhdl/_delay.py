@@ -39,3 +39,6 @@ class delay(object):
         if not isinstance(val, integer_types) or val < 0:
             raise TypeError(_errmsg)
         self._time = val
+
+    def __await__(self):
+        yield self
@@ -29,6 +29,7 @@ import string
 
 from myhdl import ExtractHierarchyError, ToVerilogError, ToVHDLError
 from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._memory import Memory
 from myhdl._util import _flatten
 from myhdl._util import _genfunc
 from myhdl._misc import _isGenSeq
@@ -354,7 +355,7 @@ class _HierExtr(object):
                             sigdict[n] = v
                             if n in cellvars:
                                 v._markUsed()
-                        if _isListOfSigs(v):
+                        if isinstance(v, Memory) or _isListOfSigs(v):
                             m = _makeMemInfo(v)
                             memdict[n] = m
                             if n in cellvars:
@@ -25,7 +25,7 @@ import inspect
 from types import FunctionType
 
 from myhdl import InstanceError
-from myhdl._util import _isGenFunc, _makeAST
+from myhdl._util import _isGenFunc, _isCoroutineFunc, _isCoroutine, _makeAST
 from myhdl._Waiter import _inferWaiter
 from myhdl._resolverefs import _AttrRefTransformer
 from myhdl._visitors import _SigNameVisitor
@@ -34,7 +34,7 @@ from myhdl._visitors import _SigNameVisitor
 class _error:
     pass
 _error.NrOfArgs = "decorated generator function should not have arguments"
-_error.ArgType = "decorated object should be a generator function"
+_error.ArgType = "decorated object should be a generator or coroutine function"
 
 
 class _CallInfo(object):
@@ -74,7 +74,7 @@ def instance(genfunc):
     callinfo = _getCallInfo()
     if not isinstance(genfunc, FunctionType):
         raise InstanceError(_error.ArgType)
-    if not _isGenFunc(genfunc):
+    if not _isGenFunc(genfunc) and not _isCoroutineFunc(genfunc):
         raise InstanceError(_error.ArgType)
     if genfunc.__code__.co_argcount > 0:
         raise InstanceError(_error.NrOfArgs)
@@ -125,8 +125,21 @@ class _Instantiator(object):
         return self._waiter()(self.gen)
 
     def _waiter(self):
+        if _isCoroutine(self.gen):
+            from myhdl._asyncsim import _CoroutineWaiter
+            return _CoroutineWaiter
         return _inferWaiter
 
+    def _clocked(self):
+        """ Return the edges and the function of a clocked process.
+
+        A clocked process only waits for edges, and runs a function
+        each time. The simulator calls the function directly instead of
+        resuming the generator. Return None for other processes.
+
+        """
+        return None
+
     @property
     def ast(self):
         return _makeAST(self.funcobj)
@@ -22,27 +22,34 @@ from __future__ import absolute_import, division
 
 
 from myhdl._compat import long, integer_types, string_types, builtins
-from myhdl._bin import bin
+
+
+def _bitlen(num):
+    # the length of bin(num), without building the string
+    num = long(num)
+    if num >= 0:
+        return num.bit_length() or 1
+    return (~num).bit_length() + 1
 
 
 class intbv(object):
-    #__slots__ = ('_val', '_min', '_max', '_nrbits', '_handleBounds')
+    __slots__ = ('_val', '_min', '_max', '_nrbits')
 
     def __init__(self, val=0, min=None, max=None, _nrbits=0):
         if _nrbits:
             self._min = 0
-            self._max = 2**_nrbits
+            self._max = 1 << _nrbits
         else:
             self._min = min
             self._max = max
             if max is not None and min is not None:
                 if min >= 0:
-                    _nrbits = len(bin(max - 1))
+                    _nrbits = _bitlen(max - 1)
                 elif max <= 1:
-                    _nrbits = len(bin(min))
+                    _nrbits = _bitlen(min)
                 else:
                     # make sure there is a leading zero bit in positive numbers
-                    _nrbits = builtins.max(len(bin(max - 1)) + 1, len(bin(min)))
+                    _nrbits = builtins.max(_bitlen(max - 1) + 1, _bitlen(min))
         if isinstance(val, integer_types):
             self._val = val
         elif isinstance(val, string_types):
@@ -92,19 +99,33 @@ class intbv(object):
 
     # copy methods
     def __copy__(self):
-        c = type(self)(self._val)
+        cls = type(self)
+        if cls.__init__ is intbv.__init__:
+            return _newbv(cls, self._val, self._min, self._max, self._nrbits)
+        # a subclass may set up more in its constructor
+        c = cls(self._val)
         c._min = self._min
         c._max = self._max
         c._nrbits = self._nrbits
         return c
 
     def __deepcopy__(self, visit):
-        c = type(self)(self._val)
+        cls = type(self)
+        if cls.__init__ is intbv.__init__:
+            return _newbv(cls, self._val, self._min, self._max, self._nrbits)
+        c = cls(self._val)
         c._min = self._min
         c._max = self._max
         c._nrbits = self._nrbits
         return c
 
+    # pickle methods, for all protocols
+    def __getstate__(self):
+        return (self._val, self._min, self._max, self._nrbits)
+
+    def __setstate__(self, state):
+        self._val, self._min, self._max, self._nrbits = state
+
     # iterator method
     def __iter__(self):
         if not self._nrbits:
@@ -133,13 +154,14 @@ class intbv(object):
                 raise ValueError("intbv[i:j] requires j >= 0\n"
                                  "            j == %s" % j)
             if i is None:  # default
-                return intbv(self._val >> j)
+                return _newbv(intbv, self._val >> j, None, None, 0)
             i = int(i)
             if i <= j:
                 raise ValueError("intbv[i:j] requires i > j\n"
                                  "            i, j == %s, %s" % (i, j))
-            res = intbv((self._val & (long(1) << i) - 1) >> j, _nrbits=i - j)
-            return res
+            n = i - j
+            return _newbv(intbv, (self._val >> j) & (1 << n) - 1,
+                          0, 1 << n, n)
         else:
             i = int(key)
             res = bool((self._val >> i) & 0x1)
@@ -407,7 +429,8 @@ class intbv(object):
 
     def __invert__(self):
         if self._nrbits and self._min >= 0:
-            return intbv(~self._val & (long(1) << self._nrbits) - 1)
+            return _newbv(intbv, ~self._val & (long(1) << self._nrbits) - 1,
+                          None, None, 0)
         else:
             return intbv(~self._val)
 
@@ -564,3 +587,21 @@ class intbv(object):
             return intbv(retVal)[self._nrbits:]
         else:
             return intbv(retVal)        
+
+
+_new = object.__new__
+
+
+def _newbv(cls, val, min, max, nrbits):
+    """ Return a new cls instance with precomputed bounds.
+
+    The internal fast path of the constructor: val should be an int
+    within the bounds, and nrbits consistent with them.
+
+    """
+    obj = _new(cls)
+    obj._val = val
+    obj._min = min
+    obj._max = max
+    obj._nrbits = nrbits
+    return obj
@@ -35,3 +35,6 @@ class join(object):
 
     def _generator(self):
         yield join(*self._args)
+
+    def __await__(self):
+        yield self
@@ -0,0 +1,359 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the Memory class.
+
+A memory models an array of intbv words, like a list of signals, but
+keeps the word values in a single compact array. Indexing a memory
+returns a light-weight signal object for the word, that supports the
+usual signal operations, the next attribute, and edges. Waiters are
+only created for the words that are actually waited on.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+from array import array
+
+from myhdl._compat import integer_types
+from myhdl._simulator import _pending, _claim
+from myhdl._intbv import intbv, _newbv
+from myhdl._Signal import (_Signal, _WaiterList, _PosedgeWaiterList,
+                           _NegedgeWaiterList)
+from myhdl._bin import bin
+
+
+class _error:
+    pass
+_error.ValType = "Memory word should be an intbv, got %s"
+_error.Depth = "Memory depth should be a positive integer, got %s"
+_error.InitLength = "Memory init should have %s values, got %s"
+
+
+def _typecode(min, max):
+    """ Return the smallest array typecode for a value range, or None. """
+    if min is None or max is None:
+        return None
+    if min >= 0:
+        codes = 'BHILQ'
+    else:
+        codes = 'bhilq'
+    for code in codes:
+        bits = 8 * array(code).itemsize
+        if min >= 0:
+            if max <= 1 << bits:
+                return code
+        elif -(1 << bits - 1) <= min and max <= 1 << bits - 1:
+            return code
+    return None
+
+
+def _release(wl, waiters):
+    if wl:
+        waiters.extend(wl)
+        del wl[:]
+        wl.fired += 1
+
+
+class _MemoryWaiterList(_WaiterList):
+
+    """ Waiters on any word of a memory. """
+
+    def __init__(self, mem):
+        self.mem = mem
+
+    @property
+    def _name(self):
+        return self.mem._name
+
+    def _toVerilog(self):
+        return ", ".join(w._name for w in self.mem)
+
+    def _toVHDL(self):
+        return self.mem._name
+
+
+class Memory(object):
+
+    """ Memory of intbv words, with compact storage.
+
+    A memory can be used instead of a list of signals to model a RAM.
+    Words are read and written by index, as in mem[addr].next = data.
+    The words of a memory are not reset by always_seq blocks.
+
+    """
+
+    __slots__ = ('_words', '_initial', '_default', '_type', '_min', '_max',
+                 '_nrbits', '_pending', '_watched', '_eventWaiters',
+                 '_codes', '_tracing', '_name', '_wordname', '_queued',
+                 '_sim', '__weakref__')
+
+    def __init__(self, val, depth, init=None):
+        """ Construct a memory.
+
+        val -- intbv with the type and the default value of the words
+        depth -- number of words
+        init -- optional sequence with the initial value of each word
+
+        """
+        if not isinstance(val, intbv):
+            raise TypeError(_error.ValType % type(val))
+        if not isinstance(depth, integer_types) or depth <= 0:
+            raise ValueError(_error.Depth % repr(depth))
+        self._type = type(val)
+        self._min = val._min
+        self._max = val._max
+        self._nrbits = val._nrbits
+        self._default = val._val
+        code = _typecode(self._min, self._max)
+        if init is None:
+            self._initial = None
+        else:
+            init = list(init)
+            if len(init) != depth:
+                raise ValueError(_error.InitLength % (depth, len(init)))
+            # check or wrap the values, as intbv assignment does
+            w = self._word(0)
+            values = []
+            for v in init:
+                w._val = int(v)
+                w._handleBounds()
+                values.append(w._val)
+            if code is None:
+                self._initial = values
+            else:
+                self._initial = array(code, values)
+        self._words = self._reset(code, depth)
+        self._pending = {}
+        self._watched = {}
+        self._eventWaiters = _MemoryWaiterList(self)
+        self._codes = []
+        self._tracing = 0
+        self._name = self._wordname = None
+        self._queued = False
+        _pending().bind(self)
+
+    def _reset(self, code, depth):
+        if self._initial is not None:
+            return self._initial[:]
+        if code is None:
+            return [self._default] * depth
+        return array(code, [self._default]) * depth
+
+    def _word(self, val):
+        return _newbv(self._type, val, self._min, self._max, self._nrbits)
+
+    def _clear(self):
+        for wls in self._watched.values():
+            for wl in wls:
+                if wl is not None:
+                    del wl[:]
+                    wl.fired += 1
+        wl = self._eventWaiters
+        del wl[:]
+        wl.fired += 1
+        words = self._words
+        code = getattr(words, 'typecode', None)
+        self._words = self._reset(code, len(words))
+        self._pending = {}
+        self._name = self._wordname = None
+        self._queued = False
+
+    def _next(self, i):
+        """ Return the next value of word i, and queue the memory. """
+        nxt = self._pending.get(i)
+        if nxt is None:
+            nxt = self._pending[i] = self._word(self._words[i])
+            if not self._queued:
+                self._queued = True
+                sim = self._sim
+                if not sim.running:
+                    sim = _claim(self)
+                sim.siglist.append(self)
+        return nxt
+
+    def _waiters(self, i):
+        """ Return the [event, posedge, negedge] waiter lists of word i. """
+        wls = self._watched.get(i)
+        if wls is None:
+            wls = self._watched[i] = [_WaiterList(), None, None]
+        return wls
+
+    def _update(self):
+        words = self._words
+        watched = self._watched
+        waiters = []
+        changed = False
+        for i, nxt in self._pending.items():
+            val, next = words[i], nxt._val
+            if val == next:
+                continue
+            words[i] = next
+            changed = True
+            wls = watched.get(i)
+            if wls is not None:
+                event, pos, neg = wls
+                _release(event, waiters)
+                if not val and next:
+                    _release(pos, waiters)
+                elif not next and val:
+                    _release(neg, waiters)
+            if self._tracing:
+                self._printVcdWord(i)
+        self._pending = {}
+        if changed:
+            _release(self._eventWaiters, waiters)
+        return waiters
+
+    # vcd print methods
+    def _printVcdWord(self, i):
+        if self._nrbits:
+            print("b%s %s" % (bin(self._words[i], self._nrbits),
+                              self._codes[i]), file=self._sim.tf)
+        else:
+            print("s%s %s" % (hex(self._words[i]), self._codes[i]),
+                  file=self._sim.tf)
+
+    def _printVcd(self):
+        for i in range(len(self._words)):
+            self._printVcdWord(i)
+
+    def __len__(self):
+        return len(self._words)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [_MemoryWord(self, i)
+                    for i in range(*key.indices(len(self._words)))]
+        i = int(key)
+        n = len(self._words)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("Memory index out of range")
+        return _MemoryWord(self, i)
+
+    def __iter__(self):
+        for i in range(len(self._words)):
+            yield _MemoryWord(self, i)
+
+    def __repr__(self):
+        return "Memory(%s, %s)" % (repr(self._word(self._default)),
+                                   len(self._words))
+
+
+class _MemoryWord(_Signal):
+
+    """ Signal view on a word of a memory.
+
+    The value, the next value and the waiters are kept in the memory;
+    the view itself is created on demand when the memory is indexed.
+
+    """
+
+    __slots__ = ('_mem', '_index')
+
+    def __init__(self, mem, index):
+        self._mem = mem
+        self._index = index
+        self._driven = None
+        self._read = self._used = self._inList = False
+        self._numeric = True
+        self._slicesigs = ()
+
+    def _clear(self):
+        # the state is in the memory: only reset its conversion names
+        self._mem._name = self._mem._wordname = None
+
+    @property
+    def _val(self):
+        mem = self._mem
+        return mem._word(mem._words[self._index])
+
+    @property
+    def _next(self):
+        return self._mem._next(self._index)
+
+    @property
+    def _init(self):
+        mem = self._mem
+        if mem._initial is None:
+            return mem._word(mem._default)
+        return mem._word(mem._initial[self._index])
+
+    @property
+    def _type(self):
+        return intbv
+
+    @property
+    def _min(self):
+        return self._mem._min
+
+    @property
+    def _max(self):
+        return self._mem._max
+
+    @property
+    def _nrbits(self):
+        return self._mem._nrbits
+
+    @property
+    def _sim(self):
+        return self._mem._sim
+
+    @property
+    def _name(self):
+        wordname = self._mem._wordname
+        if wordname is None:
+            return None
+        return wordname % self._index
+
+    @property
+    def _eventWaiters(self):
+        return self._mem._waiters(self._index)[0]
+
+    @property
+    def _posedgeWaiters(self):
+        wls = self._mem._waiters(self._index)
+        if wls[1] is None:
+            wls[1] = _PosedgeWaiterList(self)
+        return wls[1]
+
+    @property
+    def _negedgeWaiters(self):
+        wls = self._mem._waiters(self._index)
+        if wls[2] is None:
+            wls[2] = _NegedgeWaiterList(self)
+        return wls[2]
+
+    @property
+    def next(self):
+        return self._mem._next(self._index)
+
+    @next.setter
+    def next(self, val):
+        if isinstance(val, _Signal):
+            val = val._val
+        if isinstance(val, intbv):
+            val = val._val
+        elif not isinstance(val, integer_types):
+            raise TypeError("Expected int or intbv, got %s" % type(val))
+        nxt = self._mem._next(self._index)
+        nxt._val = val
+        nxt._handleBounds()
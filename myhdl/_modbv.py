@@ -20,8 +20,7 @@
 """ Module with the modbv class """
 from __future__ import absolute_import
 
-from ._intbv import intbv
-from ._compat import long
+from ._intbv import intbv, _newbv
 
 
 class modbv(intbv):
@@ -49,13 +48,14 @@ class modbv(intbv):
                 raise ValueError("modbv[i:j] requires j >= 0\n"
                                  "            j == %s" % j)
             if i is None:  # default
-                return modbv(self._val >> j)
+                return _newbv(modbv, self._val >> j, None, None, 0)
             i = int(i)
             if i <= j:
                 raise ValueError("modbv[i:j] requires i > j\n"
                                  "            i, j == %s, %s" % (i, j))
-            res = modbv((self._val & (long(1) << i) - 1) >> j, _nrbits=i - j)
-            return res
+            n = i - j
+            return _newbv(modbv, (self._val >> j) & (1 << n) - 1,
+                          0, 1 << n, n)
         else:
             i = int(key)
             res = bool((self._val >> i) & 0x1)
@@ -0,0 +1,390 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the PartitionedSimulation class
+
+A partitioned simulation runs each partition of a design in a forked
+process. Partitions only share boundary signals, and a boundary signal
+change reaches the other partitions a fixed lookahead later. The
+partitions can therefore simulate a window of lookahead timesteps in
+parallel, and exchange the boundary signal changes in between. This is
+conservative synchronization: no partition ever needs to roll back.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import os
+import pickle
+import socket
+import struct
+import sys
+import traceback
+
+from myhdl import SimulationError, StopSimulation
+from myhdl._compat import integer_types
+from myhdl._intbv import intbv
+from myhdl._Signal import _Signal
+from myhdl._ShadowSignal import (_SliceSignal, ConcatSignal, _TristateSignal,
+                                 _TristateDriver)
+from myhdl._Waiter import _Waiter, _PostponedWaiter
+from myhdl._block import _Block
+from myhdl._instance import _Instantiator
+from myhdl._simulator import _SimState, _local
+from myhdl._checkpoint import _recvall
+from myhdl import _simulator
+
+
+class _error:
+    pass
+_error.NoFork = "Partitioned simulation requires os.fork"
+_error.ArgType = "Partition should be a block instance, an instance, or a list of those"
+_error.NrOfArgs = "Partitioned simulation needs at least two partitions"
+_error.Lookahead = "Lookahead should be a positive integer"
+_error.MultipleDrivers = "Boundary signal driven in several partitions"
+_error.SigType = "Tristate signals are not supported on a partition boundary"
+_error.Tracing = "Signal tracing is not supported in a partitioned simulation"
+_error.Exit = "Partition process exited unexpectedly"
+_error.Result = "Partition exception cannot be pickled"
+
+# future event time of a partition without events
+_IDLE = sys.maxsize
+
+
+def _collect(arg, sigs, driven):
+    """ Collect the signals of a partition, and the ones it drives. """
+    if isinstance(arg, (list, tuple, set)):
+        for item in arg:
+            _collect(item, sigs, driven)
+    elif isinstance(arg, _Block):
+        _collect(arg.subs, sigs, driven)
+        _addSigs(arg.sigdict.values(), sigs)
+        _addSigs(arg.memdict.values(), sigs)
+    elif isinstance(arg, _Instantiator):
+        _addSigs(arg.sigdict.values(), sigs)
+        _addSigs(arg.losdict.values(), sigs)
+        for n in arg.outputs | arg.inouts:
+            obj = arg.sigdict.get(n, arg.losdict.get(n))
+            if obj is not None:
+                _addSigs([obj], driven)
+    else:
+        raise SimulationError(_error.ArgType, repr(arg))
+
+
+def _addSigs(objs, sigs):
+    for obj in objs:
+        if isinstance(obj, _Signal):
+            sigs[id(obj)] = obj
+            # a shadow signal reads its source signals
+            if isinstance(obj, _SliceSignal):
+                _addSigs([obj._sig], sigs)
+            elif isinstance(obj, ConcatSignal):
+                _addSigs(obj._sigargs, sigs)
+        elif isinstance(obj, (list, tuple)):
+            _addSigs(getattr(obj, 'mem', obj), sigs)
+
+
+def _raw(val):
+    # intbv values are mutated in place: send the integer
+    if isinstance(val, intbv):
+        return val._val
+    return val
+
+
+class _ImportWaiter(_Waiter):
+
+    """ Waiter that drives a boundary signal change from another partition """
+
+    __slots__ = ('sig', 'val', 'hasRun')
+
+    def __init__(self, sig, val):
+        self.sig = sig
+        self.val = val
+        self.hasRun = 0
+
+    def next(self, waiters, actives, exc):
+        self.sig.next = self.val
+
+
+class PartitionedSimulation(object):
+
+    """ Simulation of a design in partitions that run in parallel.
+
+    Each partition runs in a process of its own. A boundary signal is a
+    signal that is used in several partitions, and it should be driven
+    in a single one. A change of a boundary signal reaches the other
+    partitions lookahead timesteps later, as through a transport delay.
+    This models the minimum delay across the boundary, such as the
+    synchronizers between clock domains.
+
+    Methods:
+    run -- run the simulation for some duration
+    quit -- end the partition processes
+
+    """
+
+    def __init__(self, partitions, lookahead):
+        """ Construct a partitioned simulation.
+
+        partitions -- sequence of partitions, each a block instance, an
+                      instance, or a list of those
+        lookahead -- minimum delay of a boundary signal change, a positive
+                     integer
+
+        """
+        if not hasattr(os, 'fork'):
+            raise SimulationError(_error.NoFork)
+        if len(partitions) < 2:
+            raise SimulationError(_error.NrOfArgs)
+        if not isinstance(lookahead, integer_types) or lookahead <= 0:
+            raise ValueError(_error.Lookahead)
+        sigsets, drivensets = [], []
+        allsigs = {}
+        for part in partitions:
+            sigs, driven = {}, {}
+            _collect(part, sigs, driven)
+            sigsets.append(sigs)
+            drivensets.append(driven)
+            allsigs.update(sigs)
+        # boundary signals, with their driving partition and readers
+        boundary = []
+        for i, s in allsigs.items():
+            if sum(1 for sigs in sigsets if i in sigs) < 2:
+                continue
+            if isinstance(s, (_TristateSignal, _TristateDriver)):
+                raise SimulationError(_error.SigType, s._name or repr(s))
+            drivers = [k for k, driven in enumerate(drivensets) if i in driven]
+            if len(drivers) > 1:
+                raise SimulationError(_error.MultipleDrivers,
+                                      s._name or repr(s))
+            if drivers:
+                readers = [k for k, sigs in enumerate(sigsets)
+                           if i in sigs and k != drivers[0]]
+                boundary.append((s, drivers[0], readers))
+        state = _simulator._pending()
+        if state.tracing:
+            raise SimulationError(_error.Tracing)
+        for s in allsigs.values():
+            state.bind(s)
+        self._partitions = partitions
+        self._lookahead = lookahead
+        self._boundary = boundary
+        self._driven = [list(driven.values()) for driven in drivensets]
+        self._state = state
+        self._children = None
+        self._finished = False
+        state.owned = True
+        # signals created from now on belong to a next simulation
+        _local.pending = _SimState()
+        _local.current = state
+        state.time = 0
+
+    def run(self, duration=None, quiet=0):
+        """ Run the simulation for some duration.
+
+        duration -- specified simulation duration (default: forever)
+        quiet -- don't print StopSimulation messages (default: off)
+
+        Returns 1 when the simulation is suspended, and 0 when it has
+        finished. The signal values are those at the end of the run.
+
+        """
+        if self._finished:
+            raise StopSimulation("Simulation has already finished")
+        if self._children is None:
+            self._children = [self._fork(k)
+                              for k in range(len(self._partitions))]
+            # initial events of each partition at time 0
+            self._next = [0] * len(self._children)
+            self._imports = [[] for c in self._children]
+        state = self._state
+        end = None
+        if duration:
+            end = state.time + duration
+        lookahead = self._lookahead
+        children = self._children
+        nexts = self._next
+        imports = self._imports
+        finished = None
+        while 1:
+            start = min(nexts)
+            for pending in imports:
+                for t, i, val in pending:
+                    start = min(start, t)
+            if start == _IDLE:
+                finished = "No more events"
+                break
+            if end is not None and start > end:
+                break
+            stop = start + lookahead - 1
+            if end is not None:
+                stop = min(stop, end)
+            # conservative window: changes in it reach the others later
+            active = []
+            for k, sock in enumerate(children):
+                if nexts[k] <= stop or \
+                        any(t <= stop for t, b, val in imports[k]):
+                    _sendobj(sock[0], ('run', stop, imports[k]))
+                    imports[k] = []
+                    active.append(k)
+            for k in active:
+                reply = self._recv(k)
+                kind, exports, nexts[k] = reply
+                if kind == 'stop':
+                    finished = "Partition %d finished" % k
+                for t, b, val in exports:
+                    for r in self._boundary[b][2]:
+                        imports[r].append((t + lookahead, b, val))
+            state.time = stop
+            if finished:
+                break
+        if finished:
+            if not quiet:
+                print("StopSimulation: %s" % finished, file=sys.stderr)
+            self.quit()
+            return 0
+        if end is not None:
+            state.time = end
+        self._values()
+        return 1
+
+    def quit(self):
+        """ End the partition processes. """
+        if self._children is not None:
+            for sock, pid in self._children:
+                try:
+                    _sendobj(sock, ('quit',))
+                except socket.error:
+                    pass
+                sock.close()
+                os.waitpid(pid, 0)
+            self._children = None
+        # clean up for potential new run with same signals
+        for s in self._state.signals.values():
+            s._clear()
+        self._finished = True
+
+    def _fork(self, k):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        parent, child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        pid = os.fork()
+        if pid == 0:
+            parent.close()
+            self._serve(k, child)
+        child.close()
+        return parent, pid
+
+    def _recv(self, k):
+        reply = _recvobj(self._children[k][0])
+        if reply is None:
+            self.quit()
+            raise SimulationError(_error.Exit, "partition %d" % k)
+        if reply[0] == 'error':
+            self.quit()
+            raise reply[1]
+        return reply
+
+    def _values(self):
+        """ Copy the signal values of the partitions. """
+        for k, (sock, pid) in enumerate(self._children):
+            _sendobj(sock, ('values',))
+        for k in range(len(self._children)):
+            values = self._recv(k)[1]
+            for s, val in zip(self._driven[k], values):
+                if isinstance(s._val, intbv):
+                    s._val._val = s._next._val = val
+                else:
+                    s._val = s._next = val
+
+    def _serve(self, k, sock):
+        """ Run partition k in a forked process. """
+        from myhdl._Simulation import Simulation
+        status = 1
+        try:
+            sigs = [b[0] for b in self._boundary]
+            exports = []
+            exported = [(b, s) for b, (s, driver, readers)
+                        in enumerate(self._boundary) if driver == k]
+            last = [_raw(s._val) for b, s in exported]
+            state = self._state
+
+            def export():
+                for j, (b, s) in enumerate(exported):
+                    val = _raw(s._val)
+                    if val != last[j]:
+                        last[j] = val
+                        exports.append((state.time, b, val))
+
+            procs = [self._partitions[k]]
+            if exported:
+                procs.append(_PostponedWaiter(
+                    export, [s._eventWaiters for b, s in exported]))
+            # the partition takes over all signals, with their bindings
+            _local.pending = state
+            sim = Simulation(*procs)
+            # a partition waits for imports when it has no events
+            state.schedule(_IDLE, _Waiter(None))
+            while 1:
+                cmd = _recvobj(sock)
+                if cmd is None or cmd[0] == 'quit':
+                    break
+                if cmd[0] == 'values':
+                    _sendobj(sock, ('values',
+                                    [_raw(s._val) for s in self._driven[k]]))
+                    continue
+                stop, pending = cmd[1], cmd[2]
+                for t, b, val in pending:
+                    state.schedule(t, _ImportWaiter(sigs[b], val))
+                try:
+                    r = sim.run(until=stop, quiet=1)
+                except Exception as e:
+                    reply = ('error', e, traceback.format_exc())
+                    try:
+                        pickle.loads(pickle.dumps(reply, 2))
+                    except Exception:
+                        reply = ('error', SimulationError(_error.Result,
+                                                          reply[2]), None)
+                    _sendobj(sock, reply)
+                    break
+                kind = 'ok' if r else 'stop'
+                nxt = state.futureEvents[0][0] if state.futureEvents else _IDLE
+                _sendobj(sock, (kind, exports[:], nxt))
+                del exports[:]
+                if not r:
+                    break
+            status = 0
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+
+def _sendobj(sock, obj):
+    data = pickle.dumps(obj, 2)
+    sock.sendall(struct.pack('!I', len(data)) + data)
+
+
+def _recvobj(sock):
+    try:
+        header = _recvall(sock, 4)
+    except EOFError:
+        return None
+    n = struct.unpack('!I', header)[0]
+    return pickle.loads(_recvall(sock, n))
@@ -0,0 +1,202 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Module that provides the regress function
+
+regress -- run testbenches in parallel worker processes
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import multiprocessing
+import pickle
+import sys
+import time
+import traceback
+
+from myhdl._compat import StringIO
+
+
+class _error:
+    pass
+_error.JobType = "regress job should be a callable or a (callable, params) pair"
+_error.Pickle = "regress jobs should be picklable when workers can't fork: %s"
+
+
+class RegressionResult(object):
+
+    """ Outcome of a single testbench run.
+
+    Attributes:
+    name -- name of the testbench factory
+    params -- dict of parameters passed to the factory
+    passed -- True if the simulation did not raise an exception
+    output -- captured standard output and error
+    error -- formatted traceback if the run failed, else None
+    time -- wall clock time of the run in seconds
+
+    """
+
+    def __init__(self, name, params, passed, output, error, time):
+        self.name = name
+        self.params = params
+        self.passed = passed
+        self.output = output
+        self.error = error
+        self.time = time
+
+    def __repr__(self):
+        return "<RegressionResult %s %s>" % (
+            _label(self.name, self.params), "passed" if self.passed else "failed")
+
+
+def _label(name, params):
+    args = ", ".join("%s=%r" % (k, params[k]) for k in sorted(params))
+    return "%s(%s)" % (name, args)
+
+
+def _jobs(tests):
+    jobs = []
+    for test in tests:
+        if callable(test):
+            factory, params = test, {}
+        elif isinstance(test, (list, tuple)) and len(test) == 2 and \
+                callable(test[0]):
+            factory, params = test[0], dict(test[1])
+        else:
+            raise TypeError(_error.JobType)
+        jobs.append((factory, params))
+    return jobs
+
+
+def _simulate(factory, params, duration):
+    from myhdl._block import _Block
+    from myhdl._Simulation import Simulation
+    top = factory(**params)
+    if isinstance(top, _Block):
+        try:
+            top.run_sim(duration)
+        finally:
+            top.quit_sim()
+    else:
+        sim = Simulation(top)
+        try:
+            sim.run(duration)
+        finally:
+            sim.quit()
+
+
+def _run(factory, params, duration, errors=Exception):
+    name = getattr(factory, '__name__', repr(factory))
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = sys.stderr = output = StringIO()
+    error = None
+    t0 = time.time()
+    try:
+        _simulate(factory, params, duration)
+    except errors:
+        error = traceback.format_exc()
+    finally:
+        t = time.time() - t0
+        sys.stdout, sys.stderr = stdout, stderr
+    return RegressionResult(name, params, error is None, output.getvalue(),
+                            error, t)
+
+
+# jobs of the current regress call: forked workers inherit them, so
+# factories need not be picklable
+_pending = []
+
+
+def _work(args):
+    i, job, duration = args
+    if job is None:
+        job = _pending[i]
+    factory, params = job
+    # a worker always reports back, even when the testbench exits
+    return i, _run(factory, params, duration, BaseException)
+
+
+def _canFork():
+    return hasattr(multiprocessing, 'get_context') and \
+        'fork' in multiprocessing.get_all_start_methods()
+
+
+def _pool(processes, fork):
+    if fork:
+        return multiprocessing.get_context('fork').Pool(processes,
+                                                        maxtasksperchild=1)
+    return multiprocessing.Pool(processes, maxtasksperchild=1)
+
+
+def regress(tests, processes=None, duration=None, callback=None):
+    """ Run testbenches in parallel worker processes.
+
+    Each testbench runs its own simulation in a fresh worker process.
+    The results are returned in the order of the tests.
+
+    tests -- sequence of testbench factories, or (factory, params) pairs.
+             A factory is called with the params as keyword arguments and
+             should return a block instance, or anything else Simulation
+             accepts.
+    processes -- number of worker processes (default: number of cores).
+                 With processes=1, the testbenches run in this process.
+    duration -- simulation duration of each run (default: until the
+                simulation stops)
+    callback -- function called with each RegressionResult as soon as
+                it is available
+
+    """
+    global _pending
+    jobs = _jobs(tests)
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = min(processes, len(jobs))
+    results = [None] * len(jobs)
+    if processes <= 1:
+        for i, (factory, params) in enumerate(jobs):
+            results[i] = _run(factory, params, duration)
+            if callback is not None:
+                callback(results[i])
+        return results
+    fork = _canFork()
+    if fork:
+        _pending = jobs
+        args = [(i, None, duration) for i in range(len(jobs))]
+    else:
+        # the workers only get what is passed to them
+        for factory, params in jobs:
+            try:
+                pickle.dumps((factory, params))
+            except Exception:
+                raise TypeError(_error.Pickle % _label(
+                    getattr(factory, '__name__', repr(factory)), params))
+        args = [(i, job, duration) for i, job in enumerate(jobs)]
+    pool = _pool(processes, fork)
+    try:
+        for i, result in pool.imap_unordered(_work, args):
+            results[i] = result
+            if callback is not None:
+                callback(result)
+    finally:
+        pool.terminate()
+        pool.join()
+        _pending = []
+    return results
@@ -0,0 +1,218 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Warm start of a simulation from a VCD file
+
+The signal values at some time are read from a VCD file written by
+traceSignals, and loaded into the signals of a new simulation with the
+same hierarchical names. Only signal values are restored: the state of
+the processes themselves, such as pending delays, is not in the file.
+This is therefore meant for designs in which all state is held in
+signals, such as register transfer level designs.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+from myhdl import SimulationError
+from myhdl._enum import EnumItemType
+from myhdl._compat import integer_types
+from myhdl._intbv import intbv
+from myhdl._Signal import _DelayedSignal
+from myhdl._memory import Memory, _MemoryWord
+from myhdl._ShadowSignal import _TristateSignal, _TristateDriver
+from myhdl._getHierarchy import _getHierarchy
+
+
+class _error:
+    pass
+_error.Started = "Simulation can only be restored before it runs"
+_error.NoBlock = "Restore requires a block instance argument"
+_error.Time = "Restore time is not in the VCD file"
+_error.NoMatch = "No signal names match the VCD file"
+_error.ValueType = "Cannot restore the value of a signal of this type"
+_error.ValueRange = "Restored value is out of the range of the signal"
+
+
+def _readVcd(path, time):
+    """ Return a dict of hierarchical names to value strings at time.
+
+    The values are those at the end of the timestep, or None for a
+    high impedance or unknown value.
+
+    """
+    codes = {}
+    scope = []
+    values = {}
+    if time < 0:
+        raise SimulationError(_error.Time, "%s at %s" % (path, time))
+    # the dump starts with the values at time 0
+    reached = time == 0
+    with open(path) as f:
+        # header: map the identifier codes to hierarchical names
+        for line in f:
+            tokens = line.split()
+            if not tokens:
+                continue
+            if tokens[0] == '$scope':
+                scope.append(tokens[2])
+            elif tokens[0] == '$upscope':
+                scope.pop()
+            elif tokens[0] == '$var':
+                name = ".".join(scope + [tokens[4]])
+                codes.setdefault(tokens[3], []).append(name)
+            elif tokens[0] == '$enddefinitions':
+                break
+        # value changes up to and including time
+        for line in f:
+            c = line[:1]
+            if c == '#':
+                t = int(line[1:])
+                if t >= time:
+                    reached = True
+                if t > time:
+                    break
+            elif c in '01xzXZ':
+                values[line[1:].strip()] = c if c in '01' else None
+            elif c in 'bBsS':
+                val, code = line[1:].rstrip('\n').rsplit(' ', 1)
+                if c in 'bB' and val.strip('01'):
+                    val = None
+                elif c in 'sS' and val == 'z':
+                    val = None
+                values[code] = (c.lower(), val)
+    if not reached:
+        raise SimulationError(_error.Time, "%s at %s" % (path, time))
+    names = {}
+    for code, val in values.items():
+        for name in codes.get(code, ()):
+            names[name] = val
+    return names
+
+
+def _value(s, text, name):
+    """ Return the signal value for a VCD value string. """
+    if text is None:
+        return None
+    if isinstance(text, tuple):
+        kind, text = text
+    else:
+        kind = 'b'
+    init = s._init
+    if isinstance(init, EnumItemType):
+        return getattr(init._type, text)
+    if kind == 'b':
+        val = int(text, 2)
+        # signed values are traced in two's complement
+        if isinstance(init, intbv) and init._min is not None and \
+                init._min < 0 and val >> (init._nrbits - 1):
+            val -= 1 << init._nrbits
+    elif isinstance(init, (bool, integer_types, intbv)):
+        val = int(text, 0)
+    else:
+        raise SimulationError(_error.ValueType, name)
+    if s._type is bool:
+        return bool(val)
+    if isinstance(init, intbv):
+        if init._min is not None and val < init._min or \
+                init._max is not None and val >= init._max:
+            raise SimulationError(_error.ValueRange, "%s: %s" % (name, val))
+    return val
+
+
+def _load(s, val):
+    if val is None:
+        s._val = s._next = None
+    elif isinstance(s._init, intbv):
+        if s._val is None:
+            s._val, s._next = intbv(s._init), intbv(s._init)
+        s._val._val = s._next._val = val
+    else:
+        s._val = s._next = val
+    if isinstance(s, _DelayedSignal):
+        s._nextZ = s._next
+
+
+def _loadMemory(mem, name, values):
+    """ Load the words of a memory, and return the number of matches. """
+    matched = 0
+    w = mem[0]
+    for i in range(len(mem)):
+        n = "%s(%i)" % (name, i)
+        if n in values:
+            val = _value(w, values[n], n)
+            if val is not None:
+                mem._words[i] = val
+            matched += 1
+    return matched
+
+
+def _restore(sim, tops, path, time, name, started):
+    """ Load the signal values at time from a VCD file into sim. """
+    if started:
+        raise SimulationError(_error.Started)
+    if not tops:
+        raise SimulationError(_error.NoBlock)
+    values = _readVcd(path, time)
+    matched = 0
+    seen = {}
+    for top in tops:
+        h = _getHierarchy(name or top.func.__name__, top)
+        scope = []
+        for inst in h.hierarchy:
+            del scope[inst.level - 1:]
+            scope.append(inst.name)
+            prefix = ".".join(scope)
+            sigs = [("%s.%s" % (prefix, n), s)
+                    for n, s in inst.sigdict.items()]
+            for n, m in inst.memdict.items():
+                if isinstance(m.mem, Memory):
+                    matched += _loadMemory(m.mem, "%s.%s.%s" % (prefix, n, n),
+                                           values)
+                    seen[id(m.mem)] = m.mem
+                    continue
+                sigs.extend(("%s.%s.%s(%i)" % (prefix, n, n, i), s)
+                            for i, s in enumerate(m.mem))
+            for n, s in sigs:
+                if isinstance(s, _MemoryWord):
+                    # a word passed as a port is restored in its memory
+                    seen[id(s._mem)] = s._mem
+                    if n in values:
+                        val = _value(s, values[n], n)
+                        if val is not None:
+                            s._mem._words[s._index] = val
+                        matched += 1
+                    continue
+                seen[id(s)] = s
+                # a tristate value follows from its drivers
+                if n not in values or \
+                        isinstance(s, (_TristateSignal, _TristateDriver)):
+                    continue
+                _load(s, _value(s, values[n], n))
+                matched += 1
+    if not matched:
+        raise SimulationError(_error.NoMatch, path)
+    state = sim._state
+    state.time = time
+    if state.tracing:
+        # continue the trace with the restored values
+        print("#%s" % time, file=state.tf)
+        for s in seen.values():
+            if s._tracing:
+                s._printVcd()
@@ -0,0 +1,341 @@
+/*
+ *  This file is part of the myhdl library, a Python package for using
+ *  Python as a Hardware Description Language.
+ *
+ *  Copyright (C) 2003-2016 Jan Decaluwe
+ *
+ *  The myhdl library is free software; you can redistribute it and/or
+ *  modify it under the terms of the GNU Lesser General Public License as
+ *  published by the Free Software Foundation; either version 2.1 of the
+ *  License, or (at your option) any later version.
+ *
+ *  This library is distributed in the hope that it will be useful, but
+ *  WITHOUT ANY WARRANTY; without even the implied warranty of
+ *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+ *  Lesser General Public License for more details.
+ *
+ *  You should have received a copy of the GNU Lesser General Public
+ *  License along with this library; if not, write to the Free Software
+ *  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+ */
+
+/*
+ * C version of the event loop in Simulation.run.
+ *
+ * The loop has the same semantics as the pure Python version. It only
+ * returns by raising an exception: StopSimulation, _SuspendSimulation,
+ * or an exception raised by a process. Simulation.run handles these.
+ * Cosimulations are not supported; Simulation.run uses the Python loop
+ * for them.
+ */
+
+#include "Python.h"
+
+#if PY_MAJOR_VERSION < 3
+#define PyUnicode_InternFromString PyString_InternFromString
+#endif
+
+static PyObject *Waiter;
+static PyObject *StopSimulation;
+static PyObject *SuspendSimulation;
+static PyObject *heappop;
+
+static PyObject *str_queued;
+static PyObject *str_update;
+static PyObject *str_next;
+static PyObject *str_purge;
+static PyObject *str_postponed;
+static PyObject *str_runPostponed;
+static PyObject *str_awaiting;
+static PyObject *str_apply;
+static PyObject *str_time;
+static PyObject *str_siglist;
+static PyObject *str_futureEvents;
+static PyObject *str_write;
+
+
+/* Append the items of seq to list. Steals the reference to seq. */
+static int
+extend(PyObject *list, PyObject *seq)
+{
+    int r;
+
+    if (seq == NULL)
+        return -1;
+    r = PyList_SetSlice(list, PY_SSIZE_T_MAX, PY_SSIZE_T_MAX, seq);
+    Py_DECREF(seq);
+    return r;
+}
+
+
+static PyObject *
+run(PyObject *self, PyObject *args)
+{
+    PyObject *state, *waiters, *actives, *exc, *maxTime, *duration, *tracefile;
+    PyObject *siglist, *futureEvents, *postponed, *t;
+    PyObject *s, *waiter, *r, *item, *event, *values;
+    Py_ssize_t i, n;
+    int cmp;
+
+    if (!PyArg_ParseTuple(args, "OO!O!O!OOO:run", &state,
+                          &PyList_Type, &waiters, &PyDict_Type, &actives,
+                          &PyList_Type, &exc, &maxTime, &duration,
+                          &tracefile)) {
+        return NULL;
+    }
+    siglist = PyObject_GetAttr(state, str_siglist);
+    futureEvents = PyObject_GetAttr(state, str_futureEvents);
+    postponed = PyObject_GetAttr(state, str_postponed);
+    t = PyObject_GetAttr(state, str_time);
+    if (siglist == NULL || futureEvents == NULL || postponed == NULL ||
+        t == NULL)
+        goto error;
+    if (!PyList_Check(siglist) || !PyList_Check(futureEvents) ||
+        !PyList_Check(postponed)) {
+        PyErr_SetString(PyExc_TypeError, "unexpected simulation state");
+        goto error;
+    }
+
+    for (;;) {
+
+        /* update the signals */
+        for (i = 0; i < PyList_GET_SIZE(siglist); i++) {
+            s = PyList_GET_ITEM(siglist, i);
+            Py_INCREF(s);
+            if (PyObject_SetAttr(s, str_queued, Py_False) < 0 ||
+                extend(waiters,
+                       PyObject_CallMethodObjArgs(s, str_update, NULL)) < 0) {
+                Py_DECREF(s);
+                goto error;
+            }
+            Py_DECREF(s);
+        }
+        if (PyList_SetSlice(siglist, 0, PyList_GET_SIZE(siglist), NULL) < 0)
+            goto error;
+
+        /* run the waiters */
+        while ((n = PyList_GET_SIZE(waiters)) > 0) {
+            waiter = PyList_GET_ITEM(waiters, n - 1);
+            Py_INCREF(waiter);
+            if (PyList_SetSlice(waiters, n - 1, n, NULL) < 0) {
+                Py_DECREF(waiter);
+                goto error;
+            }
+            r = PyObject_CallMethodObjArgs(waiter, str_next,
+                                           waiters, actives, exc, NULL);
+            Py_DECREF(waiter);
+            if (r == NULL) {
+                if (PyErr_ExceptionMatches(PyExc_StopIteration)) {
+                    PyErr_Clear();
+                    continue;
+                }
+                goto error;
+            }
+            Py_DECREF(r);
+        }
+
+        if (PyList_GET_SIZE(siglist) > 0)
+            continue;
+
+        /* purge the waiter lists of multiple clause waiters */
+        if (PyDict_Size(actives) > 0) {
+            values = PyDict_Values(actives);
+            if (values == NULL)
+                goto error;
+            for (i = 0; i < PyList_GET_SIZE(values); i++) {
+                r = PyObject_CallMethodObjArgs(PyList_GET_ITEM(values, i),
+                                               str_purge, NULL);
+                if (r == NULL) {
+                    Py_DECREF(values);
+                    goto error;
+                }
+                Py_DECREF(r);
+            }
+            Py_DECREF(values);
+            PyDict_Clear(actives);
+        }
+
+        /* postponed region: the last delta cycle of the timestep is done */
+        if (PyList_GET_SIZE(postponed) > 0) {
+            r = PyObject_CallMethodObjArgs(state, str_runPostponed, NULL);
+            if (r == NULL)
+                goto error;
+            Py_DECREF(r);
+        }
+
+        /* at this point it is safe to raise an exception from a yield */
+        if (PyList_GET_SIZE(exc) > 0) {
+            item = PyList_GET_ITEM(exc, 0);
+            PyErr_SetObject((PyObject *) Py_TYPE(item), item);
+            goto error;
+        }
+
+        /* future events */
+        if (PyList_GET_SIZE(futureEvents) == 0) {
+            /* coroutine processes that wait for asyncio objects */
+            r = PyObject_GetAttr(state, str_awaiting);
+            if (r == NULL)
+                goto error;
+            cmp = PyObject_IsTrue(r);
+            Py_DECREF(r);
+            if (cmp < 0)
+                goto error;
+            if (cmp)
+                PyErr_SetString(SuspendSimulation,
+                                "Waiting for asyncio objects");
+            else
+                PyErr_SetString(StopSimulation, "No more events");
+            goto error;
+        }
+        if (maxTime != Py_None) {
+            cmp = PyObject_RichCompareBool(t, maxTime, Py_EQ);
+            if (cmp < 0)
+                goto error;
+            if (cmp) {
+                r = PyUnicode_FromFormat("Simulated %S timesteps", duration);
+                if (r != NULL) {
+                    PyErr_SetObject(SuspendSimulation, r);
+                    Py_DECREF(r);
+                }
+                goto error;
+            }
+        }
+        Py_DECREF(t);
+        t = PySequence_GetItem(PyList_GET_ITEM(futureEvents, 0), 0);
+        if (t == NULL)
+            goto error;
+        if (PyObject_SetAttr(state, str_time, t) < 0)
+            goto error;
+        if (tracefile != Py_None) {
+            s = PyUnicode_FromFormat("#%S\n", t);
+            if (s == NULL)
+                goto error;
+            r = PyObject_CallMethodObjArgs(tracefile, str_write, s, NULL);
+            Py_DECREF(s);
+            if (r == NULL)
+                goto error;
+            Py_DECREF(r);
+        }
+        while (PyList_GET_SIZE(futureEvents) > 0) {
+            item = PySequence_GetItem(PyList_GET_ITEM(futureEvents, 0), 0);
+            if (item == NULL)
+                goto error;
+            cmp = PyObject_RichCompareBool(item, t, Py_EQ);
+            Py_DECREF(item);
+            if (cmp < 0)
+                goto error;
+            if (!cmp)
+                break;
+            item = PyObject_CallFunctionObjArgs(heappop, futureEvents, NULL);
+            if (item == NULL)
+                goto error;
+            event = PySequence_GetItem(item, 2);
+            Py_DECREF(item);
+            if (event == NULL)
+                goto error;
+            cmp = PyObject_IsInstance(event, Waiter);
+            if (cmp > 0) {
+                cmp = PyList_Append(waiters, event);
+            } else if (cmp == 0) {
+                cmp = extend(waiters,
+                             PyObject_CallMethodObjArgs(event, str_apply, NULL));
+            }
+            Py_DECREF(event);
+            if (cmp < 0)
+                goto error;
+        }
+    }
+
+ error:
+    Py_XDECREF(siglist);
+    Py_XDECREF(futureEvents);
+    Py_XDECREF(postponed);
+    Py_XDECREF(t);
+    return NULL;
+}
+
+
+static PyMethodDef simrunc_methods[] = {
+    {"run", (PyCFunction) run, METH_VARARGS,
+     "run(state, waiters, actives, exc, maxTime, duration, tracefile)\n\n"
+     "Run the simulation event loop until an exception is raised."},
+    {NULL, NULL, 0, NULL}
+};
+
+
+static PyObject *
+getattr(const char *modname, const char *name)
+{
+    PyObject *mod, *obj;
+
+    mod = PyImport_ImportModule(modname);
+    if (mod == NULL)
+        return NULL;
+    obj = PyObject_GetAttrString(mod, name);
+    Py_DECREF(mod);
+    return obj;
+}
+
+
+static int
+setup(void)
+{
+    if (!(Waiter = getattr("myhdl._Waiter", "_Waiter")) ||
+        !(StopSimulation = getattr("myhdl", "StopSimulation")) ||
+        !(SuspendSimulation = getattr("myhdl", "_SuspendSimulation")) ||
+        !(heappop = getattr("heapq", "heappop")))
+        return -1;
+    if (!(str_queued = PyUnicode_InternFromString("_queued")) ||
+        !(str_update = PyUnicode_InternFromString("_update")) ||
+        !(str_next = PyUnicode_InternFromString("next")) ||
+        !(str_purge = PyUnicode_InternFromString("purge")) ||
+        !(str_postponed = PyUnicode_InternFromString("postponed")) ||
+        !(str_runPostponed = PyUnicode_InternFromString("runPostponed")) ||
+        !(str_awaiting = PyUnicode_InternFromString("awaiting")) ||
+        !(str_apply = PyUnicode_InternFromString("apply")) ||
+        !(str_time = PyUnicode_InternFromString("time")) ||
+        !(str_siglist = PyUnicode_InternFromString("siglist")) ||
+        !(str_futureEvents = PyUnicode_InternFromString("futureEvents")) ||
+        !(str_write = PyUnicode_InternFromString("write")))
+        return -1;
+    return 0;
+}
+
+
+#if PY_MAJOR_VERSION >= 3
+
+static struct PyModuleDef simrunc_module = {
+    PyModuleDef_HEAD_INIT,
+    "_simrunc",
+    "C version of the simulation event loop",
+    -1,
+    simrunc_methods
+};
+
+PyMODINIT_FUNC
+PyInit__simrunc(void)
+{
+    PyObject *m;
+
+    m = PyModule_Create(&simrunc_module);
+    if (m == NULL)
+        return NULL;
+    if (setup() < 0) {
+        Py_DECREF(m);
+        return NULL;
+    }
+    return m;
+}
+
+#else
+
+PyMODINIT_FUNC
+init_simrunc(void)
+{
+    if (Py_InitModule3("_simrunc", simrunc_methods,
+                       "C version of the simulation event loop") == NULL)
+        return;
+    setup();
+}
+
+#endif
@@ -23,17 +23,114 @@ This module provides the following objects:
 now -- function that returns the current simulation time
 
 """
+import threading
+from heapq import heappush
+from itertools import count
+from weakref import WeakValueDictionary
+
+from myhdl import SimulationError
+
+
+class _error:
+    pass
+_error.PostponedDrive = "postponed process should not drive signals"
+_error.OtherSim = "signal belongs to another unfinished simulation"
 
 
-_signals = []
 _blocks = []
-_siglist = []
-_futureEvents = []
-_time = 0
-_tracing = 0
-_tf = None
+
+
+class _SimState(object):
+
+    """ State of a single simulation.
+
+    Signals bind to the state of the thread at the time they are
+    created. A simulation takes over that state, and the thread
+    starts a new one for the signals created afterwards. This keeps
+    simulations isolated from each other.
+
+    """
+
+    def __init__(self):
+        # signals are not kept alive by the simulator
+        self.signals = WeakValueDictionary()
+        self.siglist = []
+        self.futureEvents = []
+        # waiters of postponed processes to run at the end of the timestep
+        self.postponed = []
+        # asyncio futures that coroutine processes are waiting for
+        self.awaiting = set()
+        self.time = 0
+        # set when a simulation takes the state over, and while it runs
+        self.owned = False
+        self.running = False
+        self.tracing = 0
+        self.tf = None
+        # sequence numbers keep same-time events in FIFO order in the heap
+        self.seqno = count()
+
+    def bind(self, sig):
+        sig._sim = self
+        self.signals[id(sig)] = sig
+
+    def schedule(self, t, event):
+        """ Schedule an event at time t in the future event heap """
+        heappush(self.futureEvents, (t, next(self.seqno), event))
+
+    def runPostponed(self):
+        """ Run the postponed processes, after the last delta cycle """
+        postponed = self.postponed[:]
+        del self.postponed[:]
+        for waiter in postponed:
+            waiter.pending = 0
+            waiter.func()
+        if self.siglist:
+            names = [s._name or repr(s) for s in self.siglist]
+            raise SimulationError(_error.PostponedDrive, ", ".join(names))
+
+
+class _Local(threading.local):
+
+    def __init__(self):
+        # state of the current simulation: time, events and tracing
+        self.current = self.pending = _SimState()
+
+
+# pending is the state that new signals bind to
+_local = _Local()
+
+
+def _current():
+    return _local.current
+
+
+def _pending():
+    return _local.pending
+
+
+def _claim(sig):
+    """ Return the state to queue a signal on, when its own one isn't running.
+
+    The running simulation takes over the signals that it assigns, unless
+    they belong to another unfinished simulation: it would never update
+    them.
+
+    """
+    state = sig._sim
+    current = _local.current
+    if current.running:
+        if state.owned:
+            raise SimulationError(_error.OtherSim, sig._name or repr(sig))
+        current.bind(sig)
+        return current
+    return state
+
+
+def _schedule(t, event):
+    """ Schedule an event at time t in the current simulation """
+    _local.current.schedule(t, event)
 
 
 def now():
     """ Return the current simulation time """
-    return _time
+    return _local.current.time
@@ -36,6 +36,7 @@ from myhdl._extractHierarchy import _HierExtr
 from myhdl import TraceSignalsError
 from myhdl._ShadowSignal import _TristateSignal, _TristateDriver
 from myhdl._block import _Block
+from myhdl._memory import Memory, _MemoryWord
 from myhdl._getHierarchy import _getHierarchy
 
 _tracing = 0
@@ -73,9 +74,10 @@ class _TraceSignalsClass(object):
         if isinstance(dut, _Block):
             # now we go bottom-up: so clean up and start over
             # TODO: consider a warning for the overruled block
-            if _simulator._tracing:
-                _simulator._tracing = 0
-                _simulator._tf.close()
+            sim = _simulator._pending()
+            if sim.tracing:
+                sim.tracing = 0
+                sim.tf.close()
                 os.remove(vcdpath)
         else:  # deprecated
             if _tracing:
@@ -90,7 +92,7 @@ class _TraceSignalsClass(object):
         if not isinstance(dut, _Block):
             if not callable(dut):
                 raise TraceSignalsError(_error.ArgType, "got %s" % type(dut))
-        if _simulator._tracing:
+        if _simulator._pending().tracing:
             raise TraceSignalsError(_error.MultipleTraces)
 
         _tracing = 1
@@ -129,8 +131,9 @@ class _TraceSignalsClass(object):
                     shutil.copyfile(vcdpath, backup)
                 os.remove(vcdpath)
             vcdfile = open(vcdpath, 'w')
-            _simulator._tracing = 1
-            _simulator._tf = vcdfile
+            sim = _simulator._pending()
+            sim.tracing = 1
+            sim.tf = vcdfile
             _writeVcdHeader(vcdfile, self.timescale)
             _writeVcdSigs(vcdfile, h.hierarchy, self.tracelists)
         finally:
@@ -186,6 +189,26 @@ def _getSval(s):
     return sval
 
 
+def _traceMemory(mem, namegen, siglist):
+    # a memory is traced as a whole, with a code per word
+    if not mem._tracing:
+        mem._tracing = 1
+        mem._codes = [next(namegen) for i in range(len(mem))]
+        siglist.append(mem)
+
+
+def _writeVcdMemory(f, n, mem, namegen, siglist):
+    _traceMemory(mem, namegen, siglist)
+    w = mem._nrbits
+    for i, code in enumerate(mem._codes):
+        if w == 1:
+            print("$var reg 1 %s %s(%i) $end" % (code, n, i), file=f)
+        elif w:
+            print("$var reg %s %s %s(%i) $end" % (w, code, n, i), file=f)
+        else:
+            print("$var real 1 %s %s(%i) $end" % (code, n, i), file=f)
+
+
 def _writeVcdSigs(f, hierarchy, tracelists):
     curlevel = 0
     namegen = _genNameCode()
@@ -203,6 +226,19 @@ def _writeVcdSigs(f, hierarchy, tracelists):
                 print("$upscope $end", file=f)
         print("$scope module %s $end" % name, file=f)
         for n, s in sigdict.items():
+            if isinstance(s, _MemoryWord):
+                # a word passed as a port shares the code of its memory
+                mem = s._mem
+                _traceMemory(mem, namegen, siglist)
+                code = mem._codes[s._index]
+                w = mem._nrbits
+                if w == 1:
+                    print("$var reg 1 %s %s $end" % (code, n), file=f)
+                elif w:
+                    print("$var reg %s %s %s $end" % (w, code, n), file=f)
+                else:
+                    print("$var real 1 %s %s $end" % (code, n), file=f)
+                continue
             sval = _getSval(s)
             if sval is None:
                 raise ValueError("%s of module %s has no initial value" % (n, name))
@@ -225,8 +261,13 @@ def _writeVcdSigs(f, hierarchy, tracelists):
         if tracelists:
             for n in memdict.keys():
                 print("$scope module {} $end" .format(n), file=f)
+                mem = memdict[n].mem
+                if isinstance(mem, Memory):
+                    _writeVcdMemory(f, n, mem, namegen, siglist)
+                    print("$upscope $end", file=f)
+                    continue
                 memindex = 0
-                for s in memdict[n].mem:
+                for s in mem:
                     sval = _getSval(s)
                     if sval is None:
                         raise ValueError("%s of module %s has no initial value" % (n, name))
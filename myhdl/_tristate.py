@@ -1,8 +1,8 @@
 from __future__ import absolute_import
 import warnings
 
+from myhdl._simulator import _claim
 from myhdl._Signal import _Signal, _DelayedSignal
-from myhdl._simulator import _siglist
 
 
 class BusContentionWarning(UserWarning):
@@ -64,7 +64,11 @@ class _TristateDriver(_Signal):
             self._next = None
         else:
             self._setNextVal(val)
-        _siglist.append(self._bus)
+        bus = self._bus
+        sim = bus._sim
+        if not sim.running:
+            sim = _claim(bus)
+        sim.siglist.append(bus)
 
 
 class _DelayedTristate(_DelayedSignal, _Tristate):
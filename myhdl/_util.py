@@ -43,6 +43,10 @@ def _printExcInfo():
 
 _isGenFunc = inspect.isgeneratorfunction
 
+# coroutines (async def) are only available from Python 3.5
+_isCoroutine = getattr(inspect, 'iscoroutine', lambda obj: False)
+_isCoroutineFunc = getattr(inspect, 'iscoroutinefunction', lambda obj: False)
+
 
 def _flatten(*args):
     arglist = []
@@ -4,6 +4,7 @@ import ast
 
 from myhdl._intbv import intbv
 from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._memory import Memory
 
 
 class _SigNameVisitor(ast.NodeVisitor):
@@ -43,7 +44,7 @@ class _SigNameVisitor(ast.NodeVisitor):
         if n not in self.symdict:
             return
         s = self.symdict[n]
-        if isinstance(s, (_Signal, intbv)) or _isListOfSigs(s):
+        if isinstance(s, (_Signal, intbv, Memory)) or _isListOfSigs(s):
             if self.context == 'input':
                 self.inputs.add(n)
             elif self.context == 'output':
@@ -57,7 +58,7 @@ class _SigNameVisitor(ast.NodeVisitor):
                 raise AssertionError("bug in _SigNameVisitor")
         if isinstance(s, _Signal):
             self.sigdict[n] = s
-        elif _isListOfSigs(s):
+        elif isinstance(s, Memory) or _isListOfSigs(s):
             self.losdict[n] = s
 
     def visit_Assign(self, node):
@@ -44,6 +44,7 @@ from myhdl.conversion._misc import (_error, _access, _kind,
 from myhdl._extractHierarchy import _isMem, _getMemInfo, _UserCode
 from myhdl._Signal import _Signal, _WaiterList
 from myhdl._ShadowSignal import _ShadowSignal, _SliceSignal, _TristateDriver
+from myhdl._memory import Memory
 from myhdl._util import _flatten
 from myhdl._util import _isTupleOfInts
 from myhdl._util import _makeAST
@@ -121,6 +122,13 @@ def _analyzeSigs(hierarchy, hdl='Verilog'):
     for m in memlist:
         if not m._used:
             continue
+        if isinstance(m.mem, Memory):
+            # the words share the memory type, and take their names from it
+            m.mem._name = m.name
+            m.mem._wordname = "%s%s%%d%s" % (m.name, open, close)
+            if not m.elObj._nrbits:
+                raise ConversionError(_error.UndefinedBitWidth, m.elObj._name)
+            continue
         for i, s in enumerate(m.mem):
             s._name = "%s%s%s%s" % (m.name, open, i, close)
             s._used = False
@@ -341,7 +349,8 @@ class _FirstPassVisitor(ast.NodeVisitor, _ConversionMixin):
 
 
 def getNrBits(obj):
-    if hasattr(obj, '_nrbits'):
+    # classes such as intbv have slot descriptors, not values
+    if hasattr(obj, '_nrbits') and not isinstance(obj, type):
         return obj._nrbits
     return None
 
@@ -0,0 +1,1054 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" myhdl toPython conversion module.
+
+This module compiles the processes of a synchronous design into plain
+Python functions. Signal values are kept as ints in two flat lists,
+one for the current and one for the next values. Process bodies are
+inlined: one function per clock edge runs the sequential bodies, and a
+commit function updates the registers and evaluates the combinatorial
+bodies in dependency order.
+
+In lanes mode, every signal value is a NumPy array that holds the values
+of N independent copies of the design. The bodies then run once for all
+lanes. Conditional statements are converted to masked assignments, so
+that each lane sees the effect of its own branch.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+
+import ast
+import copy
+import textwrap
+
+from myhdl import ConversionError
+from myhdl._compat import builtins, integer_types
+from myhdl._intbv import intbv
+from myhdl._modbv import modbv
+from myhdl._concat import concat
+from myhdl._bin import bin
+from myhdl._Signal import _Signal, _isListOfSigs
+from myhdl._always_seq import _AlwaysSeq
+from myhdl._util import _makeAST
+from myhdl._resolverefs import _AttrRefTransformer
+from myhdl.conversion._misc import _error
+
+# NumPy is only needed for lanes mode
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+_missing = object()
+
+# callables that accept the value of a signal as an argument
+_valueFuncs = (int, bool, abs, hex, oct, str, repr, float, min, max, print,
+               bin)
+
+
+def _subst(tree, subs):
+    class _Subst(ast.NodeTransformer):
+
+        def visit_Name(self, node):
+            if node.id in subs:
+                return copy.deepcopy(subs[node.id])
+            return node
+
+    return _Subst().visit(tree)
+
+
+def _stmts(src, **subs):
+    """ Parse statements; names in subs are replaced by expression nodes """
+    return _subst(ast.parse(textwrap.dedent(src)), subs).body
+
+
+def _expr(src, **subs):
+    """ Parse an expression; names in subs are replaced by expression nodes """
+    node = _subst(ast.parse(src, mode='eval'), subs).body
+    node._int = True
+    return node
+
+
+def _const(val):
+    return _expr(repr(val))
+
+
+def _constValue(node):
+    if hasattr(ast, 'Constant') and isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Num):
+        return node.n
+    return _missing
+
+
+def _isInt(node):
+    """ Return True if node statically evaluates to an int or a bool """
+    if getattr(node, '_int', False):
+        return True
+    val = _constValue(node)
+    if val is not _missing:
+        return isinstance(val, integer_types)
+    if isinstance(node, ast.BinOp):
+        return _isInt(node.left) and _isInt(node.right)
+    if isinstance(node, ast.UnaryOp):
+        return isinstance(node.op, ast.Not) or _isInt(node.operand)
+    if isinstance(node, ast.Compare):
+        return True
+    if isinstance(node, ast.BoolOp):
+        return all(_isInt(n) for n in node.values)
+    if isinstance(node, ast.IfExp):
+        return _isInt(node.body) and _isInt(node.orelse)
+    return False
+
+
+def _index(node):
+    """ Return the slice of a subscript node """
+    sl = node.slice
+    if hasattr(ast, 'Index') and isinstance(sl, ast.Index):
+        sl = sl.value
+    return sl
+
+
+def _raw(val):
+    if isinstance(val, intbv):
+        return val._val
+    return val
+
+
+def _intbvError(val, lo, hi):
+    if hi is not None and val >= hi:
+        raise ValueError("intbv value %s >= maximum %s" % (val, hi))
+    raise ValueError("intbv value %s < minimum %s" % (val, lo))
+
+
+def _boolError(val):
+    raise ValueError("Expected boolean value, got %s (%s)" % (repr(val), type(val)))
+
+
+def _bitError(i):
+    raise ValueError("intbv[i] = v requires v in (0, 1)\n"
+                     "            i == %s " % i)
+
+
+def _sliceError(i, j, val):
+    raise ValueError("intbv[i:j] = v abs(v) too large\n"
+                     "            i, j, v == %s, %s, %s" % (i, j, val))
+
+
+def _truth(val):
+    """ Lane-wise truth value """
+    return numpy.asarray(val) != 0
+
+
+def _lanesInt(val):
+    return _raw(val)
+
+
+def _badLane(val, bad):
+    lane = numpy.flatnonzero(bad)[0]
+    return numpy.broadcast_to(val, bad.shape)[lane], lane
+
+
+def _lanesIntbv(val, lo, hi, mask):
+    """ Check the lane values of an intbv against its bounds """
+    if hi is not None:
+        bad = (numpy.asarray(val) >= hi) & mask
+        if bad.any():
+            val, lane = _badLane(val, bad)
+            raise ValueError("intbv value %s >= maximum %s in lane %d" % (val, hi, lane))
+    if lo is not None:
+        bad = (numpy.asarray(val) < lo) & mask
+        if bad.any():
+            val, lane = _badLane(val, bad)
+            raise ValueError("intbv value %s < minimum %s in lane %d" % (val, lo, lane))
+    return val
+
+
+def _lanesBool(val, mask):
+    bad = (numpy.asarray(val) != 0) & (numpy.asarray(val) != 1) & mask
+    if bad.any():
+        val, lane = _badLane(val, bad)
+        raise ValueError("Expected boolean value, got %s in lane %d" % (val, lane))
+    return val
+
+
+def _lanesBit(val, i, mask):
+    bad = (numpy.asarray(val) != 0) & (numpy.asarray(val) != 1) & mask
+    if bad.any():
+        val, lane = _badLane(val, bad)
+        raise ValueError("intbv[i] = v requires v in (0, 1)\n"
+                         "            i, lane == %s, %d " % (i, lane))
+    return val
+
+
+def _lanesSlice(val, i, j, mask):
+    lim = 1 << (i - j)
+    bad = ((numpy.asarray(val) >= lim) | (numpy.asarray(val) < -lim)) & mask
+    if bad.any():
+        val, lane = _badLane(val, bad)
+        raise ValueError("intbv[i:j] = v abs(v) too large\n"
+                         "            i, j, v, lane == %s, %s, %s, %d" %
+                         (i, j, val, lane))
+    return val
+
+
+class _CompiledDesign(object):
+
+    """ Flat representation of a compiled design.
+
+    Attributes:
+    sigs -- signals, indexed by slot number
+    cur -- current signal values
+    next -- next signal values
+    procs -- edge functions by (id(signal), posedge)
+    combreads -- slots that are read by combinatorial bodies
+    commit -- function that updates the registers and runs the
+              combinatorial bodies
+    source -- Python source of the compiled functions, if available
+    lanes -- number of lanes in lanes mode, else None
+    edgeslots -- slots of the signals with edge-triggered processes
+
+    """
+
+    def __init__(self, lanes=None):
+        self.sigs = []
+        self._slots = {}
+        self.mems = []
+        self._memids = {}
+        self.ns = {'_intbvError': _intbvError,
+                   '_boolError': _boolError,
+                   '_bitError': _bitError,
+                   '_sliceError': _sliceError}
+        self._aliases = {}
+        self.procs = {}
+        self.combreads = set()
+        self.commit = None
+        self.source = None
+        self.lanes = lanes
+        self.edgeslots = set()
+        if lanes is not None:
+            self.ns.update(_truth=_truth, _any=numpy.any, _where=numpy.where,
+                           _minimum=numpy.minimum, _maximum=numpy.maximum,
+                           _lanesInt=_lanesInt, _lanesIntbv=_lanesIntbv,
+                           _lanesBool=_lanesBool, _lanesBit=_lanesBit,
+                           _lanesSlice=_lanesSlice)
+
+    def slot(self, sig):
+        k = self._slots.get(id(sig))
+        if k is None:
+            k = self._slots[id(sig)] = len(self.sigs)
+            self.sigs.append(sig)
+        return k
+
+    def mem(self, los):
+        j = self._memids.get(id(los))
+        if j is None:
+            s0 = los[0]
+            for s in los:
+                if s._type is not s0._type or s._min != s0._min or \
+                        s._max != s0._max or s._nrbits != s0._nrbits:
+                    raise ConversionError(_error.InconsistentType, s._name)
+            j = self._memids[id(los)] = len(self.mems)
+            self.mems.append(los)
+            self.ns['_M%d' % j] = tuple(self.slot(s) for s in los)
+            self.ns['_mq%d' % j] = []
+        return j
+
+    def alias(self, name, obj):
+        n = self._aliases.get(id(obj))
+        if n is None:
+            n = '_g%d_%s' % (len(self._aliases), name)
+            self._aliases[id(obj)] = n
+            self.ns[n] = obj
+        return n
+
+    def load(self):
+        """ Copy the signal values into the value lists """
+        if self.lanes is not None:
+            # values are never updated in place, so they can be shared
+            self.cur[:] = [self.laneValues(k, _raw(s._val))
+                           for k, s in enumerate(self.sigs)]
+            self.next[:] = self.cur
+            return
+        self.cur[:] = [_raw(s._val) for s in self.sigs]
+        self.next[:] = [_raw(s._next) for s in self.sigs]
+
+    def laneType(self, sig):
+        """ Return int64 if the products of the values of sig fit, else object """
+        if sig._type is bool:
+            return numpy.int64
+        if isinstance(sig._val, intbv) and sig._min is not None and \
+                sig._max is not None and -2**31 <= sig._min and sig._max <= 2**31:
+            return numpy.int64
+        return object
+
+    def laneValues(self, k, val):
+        """ Return the lane representation of a value for slot k """
+        if k in self.edgeslots:
+            # edges can't differ between lanes
+            return val
+        return numpy.full(self.lanes, val, dtype=self.laneType(self.sigs[k]))
+
+    def values(self, k):
+        """ Return the lane values of slot k as an array """
+        return numpy.array(numpy.broadcast_to(self.cur[k], (self.lanes,)))
+
+    def store(self, k=None):
+        """ Copy the values back into the signal objects """
+        if self.lanes is not None:
+            return
+        slots = range(len(self.sigs)) if k is None else (k,)
+        for k in slots:
+            s, val = self.sigs[k], self.cur[k]
+            if isinstance(s._val, intbv):
+                s._val._val = val
+                s._next._val = val
+            else:
+                s._val = s._next = val
+
+
+class _ProcCompiler(ast.NodeTransformer):
+
+    """ Rewrite the body of a process to operate on the value lists """
+
+    def __init__(self, design, inst, prefix):
+        self.design = design
+        self.name = inst.name
+        self.prefix = prefix
+        f = inst.func
+        tree = _makeAST(f)
+        symdict = f.__globals__.copy()
+        if f.__code__.co_freevars:
+            for n, c in zip(f.__code__.co_freevars, f.__closure__):
+                symdict[n] = c.cell_contents
+        tree.symdict = symdict
+        _AttrRefTransformer(tree).visit(tree)
+        self.symdict = symdict
+        self.tree = tree.body[0]
+        self.lanes = design.lanes is not None
+        self.locals = set()
+        self.reads = set()
+        self.writes = set()
+        self.memreads = set()
+        self.memwrites = set()
+        for node in ast.walk(self.tree):
+            if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+                self.locals.add(node.id)
+            elif isinstance(node, ast.ExceptHandler) and node.name:
+                self.locals.add(node.name)
+
+    def body(self):
+        body = []
+        for stmt in self.tree.body:
+            res = self.visit(stmt)
+            if isinstance(res, list):
+                body.extend(res)
+            elif res is not None:
+                body.append(res)
+        return body or _stmts("pass")
+
+    def raiseError(self, kind, msg=""):
+        raise ConversionError(kind, "in %s: %s" % (self.name, msg))
+
+    def lookup(self, name):
+        if name in self.locals:
+            return _missing
+        obj = self.symdict.get(name, _missing)
+        if obj is _missing:
+            obj = getattr(builtins, name, _missing)
+        return obj
+
+    def sigref(self, node):
+        """ Return (slot expression, signal, memory number) or None """
+        if isinstance(node, ast.Name):
+            obj = self.lookup(node.id)
+            if isinstance(obj, _Signal):
+                return _const(self.design.slot(obj)), obj, None
+            if isinstance(obj, list) and obj and _isListOfSigs(obj):
+                self.raiseError(_error.NotSupported,
+                                "list of signals %s used as a value" % node.id)
+        elif isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name):
+            obj = self.lookup(node.value.id)
+            if isinstance(obj, list) and obj and _isListOfSigs(obj):
+                if self.lanes:
+                    self.raiseError(_error.NotSupported,
+                                    "list of signals %s in lanes mode" % node.value.id)
+                sl = _index(node)
+                if isinstance(sl, ast.Slice):
+                    self.raiseError(_error.NotSupported,
+                                    "slice of list of signals %s" % node.value.id)
+                j = self.design.mem(obj)
+                slot = _expr("_M%d[_A_]" % j, _A_=self.visit(copy.deepcopy(sl)))
+                return slot, obj[0], j
+        return None
+
+    def read(self, ref, which='_v'):
+        slot, sig, j = ref
+        if j is None:
+            self.reads.add(_constValue(slot))
+        else:
+            self.memreads.add(j)
+        node = _expr("%s[_A_]" % which, _A_=slot)
+        node._int = sig._type in (bool, intbv, integer_types) or \
+            isinstance(sig._val, intbv)
+        node._width = sig._nrbits
+        return node
+
+    def intSource(self, node):
+        """ Return the rewritten node if it evaluates to an int bit vector """
+        ref = self.sigref(node)
+        if ref is not None:
+            return self.read(ref)
+        if isinstance(node, ast.Attribute) and node.attr in ('val', 'next'):
+            ref = self.sigref(node.value)
+            if ref is not None:
+                return self.read(ref, '_v' if node.attr == 'val' else '_n')
+        if isinstance(node, (ast.BinOp, ast.UnaryOp)):
+            return self.visit(node)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and \
+                self.lookup(node.func.id) is concat:
+            return self.visit(node)
+        if isinstance(node, ast.Subscript) and isinstance(_index(node), ast.Slice):
+            value = self.intSource(node.value)
+            if value is not None:
+                return self.slice(value, _index(node))
+        return None
+
+    def slice(self, value, sl):
+        if sl.step is not None:
+            self.raiseError(_error.NotSupported, "slice step")
+        i = sl.lower and self.visit(sl.lower)
+        j = sl.upper and self.visit(sl.upper)
+        if j is None:
+            j = _const(0)
+        if i is None:
+            return _expr("(_A_ >> _J_)", _A_=value, _J_=j)
+        ci, cj = _constValue(i), _constValue(j)
+        if ci is not _missing and cj is not _missing:
+            if cj:
+                node = _expr("((_A_ & %d) >> %d)" % ((1 << ci) - 1, cj), _A_=value)
+            else:
+                node = _expr("(_A_ & %d)" % ((1 << ci) - 1), _A_=value)
+            node._width = ci - cj
+            return node
+        return _expr("((_A_ & ((1 << _I_) - 1)) >> _J_)", _A_=value, _I_=i, _J_=j)
+
+    def visit_Name(self, node):
+        if node.id in self.locals:
+            new = ast.Name(id=self.prefix + node.id, ctx=node.ctx)
+            return ast.copy_location(new, node)
+        obj = self.lookup(node.id)
+        if obj is _missing:
+            return node
+        ref = self.sigref(node)
+        if ref is not None:
+            return ast.copy_location(self.read(ref), node)
+        if isinstance(obj, bool) or \
+                (isinstance(obj, integer_types) and not isinstance(obj, bool)):
+            return ast.copy_location(_const(obj), node)
+        if getattr(builtins, node.id, _missing) is obj and node.id not in self.symdict:
+            return node
+        if self.lanes and isinstance(obj, intbv):
+            self.raiseError(_error.NotSupported,
+                            "intbv variable %s in lanes mode" % node.id)
+        new = ast.Name(id=self.design.alias(node.id, obj), ctx=node.ctx)
+        return ast.copy_location(new, node)
+
+    def visit_Attribute(self, node):
+        ref = self.sigref(node.value)
+        if ref is None:
+            return self.generic_visit(node)
+        if not isinstance(node.ctx, ast.Load):
+            self.raiseError(_error.NotSupported, "signal attribute assignment")
+        sig = ref[1]
+        if node.attr == 'val':
+            return self.read(ref)
+        if node.attr == 'next':
+            return self.read(ref, '_n')
+        if node.attr in ('max', 'min'):
+            return _const(getattr(sig, node.attr))
+        self.raiseError(_error.UnsupportedAttribute, node.attr)
+
+    def visit_Subscript(self, node):
+        ref = self.sigref(node)
+        if ref is not None:
+            if not isinstance(node.ctx, ast.Load):
+                self.raiseError(_error.ListElementAssign)
+            return self.read(ref)
+        if isinstance(node.ctx, ast.Load):
+            value = self.intSource(node.value)
+            if value is not None:
+                sl = _index(node)
+                if isinstance(sl, ast.Slice):
+                    return self.slice(value, sl)
+                i = self.visit(sl)
+                if _constValue(i) == 0:
+                    node = _expr("(_A_ & 1)", _A_=value)
+                else:
+                    node = _expr("((_A_ >> _I_) & 1)", _A_=value, _I_=i)
+                node._width = 1
+                return node
+        elif self.sigref(node.value) is not None:
+            self.raiseError(_error.NotSupported, "signal item assignment")
+        return self.generic_visit(node)
+
+    def visit_Call(self, node):
+        f = node.func
+        if isinstance(f, ast.Attribute) and f.attr == 'signed' and not node.args:
+            value = self.intSource(f.value)
+            if value is not None:
+                sig = self.sigref(f.value)
+                width = getattr(value, '_width', 0)
+                if sig is not None and sig[1]._min is not None and sig[1]._min < 0:
+                    width = 0
+                if not width:
+                    return value
+                h = 1 << (width - 1)
+                return _expr("(((_A_ + %d) & %d) - %d)" % (h, 2 * h - 1, h), _A_=value)
+        obj = _missing
+        if isinstance(f, ast.Name):
+            obj = self.lookup(f.id)
+        if self.lanes and obj in (int, bool, min, max) and not node.keywords:
+            args = [self.visit(arg) for arg in node.args]
+            if obj is int and len(args) == 1:
+                return args[0]
+            if obj is bool and len(args) == 1:
+                return _expr("_truth(_A_)", _A_=args[0])
+            if obj in (min, max) and len(args) == 2:
+                f = '_minimum' if obj is min else '_maximum'
+                return _expr("%s(_A_, _B_)" % f, _A_=args[0], _B_=args[1])
+        if obj is len and len(node.args) == 1:
+            arg = node.args[0]
+            ref = self.sigref(arg) if not isinstance(arg, ast.Name) else None
+            if isinstance(arg, ast.Name):
+                val = self.lookup(arg.id)
+                if isinstance(val, _Signal):
+                    return _const(val._nrbits)
+                if isinstance(val, list) and val and _isListOfSigs(val):
+                    return _const(len(val))
+            elif ref is not None:
+                return _const(ref[1]._nrbits)
+        if obj is concat:
+            return self.concat(node)
+        if obj not in _valueFuncs:
+            for arg in node.args:
+                if isinstance(arg, ast.Name) and (
+                        isinstance(self.lookup(arg.id), _Signal) or
+                        _isListOfSigs(self.lookup(arg.id))):
+                    self.raiseError(_error.NotSupported,
+                                    "signal %s as a function argument" % arg.id)
+        return self.generic_visit(node)
+
+    def concat(self, node):
+        if node.keywords or not node.args:
+            self.raiseError(_error.NotSupported, "concat arguments")
+        width = 0
+        res = None
+        for arg in node.args:
+            val = self.intSource(arg)
+            if val is None:
+                c = _constValue(arg)
+                if isinstance(c, bool):
+                    val = _const(int(c))
+                    val._width = 1
+                elif isinstance(c, str):
+                    val = _const(int(c, 2))
+                    val._width = len(c)
+                else:
+                    # bit indexes have a width already
+                    val = self.visit(arg)
+                    obj = _missing
+                    if isinstance(arg, ast.Call) and isinstance(arg.func, ast.Name):
+                        obj = self.lookup(arg.func.id)
+                    elif isinstance(arg, ast.Name):
+                        obj = self.lookup(arg.id)
+                    if obj is bool:
+                        val._width = 1
+                    elif isinstance(obj, intbv) and obj._nrbits:
+                        # an intbv variable keeps its width
+                        val = _expr("int(_A_)", _A_=val)
+                        val._width = obj._nrbits
+                    elif res is None and not _isInt(val):
+                        res = _expr("int(_A_)", _A_=val)
+                        width = None
+                        continue
+            w = getattr(val, '_width', 0)
+            if res is None:
+                res = val
+                width = w
+                continue
+            if not w:
+                self.raiseError(_error.NotSupported,
+                                "concat argument without bit width")
+            res = _expr("(_R_ << %d | _A_ & %d)" % (w, (1 << w) - 1), _R_=res, _A_=val)
+            if isinstance(width, integer_types):
+                width = width + w if width else 0
+            else:
+                width = None
+        if isinstance(width, integer_types) and width:
+            res._width = width
+        return res
+
+    def visit_Assign(self, node):
+        if len(node.targets) == 1:
+            t = node.targets[0]
+            if isinstance(t, ast.Attribute) and t.attr == 'next':
+                ref = self.sigref(t.value)
+                if ref is not None:
+                    return self.assign(ref, node.value)
+            elif isinstance(t, ast.Subscript) and isinstance(t.value, ast.Attribute) \
+                    and t.value.attr == 'next':
+                ref = self.sigref(t.value.value)
+                if ref is not None:
+                    return self.assignItem(ref, _index(t), node.value)
+        return self.generic_visit(node)
+
+    # in lanes mode, logical operators work lane-wise
+
+    def visit_BoolOp(self, node):
+        if not self.lanes:
+            return self.generic_visit(node)
+        op = '&' if isinstance(node.op, ast.And) else '|'
+        res = None
+        for value in node.values:
+            val = _expr("_truth(_A_)", _A_=self.visit(value))
+            res = val if res is None else _expr("(_R_ %s _A_)" % op, _R_=res, _A_=val)
+        return res
+
+    def visit_UnaryOp(self, node):
+        if self.lanes and isinstance(node.op, ast.Not):
+            return _expr("(_A_ == 0)", _A_=self.visit(node.operand))
+        return self.generic_visit(node)
+
+    def visit_IfExp(self, node):
+        if not self.lanes:
+            return self.generic_visit(node)
+        return _expr("_where(_truth(_C_), _A_, _B_)", _C_=self.visit(node.test),
+                     _A_=self.visit(node.body), _B_=self.visit(node.orelse))
+
+    def visit_Compare(self, node):
+        node = self.generic_visit(node)
+        if not self.lanes or len(node.ops) == 1:
+            return node
+        res = None
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            cmp = ast.Compare(left=copy.deepcopy(left), ops=[op],
+                              comparators=[right])
+            res = cmp if res is None else _expr("(_R_ & _A_)", _R_=res, _A_=cmp)
+            left = right
+        return res
+
+    def visit_AugAssign(self, node):
+        t = node.target
+        if isinstance(t, ast.Subscript):
+            t = t.value
+        if isinstance(t, ast.Attribute) and self.sigref(t.value) is not None:
+            self.raiseError(_error.NotSupported, "augmented signal assignment")
+        return self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node):
+        node = self.generic_visit(node)
+        if node.name:
+            node.name = self.prefix + node.name
+        return node
+
+    def visit_Return(self, node):
+        self.raiseError(_error.NotSupported, "return statement")
+
+    visit_Yield = visit_YieldFrom = visit_Await = visit_Return
+
+    def visit_Global(self, node):
+        self.raiseError(_error.NotSupported, "global or nonlocal statement")
+
+    visit_Nonlocal = visit_Global
+
+    def visit_FunctionDef(self, node):
+        self.raiseError(_error.NotSupported, "embedded function")
+
+    visit_Lambda = visit_ClassDef = visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Import(self, node):
+        self.raiseError(_error.NotSupported, "import statement")
+
+    visit_ImportFrom = visit_Import
+
+    def coerce(self, val, sig):
+        if (sig._type in (bool, integer_types) or isinstance(sig._val, intbv)) \
+                and not _isInt(val):
+            if self.lanes:
+                return _expr("_lanesInt(_A_)", _A_=val)
+            return _expr("int(_A_)", _A_=val)
+        return val
+
+    def bounds(self, sig):
+        """ Statements that check or wrap the new value _t of sig """
+        val = sig._val
+        if sig._type is bool:
+            if self.lanes:
+                return _stmts("_t = _lanesBool(_t, _m)")
+            return _stmts("if _t != 0 and _t != 1: _boolError(_t)")
+        if not isinstance(val, intbv):
+            return []
+        lo, hi = val._min, val._max
+        if isinstance(val, modbv):
+            if lo is None:
+                return []
+            if lo == 0 and val._hasFullRange():
+                return _stmts("_t = _t & %d" % (hi - 1))
+            if self.lanes:
+                return _stmts("_t = (_t - %d) %% %d + %d" % (lo, hi - lo, lo))
+            return _stmts("if _t < %d or _t >= %d: _t = (_t - %d) %% %d + %d" %
+                          (lo, hi, lo, hi - lo, lo))
+        if lo is None and hi is None:
+            return []
+        if self.lanes:
+            # _m is the mask of the active lanes, see _LaneMasker
+            return _stmts("_t = _lanesIntbv(_t, %r, %r, _m)" % (lo, hi))
+        if lo is None:
+            cond = "_t >= %d" % hi
+        elif hi is None:
+            cond = "_t < %d" % lo
+        else:
+            cond = "_t >= %d or _t < %d" % (hi, lo)
+        return _stmts("if %s: _intbvError(_t, %r, %r)" % (cond, lo, hi))
+
+    def store(self, ref, stmts):
+        """ Wrap statements that compute _t into a write of the next value """
+        slot, sig, j = ref
+        if j is None:
+            self.writes.add(_constValue(slot))
+            stmts = stmts + _stmts("_n[_S_] = _t")
+            return [_subst(s, {'_S_': slot}) for s in stmts]
+        self.memwrites.add(j)
+        stmts = stmts + _stmts("_n[_S_] = _t; _mq%d.append(_S_)" % j)
+        return _stmts("_s = _A_", _A_=slot) + \
+            [_subst(s, {'_S_': ast.Name(id='_s', ctx=ast.Load())}) for s in stmts]
+
+    def assign(self, ref, value):
+        sig = ref[1]
+        val = self.coerce(self.visit(value), sig)
+        stmts = _stmts("_t = _A_", _A_=val) + self.bounds(sig)
+        return self.store(ref, stmts)
+
+    def assignItem(self, ref, sl, value):
+        sig = ref[1]
+        if not isinstance(sig._val, intbv):
+            self.raiseError(_error.NotSupported, "item assignment to non-intbv signal")
+        val = self.visit(value)
+        stmts = _stmts("_t = _n[_S_]")
+        if isinstance(sl, ast.Slice):
+            if sl.step is not None:
+                self.raiseError(_error.NotSupported, "slice step")
+            stmts += _stmts("_b = _A_", _A_=self.coerce(val, sig))
+            j = sl.upper and self.visit(sl.upper)
+            if j is None:
+                j = _const(0)
+            if sl.lower is None:
+                stmts += _stmts("_t = _b * (1 << _J_) + _t % (1 << _J_)", _J_=j)
+            else:
+                i = self.visit(sl.lower)
+                ci, cj = _constValue(i), _constValue(j)
+                if self.lanes:
+                    stmts += _stmts("""\
+                        _b = _lanesSlice(_b, _I_, _J_, _m)
+                        _t = _t & ~(((1 << (_I_ - _J_)) - 1) << _J_) | _b << _J_
+                        """, _I_=i, _J_=j)
+                elif ci is not _missing and cj is not _missing:
+                    lim = 1 << (ci - cj)
+                    i, j = _const(ci), _const(cj)
+                    stmts += _stmts("""\
+                        if _b >= %d or _b < %d:
+                            _sliceError(_I_, _J_, _b)
+                        _t = _t & %d | _b << _J_
+                        """ % (lim, -lim, ~((lim - 1) << cj)), _I_=i, _J_=j)
+                else:
+                    stmts += _stmts("""\
+                        if _b >= 1 << (_I_ - _J_) or _b < -(1 << (_I_ - _J_)):
+                            _sliceError(_I_, _J_, _b)
+                        _t = _t & ~(((1 << (_I_ - _J_)) - 1) << _J_) | _b << _J_
+                        """, _I_=i, _J_=j)
+            stmts += self.bounds(sig)
+        else:
+            i = self.visit(sl)
+            ci = _constValue(i)
+            if isinstance(ci, integer_types):
+                mask = _const(1 << ci)
+            else:
+                mask = _expr("(1 << _I_)", _I_=i)
+            if self.lanes:
+                stmts += _stmts("""\
+                    _b = _lanesBit(_A_, _I_, _m)
+                    _t = _t & ~_M_ | _b * _M_
+                    """, _A_=val, _I_=i, _M_=mask)
+            else:
+                stmts += _stmts("""\
+                _b = _A_
+                if _b == 1:
+                    _t = _t | _M_
+                elif _b == 0:
+                    _t = _t & ~_M_
+                else:
+                    _bitError(_I_)
+                """, _A_=val, _I_=i, _M_=mask)
+            lo, hi = sig._val._min, sig._val._max
+            if not (lo == 0 and sig._val._hasFullRange() and
+                    isinstance(ci, integer_types) and 0 <= ci < sig._nrbits):
+                stmts += self.bounds(sig)
+        return self.store(ref, stmts)
+
+
+class _LaneMasker(object):
+
+    """ Convert the conditional statements of a body to masked assignments
+
+    Each if statement computes the mask of the lanes that take each
+    branch. Both branches run, if any lane takes them, and assignments
+    in a branch only change the values of its lanes. The name _m in the
+    bounds checks stands for the mask of the active lanes.
+
+    """
+
+    def __init__(self, pc):
+        self.pc = pc
+        self.prefix = pc.prefix.replace('_p', '_m', 1)
+        self.n = 0
+        self.assigned = set()
+
+    def mask(self, stmts):
+        body = self.stmts(stmts, None)
+        # a masked assignment needs an old value
+        return [_stmts("%s = 0" % n)[0] for n in sorted(self.assigned)] + body
+
+    def stmts(self, stmts, m):
+        res = []
+        for s in stmts:
+            res.extend(self.stmt(s, m))
+        return res
+
+    def masked(self, stmts, m):
+        """ Run stmts for the lanes in mask m, if there are any """
+        node = _stmts("if _any(%s):\n    pass" % m)[0]
+        node.body = self.stmts(stmts, m) or _stmts("pass")
+        return node
+
+    def stmt(self, s, m):
+        mask = _const(True) if m is None else ast.Name(id=m, ctx=ast.Load())
+        if isinstance(s, ast.If):
+            self.n += 1
+            c = "%sc%d" % (self.prefix, self.n)
+            t = "%st%d" % (self.prefix, self.n)
+            f = "%sf%d" % (self.prefix, self.n)
+            res = _stmts("%s = _truth(_A_)" % c, _A_=s.test)
+            res += _stmts("%s = _M_ & %s" % (t, c), _M_=mask)
+            res.append(self.masked(s.body, t))
+            if s.orelse:
+                res += _stmts("%s = _M_ & ~%s" % (f, c), _M_=mask)
+                res.append(self.masked(s.orelse, f))
+            return res
+        if isinstance(s, ast.For):
+            s.body = self.stmts(s.body, m)
+            s.orelse = self.stmts(s.orelse, m)
+            return [s]
+        if isinstance(s, ast.AugAssign):
+            if not isinstance(s.target, ast.Name):
+                self.notSupported("augmented item assignment")
+            value = ast.BinOp(left=ast.Name(id=s.target.id, ctx=ast.Load()),
+                              op=s.op, right=s.value)
+            s = ast.Assign(targets=[s.target], value=value)
+        if isinstance(s, ast.Assign):
+            if len(s.targets) != 1:
+                self.notSupported("multiple assignment")
+            t = s.targets[0]
+            if isinstance(t, ast.Name) and t.id.startswith(self.pc.prefix):
+                old = ast.Name(id=t.id, ctx=ast.Load())
+                self.assigned.add(t.id)
+            elif isinstance(t, ast.Subscript) and \
+                    isinstance(t.value, ast.Name) and t.value.id == '_n':
+                old = copy.deepcopy(t)
+                old.ctx = ast.Load()
+            elif isinstance(t, ast.Name) and t.id in ('_t', '_b', '_s', '_x'):
+                old = None
+            else:
+                self.notSupported("assignment to %s" % ast.dump(t))
+            if m is not None and old is not None:
+                s.value = _expr("_where(_M_, _A_, _O_)", _M_=mask, _A_=s.value,
+                                _O_=old)
+            return [_subst(s, {'_m': mask})]
+        if isinstance(s, ast.Expr):
+            return [_subst(s, {'_m': mask})]
+        if isinstance(s, ast.Assert):
+            # fails if it fails in any of the active lanes
+            test = _expr("not _any(_M_ & ~_truth(_A_))", _M_=mask, _A_=s.test)
+            return [ast.Assert(test=test, msg=s.msg)]
+        if isinstance(s, ast.Raise):
+            if m is None:
+                return [s]
+            node = _stmts("if _any(%s):\n    pass" % m)[0]
+            node.body = [s]
+            return [node]
+        if isinstance(s, ast.Pass):
+            return [s]
+        self.notSupported("%s statement" % type(s).__name__.lower())
+
+    def notSupported(self, msg):
+        self.pc.raiseError(_error.NotSupported, "%s in lanes mode" % msg)
+
+
+def _init(design, sig):
+    val = _raw(sig._init)
+    if isinstance(val, integer_types):
+        return _const(val)
+    return ast.Name(id=design.alias('init', val), ctx=ast.Load())
+
+
+def _resetStmts(design, inst, pc, stmts):
+    """ Wrap the body of an always_seq block in its reset branch """
+    reset = inst.reset
+    rst = []
+    for n in inst.outputs:
+        obj = inst.symdict[n]
+        if isinstance(obj, _Signal):
+            k = design.slot(obj)
+            rst += _stmts("_n[%d] = _A_" % k, _A_=_init(design, obj))
+            pc.writes.add(k)
+        elif isinstance(obj, list):
+            j = design.mem(obj)
+            for s in obj:
+                rst += _stmts("_n[%d] = _A_" % design.slot(s), _A_=_init(design, s))
+            rst += _stmts("_mq%d.extend(_M%d)" % (j, j))
+            pc.memwrites.add(j)
+    if inst.varregs:
+        rst += _stmts("%s()" % design.alias('reset_vars', inst.reset_vars))
+    node = _stmts("if _v[%d] == %r:\n    pass\nelse:\n    pass" %
+                  (design.slot(reset), reset.active))[0]
+    node.body = rst or _stmts("pass")
+    node.orelse = stmts
+    return [node]
+
+
+def _toPython(edgeinsts, combs, trace=None, lanes=None):
+    """ Compile a synchronous design.
+
+    edgeinsts -- dict of sequential instances by (id(signal), posedge)
+    combs -- always_comb instances in dependency order
+    trace -- function called with the slot number of every committed
+             signal, or None
+    lanes -- number of lanes, or None for plain int values
+
+    Returns a _CompiledDesign object.
+
+    """
+    design = _CompiledDesign(lanes)
+    ns = design.ns
+    funcs = []
+    regs = set()
+    regmems = set()
+    for key, insts in edgeinsts.items():
+        name = '_proc%d' % len(design.procs)
+        body = []
+        for inst in insts:
+            for e in inst.senslist:
+                design.edgeslots.add(design.slot(e.sig))
+            pc = _ProcCompiler(design, inst, '_p%d_' % len(funcs))
+            funcs.append(pc)
+            stmts = pc.body()
+            if isinstance(inst, _AlwaysSeq) and inst.reset is not None:
+                if lanes is not None and inst.varregs:
+                    pc.raiseError(_error.NotSupported,
+                                  "variables in always_seq in lanes mode")
+                stmts = _resetStmts(design, inst, pc, stmts)
+            if lanes is not None:
+                stmts = _LaneMasker(pc).mask(stmts)
+            body += stmts
+            regs.update(pc.writes)
+            regmems.update(pc.memwrites)
+        func = _stmts("def %s(_v=_v, _n=_n):\n    pass" % name)[0]
+        func.body = body
+        design.procs[key] = (name, func)
+
+    # combinatorial bodies and the signals that trigger them
+    combfuncs = []
+    for i, inst in enumerate(combs):
+        pc = _ProcCompiler(design, inst, '_p%d_' % len(funcs))
+        funcs.append(pc)
+        body = pc.body()
+        if lanes is not None:
+            body = _LaneMasker(pc).mask(body)
+        combfuncs.append((pc, body))
+
+    def commitStmts(slots, mems, readers, later):
+        stmts = []
+        for k in sorted(slots):
+            flags = ["_d%d = True" % c for c in readers.get(k, ()) if c > later]
+            if lanes is not None:
+                src = "_x = _n[%d]\nif _x is not _v[%d] and _any(_x != _v[%d]):\n" \
+                      "    _v[%d] = _x\n" % (k, k, k, k)
+            else:
+                src = "_x = _n[%d]\nif _x != _v[%d]:\n    _v[%d] = _x\n" % (k, k, k)
+            for flag in flags:
+                src += "    %s\n" % flag
+            if trace is not None:
+                src += "    _trace(%d)\n" % k
+            stmts += _stmts(src)
+        for j in sorted(mems):
+            src = "for _k in _mq%d:\n    _x = _n[_k]\n    if _x != _v[_k]:\n" % j
+            src += "        _v[_k] = _x\n        _dm%d = True\n" % j
+            if trace is not None:
+                src += "        _trace(_k)\n"
+            src += "del _mq%d[:]\n" % j
+            stmts += _stmts(src)
+        return stmts
+
+    readers = {}
+    for c, (pc, body) in enumerate(combfuncs):
+        for k in pc.reads:
+            readers.setdefault(k, []).append(c)
+    design.combreads = set(readers)
+
+    commit = _stmts("def _commit(_full, _v=_v, _n=_n):\n    pass")[0]
+    cbody = []
+    for c in range(len(combfuncs)):
+        cbody += _stmts("_d%d = _full" % c)
+    for j in range(len(design.mems)):
+        cbody += _stmts("_dm%d = _full" % j)
+    cbody += commitStmts(regs, regmems, readers, -1)
+    for c, (pc, body) in enumerate(combfuncs):
+        cond = " or ".join(["_d%d" % c] + ["_dm%d" % j for j in sorted(pc.memreads)])
+        guard = _stmts("if %s:\n    pass" % cond)[0]
+        guard.body = body + commitStmts(pc.writes, pc.memwrites, readers, c)
+        cbody.append(guard)
+    commit.body = cbody or _stmts("pass")
+
+    module = ast.parse("")
+    module.body = [f for n, f in design.procs.values()] + [commit]
+    ast.fix_missing_locations(module)
+    if hasattr(ast, 'unparse'):
+        design.source = ast.unparse(module)
+    design.cur = ns['_v'] = []
+    design.next = ns['_n'] = []
+    ns['_trace'] = trace
+    exec(compile(module, '<myhdl compiled design>', 'exec'), ns)
+    design.procs = dict((key, ns[n]) for key, (n, f) in design.procs.items())
+    design.commit = ns['_commit']
+    design.load()
+    return design
@@ -46,6 +46,7 @@ from myhdl._extractHierarchy import (_HierExtr, _isMem, _getMemInfo,
 
 from myhdl._instance import _Instantiator
 from myhdl._Signal import _Signal, _WaiterList, posedge, negedge
+from myhdl._memory import Memory
 from myhdl._enum import EnumType, EnumItemType
 from myhdl._intbv import intbv
 from myhdl._modbv import modbv
@@ -2392,7 +2393,7 @@ class _AnnotateTypesVisitor(ast.NodeVisitor, _ConversionMixin):
         node.vhd = vhd_std_logic()  # XXX default
         node.slice.value.vhd = vhd_int()
         obj = node.value.obj
-        if isinstance(obj, list):
+        if isinstance(obj, (list, Memory)):
             assert len(obj)
             node.vhd = inferVhdlObj(obj[0])
         elif isinstance(obj, _Ram):
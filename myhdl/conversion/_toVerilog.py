@@ -1533,6 +1533,8 @@ class _ConvertTaskVisitor(_ConvertVisitor):
 
 
 def _maybeNegative(obj):
+    if isinstance(obj, type):
+        return False
     if hasattr(obj, '_min') and (obj._min is not None) and (obj._min < 0):
         return True
     if isinstance(obj, integer_types) and obj < 0:
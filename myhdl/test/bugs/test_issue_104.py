@@ -1,8 +1,6 @@
 from __future__ import print_function
 import pytest
-from myhdl import Simulation, delay, SimulationError, instance, now
-from myhdl._Simulation import _error
-from helpers import raises_kind
+from myhdl import Simulation, delay, instance, now
 
 def test():
   @instance
@@ -29,12 +27,14 @@ def issue_104_multiple_instance():
     sim1.run(1000)
     # sim1 is "puased"
 
-    # try and create a second, third, forth simulation instance
+    # a second, third, forth simulation instance runs independently
     for ii in range(4):
-        with raises_kind(SimulationError, _error.MultipleSim):
-              another_sim = Simulation(test())
-    # generating more sims should have failed
+        another_sim = Simulation(test())
+        another_sim.run(500)
+        assert now() == 500
+        another_sim.quit()
     sim1.run(1000)
+    assert now() == 2000
     sim1.quit()
 
 def test_issue_104():
@@ -3,6 +3,7 @@ import sys
 import py
 import pytest
 
+import myhdl._Simulation
 from myhdl.conversion import analyze, verify
 from myhdl.conversion._verify import _simulators
 
@@ -16,21 +17,29 @@ if sys.version_info[0] > 2:
 def pytest_addoption(parser):
     parser.addoption("--sim", action="store", choices=all_sims,
                      help="HDL Simulator")
+    parser.addoption("--kernel", action="store", choices=['c', 'python'],
+                     help="Simulation kernel (default: c if available)")
 
 
 def pytest_configure(config):
     sim = config.getoption('sim')
     if sim is not None:
         verify.simulator = analyze.simulator = sim
+    if config.getoption('kernel') == 'python':
+        myhdl._Simulation._simrunc = None
+    elif config.getoption('kernel') == 'c' and myhdl._Simulation._simrunc is None:
+        raise pytest.UsageError("The C simulation kernel is not built")
 
 
 def pytest_report_header(config):
+    kernel = 'c' if myhdl._Simulation._simrunc is not None else 'python'
+    hdr = ['Simulation kernel: {kernel}']
     sim = config.getoption('sim')
     if config.getoption('sim') is not None:
-        hdr = ['Simulator: {sim}']
+        hdr += ['Simulator: {sim}']
         if not py.path.local.sysfind(sim):
             hdr += ['Warning: {sim} not found in PATH']
-        return '\n'.join(hdr).format(sim=sim)
+    return '\n'.join(hdr).format(sim=sim, kernel=kernel)
 
 
 def bug(issue_no, hdl='all'):
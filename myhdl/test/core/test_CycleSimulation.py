@@ -0,0 +1,574 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run unit tests for CycleSimulation """
+from __future__ import absolute_import
+
+import random
+
+import pytest
+
+from myhdl import (Signal, ResetSignal, Simulation, CycleSimulation,
+                   SimulationError, StopSimulation, ConversionError, block,
+                   instance, always, always_comb, always_seq, delay, intbv,
+                   modbv, now, concat, enum)
+from myhdl._CycleSimulation import _error
+from myhdl.conversion._toPython import numpy
+from helpers import raises_kind
+
+random.seed(1)  # random, but deterministic
+
+
+@block
+def counter(count, double, enable, clock, reset):
+
+    cnt = Signal(modbv(0)[8:])
+
+    @always_seq(clock.posedge, reset=reset)
+    def seq():
+        if enable:
+            cnt.next = cnt + 1
+
+    @always_comb
+    def copy():
+        count.next = cnt
+
+    @always_comb
+    def dbl():
+        double.next = (count * 2) % 256
+
+    return seq, copy, dbl
+
+
+@block
+def counter_tb(count, double, enable, clock, reset):
+
+    dut = counter(count, double, enable, clock, reset)
+
+    @instance
+    def clkgen():
+        while True:
+            yield delay(5)
+            clock.next = not clock
+
+    return dut, clkgen
+
+
+def signals():
+    count = Signal(intbv(0)[8:])
+    double = Signal(intbv(0)[8:])
+    enable = Signal(bool(1))
+    clock = Signal(bool(0))
+    reset = ResetSignal(0, active=1, isasync=True)
+    return count, double, enable, clock, reset
+
+
+class TestCycleSimulation:
+
+    def testCount(self):
+        count, double, enable, clock, reset = signals()
+        sim = CycleSimulation(counter(count, double, enable, clock, reset))
+        sim.run(1000, quiet=1)
+        assert now() == 1000
+        assert count == 100
+        assert double == 200
+        sim.quit()
+
+    def testStimulus(self):
+        count, double, enable, clock, reset = signals()
+        sim = CycleSimulation(counter(count, double, enable, clock, reset))
+        sim.run(100, quiet=1)
+        assert count == 10
+        enable.next = 0
+        sim.run(100, quiet=1)
+        assert count == 10
+        enable.next = 1
+        sim.run(100, quiet=1)
+        assert count == 20
+        # asynchronous reset acts before the next clock edge
+        reset.next = 1
+        sim.run(1, quiet=1)
+        assert count == 0
+        reset.next = 0
+        sim.run(100, quiet=1)
+        assert count == 10
+        sim.quit()
+
+    def testCompareEvent(self):
+        """ Same values as the event-driven simulator at each edge """
+        count, double, enable, clock, reset = signals()
+        sim = Simulation(counter_tb(count, double, enable, clock, reset))
+        expected = []
+        for i in range(50):
+            sim.run(10, quiet=1)
+            expected.append((now(), int(count), int(double)))
+        sim.quit()
+
+        count, double, enable, clock, reset = signals()
+        sim = CycleSimulation(counter(count, double, enable, clock, reset))
+        actual = []
+        for i in range(50):
+            sim.run(10, quiet=1)
+            actual.append((now(), int(count), int(double)))
+        sim.quit()
+        assert actual == expected
+
+    def testPeriods(self):
+        count, double, enable, clock, reset = signals()
+        sim = CycleSimulation(counter(count, double, enable, clock, reset),
+                              period=[(clock, 4)])
+        sim.run(400, quiet=1)
+        assert count == 100
+        sim.quit()
+
+    def testRunSim(self):
+        count, double, enable, clock, reset = signals()
+        inst = counter(count, double, enable, clock, reset)
+        inst.run_sim(1000, quiet=1, engine='cycle')
+        assert count == 100
+        inst.quit_sim()
+
+    def testStopSimulation(self):
+
+        @block
+        def stopper(clock):
+            n = Signal(intbv(0)[8:])
+
+            @always(clock.posedge)
+            def logic():
+                n.next = n + 1
+                if n == 10:
+                    raise StopSimulation()
+
+            return logic
+
+        clock = Signal(bool(0))
+        sim = CycleSimulation(stopper(clock))
+        assert sim.run(1000, quiet=1) == 0
+        assert now() == 105
+
+
+t_state = enum('IDLE', 'LOAD', 'RUN')
+
+
+@block
+def mixed(dout, peek, flag, din, sel, clock, reset):
+
+    mem = [Signal(intbv(0)[8:]) for i in range(4)]
+    acc = Signal(modbv(0)[12:])
+    state = Signal(t_state.IDLE)
+    low = Signal(intbv(0)[4:])
+    sgn = Signal(intbv(0, min=-8, max=8))
+    ptr = Signal(intbv(0)[2:])
+    count = intbv(0)[4:]
+
+    @always_seq(clock.posedge, reset=reset)
+    def seq():
+        mem[ptr].next = din
+        ptr.next = (ptr + 1) % len(mem)
+        acc.next = acc + mem[sel] * 7
+        if state == t_state.IDLE:
+            state.next = t_state.LOAD
+        elif state == t_state.LOAD:
+            state.next = t_state.RUN
+        elif din[0]:
+            state.next = t_state.IDLE
+        count[:] = (count + 1) % 16
+        flag.next = count[3] and state == t_state.RUN
+        sgn.next = din[4:].signed()
+        low.next[3:1] = din[2:0]
+        low.next[0] = din[7]
+
+    @always_comb
+    def pack():
+        dout.next = concat(acc[10:4], low, sgn[3:0], flag)
+
+    @always_comb
+    def read():
+        peek.next = mem[sel] ^ din
+
+    return seq, pack, read
+
+
+def mixedSignals():
+    dout = Signal(intbv(0)[14:])
+    peek = Signal(intbv(0)[8:])
+    flag = Signal(bool(0))
+    din = Signal(intbv(0)[8:])
+    sel = Signal(intbv(0)[2:])
+    clock = Signal(bool(0))
+    reset = ResetSignal(0, active=1, isasync=False)
+    return dout, peek, flag, din, sel, clock, reset
+
+
+def mixedTrace(compiled, stimulus):
+    dout, peek, flag, din, sel, clock, reset = mixedSignals()
+    sim = CycleSimulation(mixed(dout, peek, flag, din, sel, clock, reset),
+                          compiled=compiled)
+    trace = []
+    for i, (d, s, r) in enumerate(stimulus):
+        din.next = d
+        sel.next = s
+        reset.next = r
+        sim.run(10, quiet=1)
+        trace.append((int(dout), int(peek), bool(flag)))
+    sim.quit()
+    return trace
+
+
+@block
+def packer(dout, din, flag, clock):
+    """ concat with bit and bool arguments after the first one """
+
+    @always(clock.posedge)
+    def pack():
+        dout.next = concat(din[4:1], din[0], bool(flag), din[7], flag)
+
+    return pack
+
+
+def packerTrace(engine, stimulus):
+    dout, din = Signal(intbv(0)[7:]), Signal(intbv(0)[8:])
+    flag, clock = Signal(bool(0)), Signal(bool(0))
+    inst = packer(dout, din, flag, clock)
+    if engine == 'event':
+
+        @instance
+        def clkgen():
+            while 1:
+                yield delay(5)
+                clock.next = not clock
+
+        sim = Simulation(inst, clkgen)
+    else:
+        sim = CycleSimulation(inst, compiled=True)
+    trace = []
+    for d, f in stimulus:
+        din.next = d
+        flag.next = f
+        sim.run(10, quiet=1)
+        trace.append(int(dout))
+    sim.quit()
+    return trace
+
+
+class TestCompiledSimulation:
+
+    def testCount(self):
+        count, double, enable, clock, reset = signals()
+        sim = CycleSimulation(counter(count, double, enable, clock, reset),
+                              compiled=True)
+        sim.run(1000, quiet=1)
+        assert now() == 1000
+        assert count == 100
+        assert double == 200
+        sim.quit()
+
+    def testStimulus(self):
+        count, double, enable, clock, reset = signals()
+        sim = CycleSimulation(counter(count, double, enable, clock, reset),
+                              compiled=True)
+        sim.run(100, quiet=1)
+        assert count == 10
+        enable.next = 0
+        sim.run(100, quiet=1)
+        assert count == 10
+        enable.next = 1
+        sim.run(100, quiet=1)
+        assert count == 20
+        reset.next = 1
+        sim.run(1, quiet=1)
+        assert count == 0
+        reset.next = 0
+        sim.run(100, quiet=1)
+        assert count == 10
+        sim.quit()
+
+    def testCompareCycle(self):
+        """ Same values as the interpreted processes at each edge """
+        stimulus = [(random.randrange(256), random.randrange(4),
+                     int(random.random() < 0.05)) for i in range(300)]
+        assert mixedTrace(True, stimulus) == mixedTrace(False, stimulus)
+
+    def testConcatBits(self):
+        stimulus = [(random.randrange(256), random.randrange(2))
+                    for i in range(50)]
+        assert packerTrace('compiled', stimulus) == \
+            packerTrace('event', stimulus)
+
+    def testConcatWidth(self):
+
+        @block
+        def unknown(dout, clock):
+
+            @always(clock.posedge)
+            def logic():
+                n = 3
+                dout.next = concat(dout[4:], n)
+
+            return logic
+
+        with raises_kind(ConversionError, "Not supported"):
+            CycleSimulation(unknown(Signal(intbv(0)[8:]), Signal(bool(0))),
+                            compiled=True)
+
+    def testRunSim(self):
+        count, double, enable, clock, reset = signals()
+        inst = counter(count, double, enable, clock, reset)
+        inst.run_sim(1000, quiet=1, engine='compiled')
+        assert count == 100
+        inst.quit_sim()
+
+    def testBounds(self):
+
+        @block
+        def overflow(clock):
+            n = Signal(intbv(0, min=0, max=5))
+
+            @always(clock.posedge)
+            def logic():
+                n.next = n + 1
+
+            return logic
+
+        clock = Signal(bool(0))
+        sim = CycleSimulation(overflow(clock), compiled=True)
+        try:
+            sim.run(100, quiet=1)
+        except ValueError as e:
+            assert str(e) == "intbv value 5 >= maximum 5"
+        else:
+            assert False
+        assert now() == 45
+
+    def testSignalArgument(self):
+
+        def double(sig):
+            return sig * 2
+
+        @block
+        def user(dout, clock):
+
+            @always(clock.posedge)
+            def logic():
+                dout.next = double(dout)
+
+            return logic
+
+        with raises_kind(ConversionError, "Not supported"):
+            CycleSimulation(user(Signal(intbv(0)[8:]), Signal(bool(0))),
+                            compiled=True)
+
+
+@block
+def branchy(dout, level, flag, din, mode, clock, reset):
+
+    acc = Signal(modbv(0)[12:])
+    state = Signal(t_state.IDLE)
+    low = Signal(intbv(0)[4:])
+    sgn = Signal(intbv(0, min=-8, max=8))
+
+    @always_seq(clock.posedge, reset=reset)
+    def seq():
+        if state == t_state.IDLE:
+            if din[0] and not mode:
+                state.next = t_state.LOAD
+        elif state == t_state.LOAD:
+            state.next = t_state.RUN
+            acc.next = din
+        else:
+            t = acc
+            for i in range(3):
+                if acc[i]:
+                    t = t + din
+                else:
+                    t = t - i
+            acc.next = t
+            if mode == 3 or din > 200:
+                state.next = t_state.IDLE
+        sgn.next = din[4:].signed()
+        low.next[3:1] = din[2:0]
+        low.next[0] = din[7]
+        level.next = max(min(din, 100), 20) if mode else 0
+
+    @always_comb
+    def run():
+        flag.next = state == t_state.RUN and (acc[0] or sgn < 0)
+
+    @always_comb
+    def pack():
+        dout.next = concat(acc[10:4], low, sgn[3:0], flag)
+
+    return seq, run, pack
+
+
+def branchySignals():
+    dout = Signal(intbv(0)[14:])
+    level = Signal(intbv(0, min=0, max=101))
+    flag = Signal(bool(0))
+    din = Signal(intbv(0)[8:])
+    mode = Signal(intbv(0)[2:])
+    clock = Signal(bool(0))
+    reset = ResetSignal(0, active=1, isasync=False)
+    return dout, level, flag, din, mode, clock, reset
+
+
+@pytest.mark.skipif(numpy is None, reason="requires NumPy")
+class TestLanes:
+
+    def testCompareCompiled(self):
+        """ Each lane has the values of a separate compiled simulation """
+        lanes = 5
+        stimulus = [[(random.randrange(256), random.randrange(4),
+                      int(random.random() < 0.02)) for i in range(lanes)]
+                    for j in range(200)]
+        expected = []
+        for lane in range(lanes):
+            dout, level, flag, din, mode, clock, reset = branchySignals()
+            sim = CycleSimulation(branchy(dout, level, flag, din, mode,
+                                          clock, reset), compiled=True)
+            trace = []
+            for step in stimulus:
+                d, m, r = step[lane]
+                din.next = d
+                mode.next = m
+                sim.run(10, quiet=1)
+                trace.append((int(dout), int(level), bool(flag)))
+            sim.quit()
+            expected.append(trace)
+
+        dout, level, flag, din, mode, clock, reset = branchySignals()
+        sim = CycleSimulation(branchy(dout, level, flag, din, mode,
+                                      clock, reset), lanes=lanes)
+        traces = [[] for lane in range(lanes)]
+        for step in stimulus:
+            sim.drive(din, [d for d, m, r in step])
+            sim.drive(mode, [m for d, m, r in step])
+            sim.run(10, quiet=1)
+            values = zip(sim.values(dout), sim.values(level), sim.values(flag))
+            for trace, (d, l, f) in zip(traces, values):
+                trace.append((int(d), int(l), bool(f)))
+        sim.quit()
+        assert traces == expected
+
+    def testConcatBits(self):
+        lanes = 3
+        stimulus = [[(random.randrange(256), random.randrange(2))
+                     for i in range(lanes)] for j in range(50)]
+        expected = [packerTrace('compiled', [step[lane] for step in stimulus])
+                    for lane in range(lanes)]
+        dout, din = Signal(intbv(0)[7:]), Signal(intbv(0)[8:])
+        flag, clock = Signal(bool(0)), Signal(bool(0))
+        sim = CycleSimulation(packer(dout, din, flag, clock), lanes=lanes)
+        traces = [[] for lane in range(lanes)]
+        for step in stimulus:
+            sim.drive(din, [d for d, f in step])
+            sim.drive(flag, [f for d, f in step])
+            sim.run(10, quiet=1)
+            for trace, d in zip(traces, sim.values(dout)):
+                trace.append(int(d))
+        sim.quit()
+        assert traces == expected
+
+    def testUniformStimulus(self):
+        count, double, enable, clock, reset = signals()
+        sim = CycleSimulation(counter(count, double, enable, clock, reset),
+                              lanes=3)
+        sim.drive(enable, [1, 0, 1])
+        sim.run(100, quiet=1)
+        assert list(sim.values(count)) == [10, 0, 10]
+        # a signal assignment applies to all lanes
+        enable.next = 1
+        sim.run(100, quiet=1)
+        assert list(sim.values(count)) == [20, 10, 20]
+        reset.next = 1
+        sim.run(1, quiet=1)
+        assert list(sim.values(double)) == [0, 0, 0]
+        sim.quit()
+
+    def testBounds(self):
+
+        @block
+        def overflow(limit, clock):
+            n = Signal(intbv(0, min=0, max=5))
+
+            @always(clock.posedge)
+            def logic():
+                if n < limit:
+                    n.next = n + 1
+
+            return logic
+
+        limit, clock = Signal(intbv(0)[4:]), Signal(bool(0))
+        sim = CycleSimulation(overflow(limit, clock), lanes=4)
+        sim.drive(limit, [3, 5, 9, 4])
+        with pytest.raises(ValueError) as e:
+            sim.run(100, quiet=1)
+        assert str(e.value) == "intbv value 5 >= maximum 5 in lane 1"
+        assert now() == 45
+
+    def testDriveErrors(self):
+        count, double, enable, clock, reset = signals()
+        sim = CycleSimulation(counter(count, double, enable, clock, reset),
+                              lanes=2)
+        with raises_kind(SimulationError, _error.LaneEdge):
+            sim.drive(clock, [0, 1])
+        with raises_kind(SimulationError, _error.LaneSig):
+            sim.drive(Signal(bool(0)), [0, 1])
+        with pytest.raises(ValueError):
+            sim.drive(enable, [0, 2])
+        sim.quit()
+
+    def testNotSupported(self):
+        dout, peek, flag, din, sel, clock, reset = mixedSignals()
+        with raises_kind(ConversionError, "Not supported"):
+            CycleSimulation(mixed(dout, peek, flag, din, sel, clock, reset),
+                            lanes=2)
+
+
+class TestCycleSimulationErrors:
+
+    def testArgType(self):
+        with raises_kind(SimulationError, _error.ArgType):
+            CycleSimulation(None)
+
+    def testProcType(self):
+        count, double, enable, clock, reset = signals()
+        with raises_kind(SimulationError, _error.ProcType % 'clkgen'):
+            CycleSimulation(counter_tb(count, double, enable, clock, reset))
+
+    def testDuration(self):
+        count, double, enable, clock, reset = signals()
+        sim = CycleSimulation(counter(count, double, enable, clock, reset))
+        with raises_kind(SimulationError, _error.Duration):
+            sim.run()
+        sim.quit()
+
+    def testUntil(self):
+        count, double, enable, clock, reset = signals()
+        sim = CycleSimulation(counter(count, double, enable, clock, reset))
+        sim.run(until=500, quiet=1)
+        assert count == 50
+        sim.run(1000, max_time=600, quiet=1)
+        assert now() == 600
+        for until in (clock.posedge, count, lambda: count == 70):
+            with raises_kind(SimulationError, _error.Until):
+                sim.run(100, until=until)
+        assert now() == 600
+        sim.quit()
@@ -24,13 +24,13 @@ import copy
 import operator
 import random
 import sys
+from collections import namedtuple
 from random import randrange
 
 import pytest
 
-from myhdl import Signal, intbv
+from myhdl import Signal, immutable, intbv, modbv
 from myhdl._compat import long
-from myhdl._simulator import _siglist
 
 random.seed(1)  # random, but deterministic
 maxint = sys.maxsize
@@ -150,15 +150,17 @@ class TestSig:
         s1.next = 0
         s1._update()
         s1.next = 1
-        s1._eventWaiters = self.eventWaiters[:]
-        s1._posedgeWaiters = self.posedgeWaiters[:]
-        s1._negedgeWaiters = self.negedgeWaiters[:]
+        s1._eventWaiters[:] = self.eventWaiters
+        s1._posedgeWaiters[:] = self.posedgeWaiters
+        s1._negedgeWaiters[:] = self.negedgeWaiters
         waiters = s1._update()
         expected = self.eventWaiters + self.posedgeWaiters
         assert set(waiters) == set(expected)
         assert s1._eventWaiters == []
         assert s1._posedgeWaiters == []
         assert s1._negedgeWaiters == self.negedgeWaiters
+        assert s1._posedgeWaiters.fired == 1
+        assert s1._negedgeWaiters.fired == 0
 
     def testUpdateNegedge(self):
         """ update on negedge should return event and negedge waiters """
@@ -166,9 +168,9 @@ class TestSig:
         s1.next = 1
         s1._update()
         s1.next = 0
-        s1._eventWaiters = self.eventWaiters[:]
-        s1._posedgeWaiters = self.posedgeWaiters[:]
-        s1._negedgeWaiters = self.negedgeWaiters[:]
+        s1._eventWaiters[:] = self.eventWaiters
+        s1._posedgeWaiters[:] = self.posedgeWaiters
+        s1._negedgeWaiters[:] = self.negedgeWaiters
         waiters = s1._update()
         expected = self.eventWaiters + self.negedgeWaiters
         assert set(waiters) == set(expected)
@@ -182,9 +184,9 @@ class TestSig:
         s1.next = 4
         s1._update()
         s1.next = 5
-        s1._eventWaiters = self.eventWaiters[:]
-        s1._posedgeWaiters = self.posedgeWaiters[:]
-        s1._negedgeWaiters = self.negedgeWaiters[:]
+        s1._eventWaiters[:] = self.eventWaiters
+        s1._posedgeWaiters[:] = self.posedgeWaiters
+        s1._negedgeWaiters[:] = self.negedgeWaiters
         waiters = s1._update()
         expected = self.eventWaiters
         assert set(waiters) == set(expected)
@@ -198,29 +200,53 @@ class TestSig:
         s1.next = 4
         s1._update()
         s1.next = 4
-        s1._eventWaiters = self.eventWaiters[:]
-        s1._posedgeWaiters = self.posedgeWaiters[:]
-        s1._negedgeWaiters = self.negedgeWaiters[:]
+        s1._eventWaiters[:] = self.eventWaiters
+        s1._posedgeWaiters[:] = self.posedgeWaiters
+        s1._negedgeWaiters[:] = self.negedgeWaiters
         waiters = s1._update()
         assert waiters == []
         assert s1._eventWaiters == self.eventWaiters
         assert s1._posedgeWaiters == self.posedgeWaiters
         assert s1._negedgeWaiters == self.negedgeWaiters
 
+    def testLazyWaiters(self):
+        """ waiter and slice lists should only be allocated when used """
+        s1 = Signal(intbv(0)[8:])
+        assert s1._waiterFlags == 0
+        assert s1._slicesigs == ()
+        s1.next = 1
+        assert s1._update() == []
+        assert s1._waiterFlags == 0
+        s1.posedge.append(self.posedgeWaiters[0])
+        s1.next = 0
+        assert s1._update() == []
+        s1.next = 1
+        assert s1._update() == self.posedgeWaiters[:1]
+        assert s1._posedgeWaiters.fired == 1
+        sl = s1(4, 0)
+        assert s1._slicesigs == [sl]
+        s1._clear()
+        assert s1._posedgeWaiters.fired == 2
+
     def testNextAccess(self):
-        """ each next attribute access puts a sig in a global siglist """
-        del _siglist[:]
+        """ a next attribute access puts a sig once in its siglist """
         s = [None] * 4
         for i in range(len(s)):
             s[i] = Signal(i)
+        _siglist = s[0]._sim.siglist
+        del _siglist[:]
         s[1].next  # read access
         s[2].next = 1
         s[2].next
         s[3].next = 0
         s[3].next = 1
         s[3].next = 3
+        assert len(_siglist) == 3
         for i in range(len(s)):
-            assert _siglist.count(s[i]) == i
+            assert len([e for e in _siglist if e is s[i]]) == min(i, 1)
+        for e in _siglist:
+            e._queued = False
+        del _siglist[:]
 
 
 class TestSignalAsNum:
@@ -580,3 +606,87 @@ class TestSignalIntbvBounds:
         for v in (-1, 2**8, -10, 1000):
             with pytest.raises(ValueError):
                 s.next[:] = v
+
+    def testNextBounds(self):
+        for lo, hi in ((0, 256), (-24, 34), (-128, 128), (None, 8)):
+            s = Signal(intbv(0, min=lo, max=hi))
+            for v in (-129, -25, -24, -1, 0, 7, 8, 33, 34, 255, 256):
+                if (lo is not None and v < lo) or v >= hi:
+                    with pytest.raises(ValueError):
+                        s.next = v
+                else:
+                    s.next = intbv(v)
+                    assert s.next == v
+        s = Signal(intbv(0)[8:])
+        for v in (1.0, "1", None):
+            with pytest.raises(TypeError):
+                s.next = v
+
+
+class TestSignalModbvWrap:
+
+    def testWrap(self):
+        # full range unsigned and signed, and other ranges
+        for lo, hi in ((0, 256), (0, 1), (-128, 128), (-24, 34), (3, 17)):
+            s = Signal(modbv(lo, min=lo, max=hi))
+            for v in list(range(-300, 300, 7)) + [2**70 + 5, -2**70 - 3]:
+                s.next = v
+                assert s.next == modbv(v, min=lo, max=hi)
+                s.next = intbv(v)
+                assert s.next == modbv(v, min=lo, max=hi)
+            s.next = True
+            assert s.next == modbv(1, min=lo, max=hi)
+            with pytest.raises(TypeError):
+                s.next = 1.5
+
+
+@immutable
+class _Packet(namedtuple('_Packet', 'addr data')):
+    pass
+
+
+class _Fixed(object):
+
+    def __init__(self, val):
+        self.val = val
+        self.frozen = False
+
+    def __myhdl_freeze__(self):
+        self.frozen = True
+        return self
+
+
+class TestSignalImmutable:
+
+    def testReference(self):
+        """ immutable values should propagate without copies """
+        for init, val in ((_Packet(0, 0), _Packet(1, 2)), (0.0, 1.5),
+                          ("a", "b")):
+            s = Signal(init)
+            assert s.val is init
+            s.next = val
+            s._update()
+            assert s.val is val and s.next is val
+            s._clear()
+            assert s.val is init and s.next is init
+
+    def testFreeze(self):
+        """ values with a freeze hook should be frozen on assignment """
+        init, val = _Fixed(0), _Fixed(1)
+        s = Signal(init)
+        assert init.frozen and s.val is init
+        s.next = val
+        assert val.frozen
+        s._update()
+        assert s.val is val
+        with pytest.raises(TypeError):
+            s.next = 1
+
+    def testMutable(self):
+        """ other values should still be copied """
+        val = [1, 2]
+        s = Signal([0, 0])
+        s.next = val
+        s._update()
+        assert s.val == val and s.val is not val
+        assert s.val is not s.next
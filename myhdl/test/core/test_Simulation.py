@@ -20,13 +20,25 @@
 """ Run unit tests for Simulation """
 from __future__ import absolute_import
 
+import gc
+import os
 import random
+import threading
+import weakref
+from heapq import heappop
+from operator import itemgetter
 from random import randrange
 from unittest import TestCase
 
+import pytest
+
 from myhdl import (Signal, Simulation, SimulationError, StopSimulation, delay,
                    intbv, join, now)
+import myhdl._Simulation
 from myhdl._Simulation import _error
+from myhdl._checkpoint import _error as _checkpointError
+from myhdl._simulator import _SimState
+from myhdl._simulator import _error as _simulatorError
 from helpers import raises_kind
 
 random.seed(1)  # random, but deterministic
@@ -336,6 +348,433 @@ class YieldZeroDelay(TestCase):
         Simulation(self.bench()).run(quiet=QUIET)
 
 
+class YieldTuple(TestCase):
+
+    """ Check waiters on several signals and edges """
+
+    def bench(self, log, timeout):
+        a, b, c, d = [Signal(0) for i in range(4)]
+        e = Signal(bool(0))
+        # a timeout that never expires selects the general waiter path
+        extra = (delay(1000),) if timeout else ()
+
+        def stimulus():
+            for i in range(1, 50):
+                yield delay(10)
+                a.next = i // 2
+                if i % 3:
+                    b.next = i
+                if i % 5 == 0:
+                    c.next = i
+                d.next = i
+                e.next = not e
+            raise StopSimulation()
+
+        def waiter():
+            while 1:
+                yield (a, b) + extra
+                log.append(('ab', now()))
+                yield (c, e.posedge) + extra
+                log.append(('ce', now()))
+                # same clause tuple several times in a row
+                for i in range(3):
+                    yield (d, a, d) + extra
+                    log.append(('ad', now()))
+
+        return stimulus(), waiter(), (a, b, c, d, e)
+
+    def testOncePerDelta(self):
+        logs = []
+        for timeout in (False, True):
+            log = []
+            stimulus, waiter, sigs = self.bench(log, timeout)
+            Simulation(stimulus, waiter).run(quiet=QUIET)
+            logs.append(log)
+        assert len(logs[0]) > 40
+        assert logs[0] == logs[1]
+
+    def testNoStaleEntries(self):
+        log = []
+        stimulus, waiter, sigs = self.bench(log, False)
+        Simulation(stimulus, waiter).run(quiet=QUIET)
+        for s in sigs:
+            waiters = s._eventWaiters + s._posedgeWaiters + s._negedgeWaiters
+            assert len(waiters) <= 2
+
+    def testOtherClause(self):
+        # both lists fire in the same delta cycle, and the waiter then
+        # waits on something else than a tuple of lists
+        def bench(log, other):
+            a, b, c = [Signal(0) for i in range(3)]
+
+            def stimulus():
+                yield delay(10)
+                a.next = 1
+                b.next = 1
+                yield delay(10)
+                c.next = 1
+                yield delay(10)
+                raise StopSimulation()
+
+            def waiter():
+                yield a, b
+                log.append(('ab', now()))
+                yield other(c)
+                log.append(('c', now()))
+
+            return stimulus(), waiter()
+
+        others = [lambda c: c, lambda c: delay(10), lambda c: (c,),
+                  lambda c: (c, delay(100)), lambda c: join(c, delay(10))]
+        for other in others:
+            log = []
+            Simulation(*bench(log, other)).run(quiet=QUIET)
+            assert log == [('ab', 10), ('c', 20)]
+
+
+class FutureEvents(TestCase):
+
+    """ Check ordering of many pending timed events """
+
+    def bench(self, n):
+        log = []
+
+        def sleeper(i, waits):
+            t = 0
+            for w in waits:
+                yield delay(w)
+                t += w
+                assert now() == t
+                log.append((t, i))
+
+        gens = []
+        for i in range(n):
+            waits = [randrange(0, 50) for j in range(randrange(1, 5))]
+            gens.append(sleeper(i, waits))
+        return gens, log
+
+    def testTimeOrder(self):
+        gens, log = self.bench(500)
+        Simulation(gens).run(quiet=QUIET)
+        times = [t for t, i in log]
+        assert times == sorted(times)
+
+    def testSameTimeOrder(self):
+        """ Events scheduled for the same time come out in FIFO order """
+        state = _SimState()
+        events = [(randrange(0, 10), i) for i in range(1000)]
+        for t, e in events:
+            state.schedule(t, e)
+        popped = []
+        while state.futureEvents:
+            t, _, e = heappop(state.futureEvents)
+            popped.append((t, e))
+        assert popped == sorted(events, key=itemgetter(0))
+
+
+@pytest.mark.skipif(myhdl._Simulation._simrunc is None,
+                    reason="C simulation kernel not built")
+class Kernels(TestCase):
+
+    """ The C and the pure Python kernel give the same results """
+
+    def bench(self, log):
+        random.seed(2)
+        a, b = Signal(0), Signal(0)
+
+        def driver(i):
+            for j in range(20):
+                yield delay(randrange(1, 20))
+                a.next = a + i
+
+        def follower():
+            while 1:
+                yield a, delay(15)
+                b.next = a % 5
+                log.append((now(), int(a), int(b)))
+                if now() > 500:
+                    raise StopSimulation()
+
+        def watcher():
+            while 1:
+                yield b.posedge, join(delay(3), a)
+                log.append((now(), 'w'))
+
+        return [driver(i) for i in range(5)], follower(), watcher()
+
+    def simulate(self, kernel):
+        simrunc = myhdl._Simulation._simrunc
+        myhdl._Simulation._simrunc = kernel
+        try:
+            log = []
+            sim = Simulation(self.bench(log))
+            while sim.run(37, quiet=QUIET):
+                log.append(now())
+            return log
+        finally:
+            myhdl._Simulation._simrunc = simrunc
+
+    def testSameLog(self):
+        log = self.simulate(myhdl._Simulation._simrunc)
+        assert len(log) > 100
+        assert log == self.simulate(None)
+
+
+class RunUntil(TestCase):
+
+    """ Run until a condition, and continue """
+
+    def bench(self):
+        clk, count = Signal(bool(0)), Signal(0)
+
+        def clkgen():
+            while 1:
+                yield delay(5)
+                clk.next = not clk
+
+        def counter():
+            while 1:
+                yield clk.posedge
+                count.next = count + 1
+
+        return clk, count, Simulation(clkgen(), counter())
+
+    def testEdge(self):
+        clk, count, sim = self.bench()
+        times = []
+        for i in range(3):
+            assert sim.run(until=clk.posedge, quiet=QUIET) == 1
+            times.append(now())
+        assert times == [5, 15, 25]
+        # the counter has seen the edge in the same timestep
+        assert count == 3
+        sim.run(until=count, quiet=QUIET)
+        assert now() == 35
+
+    def testPredicate(self):
+        clk, count, sim = self.bench()
+        sim.run(until=lambda: count == 4, quiet=QUIET)
+        assert now() == 35
+        # still true at the negative edge: a timestep later
+        sim.run(until=lambda: count == 4, quiet=QUIET)
+        assert now() == 40
+        sim.run(until=lambda: count % 2 == 0, quiet=QUIET)
+        assert now() == 55
+
+    def testTime(self):
+        clk, count, sim = self.bench()
+        sim.run(until=42, quiet=QUIET)
+        assert now() == 42
+        sim.run(100, until=70, quiet=QUIET)
+        assert now() == 70
+        # a time in the past suspends right away
+        sim.run(until=10, quiet=QUIET)
+        assert now() == 70
+
+    def testMaxTime(self):
+        clk, count, sim = self.bench()
+        sim.run(until=lambda: count == 100, max_time=50, quiet=QUIET)
+        assert now() == 50
+        assert count == 5
+        # the condition of an earlier run is gone
+        sim.run(until=clk.negedge, max_time=52, quiet=QUIET)
+        sim.run(until=clk.posedge, quiet=QUIET)
+        assert now() == 55
+        sim.run(until=70, quiet=QUIET)
+        assert now() == 70
+
+    def testStaleWaiters(self):
+        clk, count, sim = self.bench()
+        flag = Signal(bool(0))
+        for i in range(100):
+            sim.run(until=flag.posedge, max_time=now() + 1, quiet=QUIET)
+        assert now() == 100
+        # runs that ended at max_time left no waiters behind
+        assert len(flag._posedgeWaiters) == 0
+        sim.run(until=clk.posedge, quiet=QUIET)
+        assert len(clk._posedgeWaiters) == 1
+
+    def testFinish(self):
+        a = Signal(0)
+
+        def stimulus():
+            yield delay(10)
+            a.next = 1
+            yield delay(10)
+
+        sim = Simulation(stimulus())
+        assert sim.run(until=a, quiet=QUIET) == 1
+        assert sim.run(until=a, quiet=QUIET) == 0
+
+    def testUntilType(self):
+        clk, count, sim = self.bench()
+        with pytest.raises(TypeError, match=_error.UntilType):
+            sim.run(until=delay(10))
+
+
+class Isolation(TestCase):
+
+    """ Simulations that don't share signals don't interfere """
+
+    def bench(self, step, log):
+        count = Signal(0)
+
+        def counter():
+            while 1:
+                yield delay(step)
+                count.next = count + 1
+
+        def monitor():
+            while 1:
+                yield count
+                log.append((now(), int(count)))
+
+        return counter(), monitor()
+
+    def testInterleaved(self):
+        log1, log2 = [], []
+        sim1 = Simulation(self.bench(3, log1))
+        sim2 = Simulation(self.bench(7, log2))
+        for i in range(10):
+            sim1.run(10, quiet=QUIET)
+            assert now() == 10 * (i + 1)
+            sim2.run(20, quiet=QUIET)
+            assert now() == 20 * (i + 1)
+        sim1.quit()
+        sim2.quit()
+        assert log1 == [(3 * i, i) for i in range(1, 34)]
+        assert log2 == [(7 * i, i) for i in range(1, 29)]
+
+    def testThreads(self):
+        logs = [[] for i in range(4)]
+
+        def simulate(i):
+            sim = Simulation(self.bench(i + 2, logs[i]))
+            sim.run(200, quiet=QUIET)
+            sim.quit()
+
+        threads = [threading.Thread(target=simulate, args=(i,))
+                   for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for i, log in enumerate(logs):
+            step = i + 2
+            assert log == [(step * j, j) for j in range(1, 200 // step + 1)]
+
+    def testReclaim(self):
+        """ The signals of a simulation can be garbage collected """
+        sig = Signal(0)
+        ref = weakref.ref(sig)
+
+        def gen():
+            yield delay(10)
+            sig.next = 1
+
+        Simulation(gen()).run(quiet=QUIET)
+        del sig, gen
+        gc.collect()
+        assert ref() is None
+
+    def testShared(self):
+        """ A signal of an unfinished simulation can't be driven by another """
+        a = Signal(0)
+        sim1 = Simulation(self.bench(3, []))
+        sim1.run(10, quiet=QUIET)
+
+        def gen():
+            while 1:
+                yield delay(10)
+                a.next = a + 1
+
+        sim2 = Simulation(gen())
+        with raises_kind(SimulationError, _simulatorError.OtherSim):
+            sim2.run(50, quiet=QUIET)
+        sim2.quit()
+        sim1.quit()
+
+    def testLateSignal(self):
+        """ A signal created after the simulation joins it when driven """
+        log = []
+        sigs = []
+
+        def gen():
+            while 1:
+                yield delay(10)
+                sigs[0].next = sigs[0] + 1
+                log.append(int(sigs[0]))
+
+        sim = Simulation(gen())
+        sigs.append(Signal(0))
+        sim.run(50, quiet=QUIET)
+        sim.quit()
+        assert log == [0, 1, 2, 3, 4]
+
+
+def scenario(sim):
+    """ Run a branch for some time and report the counter """
+    sim.run(Shared.duration, quiet=QUIET)
+    return now(), int(Shared.count)
+
+
+def failing(sim):
+    sim.run(10, quiet=QUIET)
+    raise ValueError(now())
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires os.fork")
+class Branches(TestCase):
+
+    """ Scenarios branch off from a warm simulation """
+
+    def setUp(self):
+        Shared.count = count = Signal(0)
+
+        def counter():
+            while 1:
+                yield delay(10)
+                count.next = count + 1
+
+        self.sim = Simulation(counter())
+        self.sim.run(100, quiet=QUIET)
+
+    def tearDown(self):
+        self.sim.quit()
+
+    def testBranch(self):
+        branches = []
+        for d in (15, 25, 35):
+            Shared.duration = d
+            branches.append(self.sim.branch(scenario))
+        # the simulation continues independently
+        self.sim.run(50, quiet=QUIET)
+        assert now() == 150
+        assert Shared.count == 15
+        assert [b.result() for b in branches] == [(115, 11), (125, 12), (135, 13)]
+
+    def testCheckpoint(self):
+        Shared.duration = 45
+        with self.sim.checkpoint() as cp:
+            assert cp.time == 100
+            self.sim.run(300, quiet=QUIET)
+            branches = [cp.branch(scenario) for i in range(3)]
+            assert [b.result() for b in branches] == [(145, 14)] * 3
+        assert now() == 400
+
+    def testException(self):
+        b = self.sim.branch(failing)
+        with pytest.raises(ValueError) as e:
+            b.result()
+        assert e.value.args == (110,)
+        assert "failing" in b.traceback
+
+    def testUnpicklableResult(self):
+        b = self.sim.branch(lambda sim: (lambda: None))
+        with raises_kind(SimulationError, _checkpointError.BranchResult):
+            b.result()
+
+
 class YieldConcurrentGen(TestCase):
 
     """ Basic test of yielding concurrent generators """
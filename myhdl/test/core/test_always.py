@@ -25,8 +25,8 @@ from random import randrange
 from myhdl import (AlwaysError, Signal, Simulation, StopSimulation, delay,
                    instances, intbv, now)
 from myhdl._always import _error, always
-from myhdl._Waiter import (_DelayWaiter, _EdgeTupleWaiter, _EdgeWaiter,
-                           _SignalTupleWaiter, _SignalWaiter, _Waiter)
+from myhdl._Waiter import (_FuncDelayWaiter, _FuncTupleWaiter, _FuncWaiter,
+                           _Waiter)
 from helpers import raises_kind
 
 # random.seed(3) # random, but deterministic
@@ -157,25 +157,25 @@ class TestInferWaiter:
         return inst_r, _Waiter(inst_s.gen), _Waiter(stimulus()), _Waiter(check())
 
     def testSignal1(self):
-        sim = Simulation(self.bench(SignalFunc1, _SignalWaiter))
+        sim = Simulation(self.bench(SignalFunc1, _FuncWaiter))
         sim.run()
 
     def testSignalTuple1(self):
-        sim = Simulation(self.bench(SignalTupleFunc1, _SignalTupleWaiter))
+        sim = Simulation(self.bench(SignalTupleFunc1, _FuncTupleWaiter))
         sim.run()
 
     def testDelay(self):
-        sim = Simulation(self.bench(DelayFunc, _DelayWaiter))
+        sim = Simulation(self.bench(DelayFunc, _FuncDelayWaiter))
         sim.run()
 
     def testEdge1(self):
-        sim = Simulation(self.bench(EdgeFunc1, _EdgeWaiter))
+        sim = Simulation(self.bench(EdgeFunc1, _FuncWaiter))
         sim.run()
 
     def testEdgeTuple1(self):
-        sim = Simulation(self.bench(EdgeTupleFunc1, _EdgeTupleWaiter))
+        sim = Simulation(self.bench(EdgeTupleFunc1, _FuncTupleWaiter))
         sim.run()
 
     def testGeneral(self):
-        sim = Simulation(self.bench(GeneralFunc, _Waiter))
+        sim = Simulation(self.bench(GeneralFunc, _FuncTupleWaiter))
         sim.run()
@@ -26,7 +26,7 @@ from random import randrange
 from myhdl import (AlwaysCombError, Signal, Simulation, StopSimulation, delay,
                    instances, intbv, now)
 from myhdl._always_comb import _error, always_comb
-from myhdl._Waiter import _SignalTupleWaiter, _SignalWaiter, _Waiter
+from myhdl._Waiter import _FuncTupleWaiter, _FuncWaiter, _Waiter
 from helpers import raises_kind
 
 # random.seed(3) # random, but deterministic
@@ -349,6 +349,68 @@ class TestAlwaysCombSimulation2:
         Simulation(self.bench("inc")).run(quiet=QUIET)
 
 
+class TestAlwaysCombLevelize:
+
+    def bench(self, counts):
+
+        a = Signal(intbv(0)[8:])
+        b = Signal(intbv(0)[8:])
+        c = Signal(intbv(0)[8:])
+        z = Signal(intbv(0)[8:])
+        vectors = random.sample(range(1, 256), 100)
+
+        # declared out of dependency order on purpose
+        @always_comb
+        def add():
+            counts[2] += 1
+            z.next = (a + c) % 256
+
+        @always_comb
+        def inc2():
+            counts[1] += 1
+            c.next = (b + 1) % 256
+
+        @always_comb
+        def inc1():
+            counts[0] += 1
+            b.next = (a + 1) % 256
+
+        def stimulus():
+            yield delay(10)
+            for v in vectors:
+                a.next = v
+                yield delay(10)
+                assert z == (2 * v + 2) % 256
+            raise StopSimulation("levelized always_comb test")
+
+        return add, inc2, inc1, stimulus()
+
+    def testLevelize(self):
+        counts = [0, 0, 0]
+        Simulation(self.bench(counts), levelize=True).run(quiet=QUIET)
+        assert counts == [101, 101, 101]
+
+    def testNoLevelize(self):
+        counts = [0, 0, 0]
+        Simulation(self.bench(counts)).run(quiet=QUIET)
+        assert counts[2] > 101
+
+    def testCombLoop(self):
+        a = Signal(0)
+        b = Signal(0)
+
+        @always_comb
+        def f():
+            b.next = a
+
+        @always_comb
+        def g():
+            a.next = b
+
+        with raises_kind(AlwaysCombError, _error.CombLoop):
+            Simulation(f, g, levelize=True)
+
+
 def SignalGen1(a, b, c, d, r):
 
     @always_comb
@@ -397,9 +459,9 @@ class TestInferWaiter:
         return inst_r, _Waiter(inst_s.gen), _Waiter(stimulus()), _Waiter(check())
 
     def testSignal1(self):
-        sim = Simulation(self.bench(SignalGen1, _SignalWaiter))
+        sim = Simulation(self.bench(SignalGen1, _FuncWaiter))
         sim.run()
 
     def testSignalTuple1(self):
-        sim = Simulation(self.bench(SignalTupleGen1, _SignalTupleWaiter))
+        sim = Simulation(self.bench(SignalTupleGen1, _FuncTupleWaiter))
         sim.run()
@@ -0,0 +1,118 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for the @always_postponed decorator """
+from __future__ import absolute_import
+
+from myhdl import (AlwaysError, Signal, Simulation, SimulationError,
+                   StopSimulation, always_comb, always_postponed, delay,
+                   instance, now)
+from myhdl._always_postponed import _error
+from myhdl._simulator import _error as _simError
+from helpers import raises_kind
+
+
+def chain(a, b, c):
+    """ b and c follow a in the next two delta cycles """
+
+    @always_comb
+    def first():
+        b.next = a + 1
+
+    @always_comb
+    def second():
+        c.next = b + 1
+
+    return first, second
+
+
+def stimulus(a, values):
+
+    @instance
+    def logic():
+        for v in values:
+            yield delay(10)
+            a.next = v
+        yield delay(10)
+        raise StopSimulation()
+
+    return logic
+
+
+class TestAlwaysPostponed:
+
+    def testSettledOnce(self):
+        a, b, c = [Signal(0) for i in range(3)]
+        log = []
+
+        @always_postponed(a, b, c)
+        def monitor():
+            log.append((now(), int(a), int(b), int(c)))
+
+        Simulation(chain(a, b, c), stimulus(a, [1, 1, 2, 2, 2, 5]),
+                   monitor).run(quiet=1)
+        # time 0: the chain settles; no run in timesteps without changes
+        assert log == [(0, 0, 1, 2), (10, 1, 2, 3), (30, 2, 3, 4),
+                       (60, 5, 6, 7)]
+
+    def testListOfSigs(self):
+        sigs = [Signal(0) for i in range(3)]
+        log = []
+
+        @always_postponed(sigs)
+        def monitor():
+            log.append(now())
+
+        Simulation(chain(*sigs), stimulus(sigs[0], [3, 4]),
+                   monitor).run(quiet=1)
+        assert log == [0, 10, 20]
+
+    def testDriveAtRuntime(self):
+        a, b = Signal(0), Signal(0)
+        out = {'b': b}
+
+        @always_postponed(a)
+        def monitor():
+            out['b'].next = 1
+
+        sim = Simulation(stimulus(a, [1]), monitor)
+        with raises_kind(SimulationError, _simError.PostponedDrive):
+            sim.run(quiet=1)
+
+    def testDrive(self):
+        a, b = Signal(0), Signal(0)
+        with raises_kind(AlwaysError, _error.SignalAssign):
+            @always_postponed(a)
+            def monitor():
+                b.next = a
+
+    def testArgs(self):
+        a = Signal(0)
+        with raises_kind(AlwaysError, _error.DecNrOfArgs):
+            @always_postponed()
+            def monitor():
+                pass
+        with raises_kind(AlwaysError, _error.DecArgType):
+            @always_postponed(a.posedge)
+            def monitor():
+                pass
+        with raises_kind(AlwaysError, _error.ArgType):
+            @always_postponed(a)
+            def monitor():
+                yield a
@@ -47,3 +47,46 @@ def test_reset():
             pass
     except:
         assert False
+
+
+def test_clock_domain():
+    """ clocked processes share a single waiter per edge """
+
+    clock = Signal(bool(0))
+    reset = ResetSignal(0, active=1, isasync=True)
+    counts = [Signal(intbv(0)[8:]) for i in range(3)]
+    trace = []
+
+    def counter(count, inc):
+        @always_seq(clock.posedge, reset=reset)
+        def logic():
+            count.next = count + inc
+        return logic
+
+    @always(clock.negedge)
+    def monitor():
+        trace.append([int(c) for c in counts])
+
+    @instance
+    def stimulus():
+        for i in range(3):
+            yield delay(10)
+            clock.next = 1
+            yield delay(10)
+            clock.next = 0
+        yield delay(5)
+        reset.next = 1
+        yield delay(5)
+        clock.next = 1
+        yield delay(10)
+        clock.next = 0
+        yield delay(10)
+        raise StopSimulation()
+
+    procs = [counter(c, i + 1) for i, c in enumerate(counts)]
+    sim = Simulation(procs, monitor, stimulus)
+    assert len(clock._posedgeWaiters) == 1
+    assert len(clock._negedgeWaiters) == 1
+    assert len(reset._posedgeWaiters) == 1
+    sim.run(quiet=1)
+    assert trace == [[1, 2, 3], [2, 4, 6], [3, 6, 9], [0, 0, 0]]
@@ -0,0 +1,209 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for coroutine processes and Simulation.arun """
+from __future__ import absolute_import
+
+import asyncio
+
+import pytest
+
+from myhdl import (Clock, Signal, Simulation, SimulationError, StopSimulation,
+                   always, block, delay, instance, join, now)
+from myhdl._asyncsim import _error
+from helpers import raises_kind
+
+
+def driver(a, b):
+    for i in range(1, 10):
+        yield delay(7)
+        a.next = i
+        if i % 3 == 0:
+            b.next = not b
+
+
+async def wait2(a):
+    await a
+    await a
+
+
+class TestCoroutine:
+
+    def bench(self, coroutine):
+        a, b = Signal(0), Signal(bool(0))
+        log = []
+
+        def gen():
+            yield delay(3)
+            log.append(now())
+            yield a
+            log.append(now())
+            yield b.posedge
+            log.append(now())
+            yield join(a, delay(20))
+            log.append(now())
+            yield a
+            yield a
+            log.append(now())
+
+        async def coro():
+            await delay(3)
+            log.append(now())
+            await a
+            log.append(now())
+            await b.posedge
+            log.append(now())
+            await join(a, delay(20))
+            log.append(now())
+            await wait2(a)
+            log.append(now())
+
+        proc = coro() if coroutine else gen()
+        Simulation(driver(a, b), proc).run(quiet=1)
+        return log
+
+    def testTriggers(self):
+        log = self.bench(True)
+        assert log == [3, 7, 21, 41, 49]
+        assert log == self.bench(False)
+
+    def testInstance(self):
+
+        @block
+        def top(clk, count):
+
+            @instance
+            async def logic():
+                while 1:
+                    await clk.posedge
+                    count.next = count + 1
+
+            return Clock(clk, 10), logic
+
+        clk, count = Signal(bool(0)), Signal(0)
+        dut = top(clk, count)
+        dut.run_sim(100, quiet=1)
+        assert count == 10
+        dut.quit_sim()
+
+    def testNoLoop(self):
+
+        async def coro():
+            await delay(5)
+            await asyncio.sleep(0)
+
+        sim = Simulation(coro())
+        with raises_kind(SimulationError, _error.NoLoop):
+            sim.run(quiet=1)
+
+
+class TestArun:
+
+    def testWait(self):
+        # a process that waits for I/O keeps the simulation going
+        a = Signal(0)
+        log = []
+
+        async def coro():
+            for i in range(3):
+                await delay(10)
+                a.next = await asyncio.sleep(0.01, result=i + 1)
+                log.append((now(), i + 1))
+
+        async def main():
+            sim = Simulation(coro())
+            assert await sim.arun() == 0
+
+        asyncio.run(main())
+        assert log == [(10, 1), (20, 2), (30, 3)]
+
+    def testOverlap(self):
+        clk, data = Signal(bool(0)), Signal(0)
+        edges, samples = [], []
+
+        async def source(queue):
+            for i in range(3):
+                await asyncio.sleep(0.005)
+                await queue.put(i + 1)
+
+        async def stimulus(queue):
+            for i in range(3):
+                data.next = await queue.get()
+                await clk.posedge
+                samples.append((now(), int(data)))
+
+        @always(clk.posedge)
+        def count():
+            edges.append(now())
+
+        async def main():
+            queue = asyncio.Queue()
+            sim = Simulation(Clock(clk, 10), count, stimulus(queue))
+            r, _ = await asyncio.gather(
+                sim.arun(until=lambda: len(samples) == 3, step=20),
+                source(queue))
+            assert r == 1
+            sim.quit()
+
+        asyncio.run(main())
+        assert [v for t, v in samples] == [1, 2, 3]
+        # the clock ran on while the stimulus waited for the source
+        assert edges[-1] == samples[-1][0]
+        assert len(edges) > 3
+
+    def testUntil(self):
+        clk = Signal(bool(0))
+
+        async def main():
+            sim = Simulation(Clock(clk, 10))
+            assert await sim.arun(until=clk.posedge, step=2) == 1
+            assert now() == 5
+            assert await sim.arun(32, step=5) == 1
+            assert now() == 37
+            assert await sim.arun(max_time=50) == 1
+            assert now() == 50
+            sim.quit()
+            with pytest.raises(StopSimulation):
+                await sim.arun()
+
+        asyncio.run(main())
+
+    def testUntilSteps(self):
+        clk, flag = Signal(bool(0)), Signal(bool(0))
+
+        async def main():
+            sim = Simulation(Clock(clk, 10))
+            assert await sim.arun(100, until=flag.posedge, step=1) == 1
+            assert now() == 100
+            # each step armed the condition, and removed it again
+            assert len(flag._posedgeWaiters) == 0
+            sim.quit()
+
+        asyncio.run(main())
+
+    def testStep(self):
+        clk = Signal(bool(0))
+        sim = Simulation(Clock(clk, 10))
+
+        async def main():
+            await sim.arun(100, step=0)
+
+        with pytest.raises(ValueError, match=_error.Step):
+            asyncio.run(main())
+        sim.quit()
@@ -0,0 +1,115 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for the Clock source """
+from __future__ import absolute_import
+
+import pytest
+
+from myhdl import (Clock, Signal, Simulation, always, block, delay, instance,
+                   intbv, now)
+from myhdl._clock import _error
+
+
+def edges(clk, log):
+
+    @always(clk.posedge, clk.negedge)
+    def logic():
+        log.append((now(), int(clk)))
+
+    return logic
+
+
+def run(*args):
+    Simulation(*args).run(100, quiet=1)
+
+
+class TestClock:
+
+    def testGenerator(self):
+        clk1, clk2 = Signal(bool(0)), Signal(bool(0))
+        log1, log2 = [], []
+
+        @instance
+        def clkgen():
+            while 1:
+                yield delay(5)
+                clk2.next = not clk2
+
+        run(Clock(clk1, 10), edges(clk1, log1))
+        run(clkgen, edges(clk2, log2))
+        assert log1 == log2
+        assert log1[:3] == [(5, 1), (10, 0), (15, 1)]
+
+    def testPhaseDuty(self):
+        clk = Signal(bool(0))
+        log = []
+        run(Clock(clk, 10, phase=3, duty=0.3), edges(clk, log))
+        assert log[:5] == [(10, 1), (13, 0), (20, 1), (23, 0), (30, 1)]
+
+    def testRelated(self):
+        clk, clk2 = Signal(bool(0)), Signal(bool(0))
+        count = Signal(intbv(0)[8:])
+        count2 = Signal(intbv(0)[8:])
+
+        @always(clk.posedge)
+        def fast():
+            count.next = count + 1
+
+        @always(clk2.posedge)
+        def slow():
+            count2.next = count2 + 1
+
+        run(Clock(clk, 10), Clock(clk2, 40), fast, slow)
+        assert count == 10
+        assert count2 == 3
+
+    def testBlock(self):
+
+        @block
+        def top(clk, count):
+
+            @always(clk.posedge)
+            def logic():
+                count.next = count + 1
+
+            clkgen = Clock(clk, 20)
+
+            return logic, clkgen
+
+        clk = Signal(bool(0))
+        count = Signal(intbv(0)[8:])
+        dut = top(clk, count)
+        assert dut.sigdict == {'clk': clk, 'count': count}
+        dut.run_sim(100, quiet=1)
+        assert count == 5
+        dut.quit_sim()
+
+    def testArgs(self):
+        clk = Signal(bool(0))
+        with pytest.raises(TypeError):
+            Clock(0, 10)
+        for period in (0, -2, 2.5):
+            with pytest.raises(ValueError, match=_error.Period):
+                Clock(clk, period)
+        with pytest.raises(ValueError, match=_error.Phase):
+            Clock(clk, 10, phase=-1)
+        for duty in (0, 1, 0.01):
+            with pytest.raises(ValueError, match=_error.Duty):
+                Clock(clk, 10, duty=duty)
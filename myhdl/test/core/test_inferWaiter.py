@@ -208,3 +208,17 @@ class TestInferWaiter:
     def testGeneral(self):
         sim = Simulation(self.bench(GeneralFunc, _Waiter))
         sim.run()
+
+    def testCache(self):
+        # instances of a function share the analysis, but not the kind
+        # of the names they yield
+        def gen(x):
+            while 1:
+                yield x
+
+        a = Signal(0)
+        assert type(_inferWaiter(gen(a))) is _SignalWaiter
+        assert type(_inferWaiter(gen(a.posedge))) is _Waiter
+        assert type(_inferWaiter(gen(Signal(1)))) is _SignalWaiter
+        assert len([c for c in myhdl._Waiter._yieldInfo
+                    if c is gen.__code__]) == 1
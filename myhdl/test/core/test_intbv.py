@@ -21,6 +21,7 @@
 from __future__ import absolute_import
 
 import operator
+import pickle
 import random
 import sys
 from copy import copy, deepcopy
@@ -30,6 +31,8 @@ import pytest
 
 from myhdl._compat import integer_types, long
 from myhdl._intbv import intbv
+from myhdl._modbv import modbv
+from myhdl._Signal import Signal
 
 random.seed(2)  # random, but deterministic
 maxint = sys.maxsize
@@ -564,3 +567,28 @@ class TestIntbvCopy:
                 assert n.min == m.min
                 assert n.max == m.max
                 assert len(n) == len(m)
+
+    def testSubclass(self):
+        class tagged(intbv):
+            def __init__(self, val=0, min=None, max=None, _nrbits=0):
+                intbv.__init__(self, val, min, max, _nrbits)
+                self.tag = 'tagged'
+
+        n = tagged(5, min=0, max=8)
+        for m in (copy(n), deepcopy(n), Signal(n).val):
+            assert type(m) is tagged
+            assert m.tag == 'tagged'
+            assert (m._val, m.min, m.max, len(m)) == (5, 0, 8, 3)
+
+    def testPickle(self):
+        for n in (intbv(), intbv(-12, min=-15), intbv(35)[3:],
+                  modbv(5, min=-8, max=8)):
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                m = pickle.loads(pickle.dumps(n, protocol))
+                assert type(m) is type(n)
+                assert m._val == n._val
+                assert (m.min, m.max, len(m)) == (n.min, n.max, len(n))
+
+    def testSlots(self):
+        for n in (intbv(5)[8:], intbv(5)[8:][4:], modbv(5)[8:][4:]):
+            assert not hasattr(n, '__dict__')
@@ -0,0 +1,308 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for Memory """
+from __future__ import absolute_import
+
+import pytest
+
+from myhdl import (Clock, CycleSimulation, Memory, ResetSignal, Signal,
+                   Simulation, SimulationError, always, always_comb,
+                   always_seq, block, delay, instance, intbv, modbv,
+                   traceSignals)
+from myhdl._CycleSimulation import _error as _cycleError
+from helpers import raises_kind
+
+
+@block
+def ram(clk, we, addr, din, dout, mem):
+
+    @always(clk.posedge)
+    def write():
+        if we:
+            mem[addr].next = din
+
+    @always_comb
+    def read():
+        dout.next = mem[addr]
+
+    return write, read
+
+
+@block
+def incrementer(q, clk):
+
+    @always(clk.posedge)
+    def logic():
+        q.next = q + 1
+
+    return logic
+
+
+@block
+def follower(dout, q):
+
+    @always_comb
+    def logic():
+        dout.next = q
+
+    return logic
+
+
+@block
+def wordPorts(clk, dout, mem):
+    return incrementer(mem[3], clk), follower(dout, mem[3])
+
+
+def signals():
+    return [Signal(bool(0)), Signal(bool(0)), Signal(intbv(0, min=0, max=16)),
+            Signal(intbv(0)[8:]), Signal(intbv(0)[8:])]
+
+
+def readback(mem):
+    """ Write a pattern in a RAM, and return the words read back """
+    clk, we, addr, din, dout = signals()
+    out = []
+
+    @instance
+    def stimulus():
+        for i in range(16):
+            addr.next = i
+            din.next = i * 7 & 0xff
+            we.next = 1
+            yield delay(5)
+            clk.next = 1
+            yield delay(5)
+            clk.next = 0
+        we.next = 0
+        for i in range(16):
+            addr.next = 15 - i
+            yield delay(10)
+            out.append(int(dout))
+
+    sim = Simulation(ram(clk, we, addr, din, dout, mem), stimulus)
+    sim.run(quiet=1)
+    sim.quit()
+    return out
+
+
+class TestMemory:
+
+    def testStorage(self):
+        assert Memory(intbv(0)[8:], 4)._words.typecode == 'B'
+        assert Memory(intbv(0, min=-8, max=8), 4)._words.typecode == 'b'
+        assert isinstance(Memory(intbv(0)[100:], 4)._words, list)
+        assert isinstance(Memory(intbv(0), 4)._words, list)
+
+    def testWords(self):
+        mem = Memory(intbv(5)[8:], 4, init=[1, 2, 3, 4])
+        assert len(mem) == 4
+        assert [int(w) for w in mem] == [1, 2, 3, 4]
+        assert mem[-1] == 4
+        assert mem[1] + mem[2] == 5
+        assert mem[Signal(intbv(3)[2:])] == 4
+        assert len(mem[0]) == 8
+        assert mem[0].max == 256
+        assert [int(w) for w in mem[1:3]] == [2, 3]
+        with pytest.raises(IndexError):
+            mem[4]
+
+    def testErrors(self):
+        with pytest.raises(TypeError, match="should be an intbv"):
+            Memory(0, 4)
+        with pytest.raises(ValueError, match="depth should be"):
+            Memory(intbv(0)[8:], 0)
+        with pytest.raises(ValueError, match="should have 4 values"):
+            Memory(intbv(0)[8:], 4, init=[0])
+        with pytest.raises(ValueError):
+            Memory(intbv(0)[8:], 2, init=[0, 256])
+        mem = Memory(intbv(0)[8:], 2)
+        with pytest.raises(ValueError):
+            mem[0].next = 256
+        with pytest.raises(TypeError):
+            mem[0].next = "0"
+
+    def testModbv(self):
+        mem = Memory(modbv(0, min=-8, max=8), 2, init=[7, 8])
+        assert [int(w) for w in mem] == [7, -8]
+        mem[0].next = mem[0] + 1
+        mem._update()
+        assert mem[0] == -8
+
+    def testRam(self):
+        expected = readback([Signal(intbv(0)[8:]) for i in range(16)])
+        assert readback(Memory(intbv(0)[8:], 16)) == expected
+
+    def testCombOnly(self):
+        # a memory as the only input of a combinational block
+        mem = Memory(intbv(0)[8:], 4, init=[5, 6, 7, 8])
+        out = Signal(intbv(0)[8:])
+        log = []
+
+        @always_comb
+        def read():
+            out.next = mem[0]
+
+        @instance
+        def stimulus():
+            yield delay(10)
+            log.append(int(out))
+            mem[0].next = 9
+            yield delay(10)
+            log.append(int(out))
+
+        sim = Simulation(read, stimulus)
+        sim.run(quiet=1)
+        sim.quit()
+        assert log == [5, 9]
+
+    def testWatchedWords(self):
+        mem = Memory(intbv(0)[8:], 1024)
+        woken = []
+
+        @instance
+        def watch():
+            while 1:
+                yield mem[3], mem[5].posedge
+                woken.append(int(mem[3]))
+
+        @instance
+        def stimulus():
+            for i in range(10):
+                mem[i].next = i + 10
+                yield delay(10)
+
+        sim = Simulation(watch, stimulus)
+        sim.run(quiet=1)
+        sim.quit()
+        assert woken == [13, 13]
+        # waiter lists only exist for the words that are waited on
+        assert sorted(mem._watched) == [3, 5]
+
+    def testNoReset(self):
+        clk = Signal(bool(0))
+        reset = ResetSignal(0, active=1, isasync=False)
+        count = Signal(intbv(0)[8:])
+        mem = Memory(intbv(0)[8:], 4)
+
+        @always_seq(clk.posedge, reset=reset)
+        def logic():
+            mem[count % 4].next = count + 1
+            count.next = count + 1
+
+        @instance
+        def stimulus():
+            yield delay(50)
+            reset.next = 1
+            yield delay(20)
+
+        sim = Simulation(Clock(clk, 10), logic, stimulus)
+        sim.run(70, quiet=1)
+        assert count == 0
+        assert [int(w) for w in mem] == [5, 2, 3, 4]
+        sim.quit()
+
+    def testTrace(self, tmpdir):
+        clk, we, addr, din, dout = signals()
+        mem = Memory(intbv(0)[8:], 16)
+
+        @instance
+        def stimulus():
+            we.next = 1
+            for i in range(4):
+                addr.next = i
+                din.next = i + 1
+                yield clk.negedge
+
+        with tmpdir.as_cwd():
+            traceSignals.name = 'trace'
+            try:
+                dut = traceSignals(ram(clk, we, addr, din, dout, mem))
+            finally:
+                traceSignals.name = None
+            sim = Simulation(Clock(clk, 10), dut, stimulus)
+            sim.run(100, quiet=1)
+            sim.quit()
+            vcd = tmpdir.join('trace.vcd').read()
+            assert "$var reg 8 " in vcd and " mem(15) $end" in vcd
+            # restore the written words
+            mem = Memory(intbv(0)[8:], 16)
+            sim = Simulation(Clock(clk, 10), ram(*(signals() + [mem])))
+            sim.restore('trace.vcd', 100, name='trace')
+            assert [int(w) for w in mem[:5]] == [1, 2, 3, 4, 0]
+            sim.quit()
+
+    def testWordPorts(self):
+        clk = Signal(bool(0))
+        dout = Signal(intbv(0)[8:])
+        mem = Memory(intbv(0)[8:], 4)
+        sim = Simulation(Clock(clk, 10), wordPorts(clk, dout, mem))
+        sim.run(100, quiet=1)
+        assert dout == 10
+        assert [int(w) for w in mem] == [0, 0, 0, 10]
+        sim.quit()
+
+    def testTraceWordPorts(self, tmpdir):
+        clk = Signal(bool(0))
+        dout = Signal(intbv(0)[8:])
+        mem = Memory(intbv(0)[8:], 4)
+        with tmpdir.as_cwd():
+            traceSignals.name = 'words'
+            try:
+                dut = traceSignals(wordPorts(clk, dout, mem))
+            finally:
+                traceSignals.name = None
+            sim = Simulation(Clock(clk, 10), dut)
+            sim.run(100, quiet=1)
+            assert dout == 10
+            sim.quit()
+            vcd = tmpdir.join('words.vcd').read()
+            # the port shares the code of the memory word
+            code = vcd.split(" mem(3) $end")[0].split()[-1]
+            assert "$var reg 8 %s q $end" % code in vcd
+            mem = Memory(intbv(0)[8:], 4)
+            sim = Simulation(Clock(clk, 10), wordPorts(clk, dout, mem))
+            sim.restore('words.vcd', 100, name='words')
+            assert [int(w) for w in mem] == [0, 0, 0, 10]
+            sim.quit()
+
+    def testRestoreWordPort(self, tmpdir):
+        clk = Signal(bool(0))
+        mem = Memory(intbv(0)[8:], 4)
+        with tmpdir.as_cwd():
+            traceSignals.name = 'word'
+            try:
+                dut = traceSignals(incrementer(mem[2], clk))
+            finally:
+                traceSignals.name = None
+            sim = Simulation(Clock(clk, 10), dut)
+            sim.run(50, quiet=1)
+            sim.quit()
+            # the word is only traced as a port
+            mem = Memory(intbv(0)[8:], 4)
+            sim = Simulation(Clock(clk, 10), incrementer(mem[2], clk))
+            sim.restore('word.vcd', 50, name='word')
+            assert [int(w) for w in mem] == [0, 0, 5, 0]
+            sim.quit()
+
+    def testCycleSimulation(self):
+        clk, we, addr, din, dout = signals()
+        mem = Memory(intbv(0)[8:], 16)
+        with raises_kind(SimulationError, _cycleError.MemType):
+            CycleSimulation(ram(clk, we, addr, din, dout, mem))
@@ -0,0 +1,137 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for PartitionedSimulation """
+from __future__ import absolute_import
+
+import os
+
+import pytest
+
+from myhdl import (Clock, PartitionedSimulation, Signal, Simulation,
+                   SimulationError, StopSimulation, always, block,
+                   delay, instance, intbv, now)
+from myhdl._partition import _error
+from helpers import raises_kind
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'),
+                                reason="requires os.fork")
+
+LOOKAHEAD = 3
+
+
+@block
+def domain(clk, period, acc, out, inp, stop=None):
+    """ Clock domain that mixes the other domain into an accumulator """
+
+    @always(clk.posedge)
+    def logic():
+        acc.next = (acc * 31 + inp + 1) % 65536
+        out.next = acc[8:]
+
+    @instance
+    def limit():
+        yield delay(stop)
+        raise StopSimulation()
+
+    if stop is None:
+        return Clock(clk, period), logic
+    return Clock(clk, period), logic, limit
+
+
+def signals():
+    return [Signal(intbv(0)[16:]) for i in range(2)] + \
+        [Signal(intbv(0)[8:]) for i in range(2)] + \
+        [Signal(bool(0)) for i in range(2)]
+
+
+def reference(duration):
+    """ The same design in one simulation, with explicit boundary delays """
+    acca, accb, a2b, b2a, clka, clkb = signals()
+    a2b_d = Signal(intbv(0)[8:], delay=LOOKAHEAD)
+    b2a_d = Signal(intbv(0)[8:], delay=LOOKAHEAD)
+
+    @always(a2b)
+    def da():
+        a2b_d.next = a2b
+
+    @always(b2a)
+    def db():
+        b2a_d.next = b2a
+
+    sim = Simulation(domain(clka, 10, acca, a2b, b2a_d),
+                     domain(clkb, 14, accb, b2a, a2b_d), da, db)
+    sim.run(duration, quiet=1)
+    return int(acca), int(accb)
+
+
+class TestPartitionedSimulation:
+
+    def testReference(self):
+        acca, accb, a2b, b2a, clka, clkb = signals()
+        sim = PartitionedSimulation(
+            [domain(clka, 10, acca, a2b, b2a),
+             domain(clkb, 14, accb, b2a, a2b)], lookahead=LOOKAHEAD)
+        assert sim.run(500, quiet=1) == 1
+        assert now() == 500
+        values = [(int(acca), int(accb))]
+        # continue where the first run stopped
+        assert sim.run(700, quiet=1) == 1
+        assert now() == 1200
+        values.append((int(acca), int(accb)))
+        sim.quit()
+        assert values == [reference(500), reference(1200)]
+
+    def testStop(self):
+        acca, accb, a2b, b2a, clka, clkb = signals()
+        sim = PartitionedSimulation(
+            [domain(clka, 10, acca, a2b, b2a, stop=95),
+             domain(clkb, 14, accb, b2a, a2b)], lookahead=LOOKAHEAD)
+        assert sim.run(quiet=1) == 0
+        assert now() <= 95 + LOOKAHEAD
+        with pytest.raises(StopSimulation):
+            sim.run()
+
+    def testError(self):
+        acca, accb, a2b, b2a, clka, clkb = signals()
+
+        @instance
+        def check():
+            yield delay(42)
+            raise ValueError("checker failed")
+
+        sim = PartitionedSimulation(
+            [domain(clka, 10, acca, a2b, b2a),
+             [domain(clkb, 14, accb, b2a, a2b), check]], lookahead=LOOKAHEAD)
+        with pytest.raises(ValueError, match="checker failed"):
+            sim.run(100, quiet=1)
+
+    def testArgs(self):
+        acca, accb, a2b, b2a, clka, clkb = signals()
+        a = domain(clka, 10, acca, a2b, b2a)
+        with raises_kind(SimulationError, _error.NrOfArgs):
+            PartitionedSimulation([a], lookahead=LOOKAHEAD)
+        with pytest.raises(ValueError, match=_error.Lookahead):
+            PartitionedSimulation([a, a], lookahead=0)
+        with raises_kind(SimulationError, _error.ArgType):
+            PartitionedSimulation([a, [1]], lookahead=LOOKAHEAD)
+        # a2b would be driven by both partitions
+        b = domain(clkb, 14, accb, a2b, b2a)
+        with raises_kind(SimulationError, _error.MultipleDrivers):
+            PartitionedSimulation([a, b], lookahead=LOOKAHEAD)
@@ -0,0 +1,123 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for regress """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import multiprocessing
+import sys
+
+import pytest
+
+from myhdl import Signal, block, delay, instance, now, regress
+from myhdl.__main__ import main
+from myhdl import _regress
+from myhdl._regress import _error
+
+
+@block
+def counter(limit, seed=0):
+    count = Signal(0)
+
+    @instance
+    def check():
+        while count < limit:
+            yield delay(10)
+            count.next = count + 1
+        print("seed %d at %d" % (seed, now()))
+        assert seed % 3 != 2
+
+    return check
+
+
+def counted(limit, seed=0):
+    # block objects can't be pickled, plain functions can
+    return counter(limit, seed)
+
+
+def exiting():
+    sys.exit(3)
+
+
+class TestRegress:
+
+    def testResults(self):
+        tests = [(counter, dict(limit=5, seed=i)) for i in range(6)]
+        results = regress(tests, processes=3)
+        assert [r.params['seed'] for r in results] == list(range(6))
+        assert [r.passed for r in results] == [i % 3 != 2 for i in range(6)]
+        for i, r in enumerate(results):
+            assert r.name == 'counter'
+            assert r.output.startswith("seed %d at 60\n" % i)
+            assert r.time >= 0
+            if r.passed:
+                assert r.error is None
+            else:
+                assert "AssertionError" in r.error
+
+    def testSerial(self):
+        seen = []
+        results = regress([lambda: counter(3)], processes=1,
+                          callback=seen.append)
+        assert seen == results
+        assert results[0].passed
+
+    def testUnpicklableFactory(self):
+        # forked workers inherit the factories
+        results = regress([lambda: counter(3), lambda: counter(4)],
+                          processes=2)
+        assert [r.passed for r in results] == [True, True]
+
+    def testNoFork(self, monkeypatch):
+        # the workers get the jobs, and don't inherit them
+        monkeypatch.setattr(_regress, '_canFork', lambda: False)
+        monkeypatch.setattr(multiprocessing, 'Pool',
+                            multiprocessing.get_context('spawn').Pool)
+        tests = [(counted, dict(limit=5, seed=i)) for i in range(3)]
+        results = regress(tests, processes=2)
+        assert [r.passed for r in results] == [True, True, False]
+        assert results[1].output.startswith("seed 1 at 60\n")
+        with pytest.raises(TypeError, match="should be picklable"):
+            regress([lambda: counter(3), lambda: counter(4)], processes=2)
+
+    def testExit(self):
+        results = regress([exiting, lambda: counter(3)], processes=2)
+        assert [r.passed for r in results] == [False, True]
+        assert "SystemExit" in results[0].error
+
+    def testDuration(self):
+        results = regress([(counter, dict(limit=100))], processes=1,
+                          duration=25)
+        assert results[0].passed
+        assert "Simulated 25 timesteps" in results[0].output
+
+    def testJobType(self):
+        with pytest.raises(TypeError) as e:
+            regress([1])
+        assert str(e.value) == _error.JobType
+
+    def testMain(self, capsys):
+        status = main(["-j", "2", "-p", "limit=2", "-p", "seed=0,1,2",
+                       "%s:counter" % __name__])
+        out = capsys.readouterr()[0]
+        assert status == 1
+        assert out.count("PASS") == 2
+        assert out.count("FAIL") == 1
+        assert "2 passed, 1 failed" in out
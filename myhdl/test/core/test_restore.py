@@ -0,0 +1,196 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2016 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Run the unit tests for Simulation.restore """
+from __future__ import absolute_import
+
+import pytest
+
+from myhdl import (Clock, CycleSimulation, Memory, Signal, Simulation,
+                   SimulationError, ResetSignal, always, always_seq, block,
+                   enum, intbv, now, traceSignals)
+from myhdl._restore import _error
+from helpers import raises_kind
+
+t_state = enum('IDLE', 'RUN', 'WAIT')
+
+
+@block
+def lfsr(clk, reset, data, mem, state, count):
+    """ Register-only design with a memory and an enum state """
+
+    @always_seq(clk.posedge, reset=reset)
+    def logic():
+        bit = data[15] ^ data[13] ^ data[12] ^ data[10]
+        data.next = (data << 1 | bit) & 0xffff
+        mem[count % 4].next = data[8:]
+        count.next = count + 1
+        if state == t_state.IDLE:
+            state.next = t_state.RUN
+        elif state == t_state.RUN and data[0]:
+            state.next = t_state.WAIT
+        else:
+            state.next = t_state.IDLE
+
+    return logic
+
+
+@block
+def top(clk, reset, data, mem, state, count):
+    return lfsr(clk, reset, data, mem, state, count)
+
+
+@block
+def countdown(clk, acc, mem):
+    """ Signed counter, with its values in a signed memory """
+
+    @always(clk.posedge)
+    def logic():
+        acc.next = acc - 3
+        mem[0].next = acc
+        mem[1].next = -acc
+
+    return logic
+
+
+def signals():
+    return [Signal(bool(0)), ResetSignal(1, active=1, isasync=False),
+            Signal(intbv(1)[16:]),
+            [Signal(intbv(0)[8:]) for i in range(4)],
+            Signal(t_state.IDLE), Signal(0)]
+
+
+def values(sigs):
+    clk, reset, data, mem, state, count = sigs
+    return [int(data), [int(m) for m in mem], state.val, int(count)]
+
+
+@pytest.fixture
+def vcd(tmpdir):
+    """ Trace 1000 timesteps, and return the values at 500 and 1000 """
+    with tmpdir.as_cwd():
+        sigs = signals()
+        traceSignals.name = 'top'
+        try:
+            dut = traceSignals(top(*sigs))
+        finally:
+            traceSignals.name = None
+        sim = Simulation(Clock(sigs[0], 10), dut)
+        sim.run(5, quiet=1)
+        sigs[1].next = 0
+        sim.run(495, quiet=1)
+        at500 = values(sigs)
+        sim.run(500, quiet=1)
+        at1000 = values(sigs)
+        sim.quit()
+        yield str(tmpdir.join('top.vcd')), at500, at1000
+
+
+class TestRestore:
+
+    def testRestore(self, vcd):
+        path, at500, at1000 = vcd
+        sigs = signals()
+        sim = Simulation(Clock(sigs[0], 10), top(*sigs))
+        sim.restore(path, 500)
+        assert now() == 500
+        assert values(sigs) == at500
+        sim.run(500, quiet=1)
+        assert now() == 1000
+        assert values(sigs) == at1000
+        sim.quit()
+
+    def testCycleSimulation(self, vcd):
+        path, at500, at1000 = vcd
+        for compiled in (False, True):
+            sigs = signals()
+            sim = CycleSimulation(top(*sigs), compiled=compiled)
+            sim.restore(path, 500)
+            assert values(sigs) == at500
+            sim.run(500, quiet=1)
+            assert values(sigs) == at1000
+            sim.quit()
+
+    def testTrace(self, vcd, tmpdir):
+        path, at500, at1000 = vcd
+        sigs = signals()
+        with tmpdir.as_cwd():
+            traceSignals.filename = 'cont'
+            try:
+                dut = traceSignals(top(*sigs))
+            finally:
+                traceSignals.filename = None
+            sim = Simulation(Clock(sigs[0], 10), dut)
+            sim.restore(path, 500)
+            sim.run(500, quiet=1)
+            sim.quit()
+        # the continued trace holds the same values at the end
+        sigs = signals()
+        sim = Simulation(Clock(sigs[0], 10), top(*sigs))
+        sim.restore(str(tmpdir.join('cont.vcd')), 1000)
+        assert values(sigs) == at1000
+        sim.quit()
+
+    def testErrors(self, vcd):
+        path, at500, at1000 = vcd
+        sigs = signals()
+        sim = Simulation(Clock(sigs[0], 10), top(*sigs))
+        with raises_kind(SimulationError, _error.Time):
+            sim.restore(path, 2000)
+        with raises_kind(SimulationError, _error.NoMatch):
+            sim.restore(path, 500, name='other')
+        sim.run(10, quiet=1)
+        with raises_kind(SimulationError, _error.Started):
+            sim.restore(path, 500)
+        sim.quit()
+        sim = Simulation(Clock(sigs[0], 10))
+        with raises_kind(SimulationError, _error.NoBlock):
+            sim.restore(path, 500)
+        sim.quit()
+
+    def testSigned(self, tmpdir):
+        def signed(min=-128, max=128):
+            return [Signal(bool(0)), Signal(intbv(-10, min=min, max=max)),
+                    Memory(intbv(0, min=min, max=max), 2)]
+
+        with tmpdir.as_cwd():
+            clk, acc, mem = signed()
+            traceSignals.name = 'countdown'
+            try:
+                dut = traceSignals(countdown(clk, acc, mem))
+            finally:
+                traceSignals.name = None
+            sim = Simulation(Clock(clk, 10), dut)
+            sim.run(50, quiet=1)
+            expected = [int(acc), [int(w) for w in mem]]
+            sim.quit()
+        assert expected == [-25, [-22, 22]]
+        path = str(tmpdir.join('countdown.vcd'))
+        clk, acc, mem = signed()
+        sim = Simulation(Clock(clk, 10), countdown(clk, acc, mem))
+        sim.restore(path, 50)
+        assert [int(acc), [int(w) for w in mem]] == expected
+        assert acc.val.min == -128
+        sim.quit()
+        # the values don't fit in a narrower signal
+        clk, acc, mem = signed(-16, 16)
+        sim = Simulation(Clock(clk, 10), countdown(clk, acc, mem))
+        with raises_kind(SimulationError, _error.ValueRange):
+            sim.restore(path, 50)
+        sim.quit()
@@ -120,9 +120,14 @@ def topTristate():
 def vcd_dir(tmpdir):
     with tmpdir.as_cwd():
         yield tmpdir
-    if _simulator._tracing:
-        _simulator._tf.close()
-        _simulator._tracing = 0
+    _closeTrace()
+
+
+def _closeTrace():
+    sim = _simulator._pending()
+    if sim.tracing:
+        sim.tf.close()
+        sim.tracing = 0
 
 
 class TestTraceSigs:
@@ -170,19 +175,36 @@ class TestTraceSigs:
         sim.run(1000, quiet=QUIET)
         sim.quit()
 
-        _simulator._tf.close()
-        _simulator._tracing = 0
+        _closeTrace()
         size = path.getsize(p)
         pbak = p[:-4] + '.' + str(path.getmtime(p)) + '.vcd'
         assert not path.exists(pbak)
         dut = traceSignals(fun())
-        _simulator._tf.close()
-        _simulator._tracing = 0
+        _closeTrace()
         assert path.exists(p)
         assert path.exists(pbak)
         assert path.getsize(pbak) == size
         assert path.getsize(p) < size
 
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires os.fork")
+    def testBranchTrace(self, vcd_dir):
+        p = "%s.vcd" % fun.__name__
+        pb = "%s_b.vcd" % fun.__name__
+        sim = Simulation(traceSignals(fun()))
+        sim.run(100, quiet=QUIET)
+        b = sim.branch(lambda sim: sim.run(50, quiet=QUIET), name='b')
+        sim.run(200, quiet=QUIET)
+        sim.quit()
+        b.result()
+        with open(p) as f:
+            trace = f.read()
+        with open(pb) as f:
+            branch = f.read()
+        common = trace[:trace.index("#110")]
+        assert branch.startswith(common)
+        assert "#150" in branch and "#160" not in branch
+        assert "#300" in trace
+
     def testSetDirectory(self, vcd_dir):
         traceSignals.directory = 'some_vcd_dir'
         os.mkdir(path.join(str(vcd_dir), traceSignals.directory))
@@ -191,8 +213,7 @@ class TestTraceSigs:
         pdutd = path.join(traceSignals.directory, "%s.vcd" % top.__name__)
         psubd = path.join(traceSignals.directory, "%s.vcd" % fun.__name__)
         dut = traceSignals(top())
-        _simulator._tf.close()
-        _simulator._tracing = 0
+        _closeTrace()
         traceSignals.directory = None
         assert not path.exists(pdut)
         assert not path.exists(psub)
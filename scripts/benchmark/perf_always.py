@@ -0,0 +1,119 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Time the activation of decorator based processes """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+from myhdl import *
+
+PROCESSES = 1000
+CYCLES = 200
+
+
+def combs(n, clock):
+    """ Chain of always_comb blocks, driven from a clocked counter. """
+    sigs = [Signal(modbv(0)[8:]) for i in range(n + 1)]
+
+    @always(clock.posedge)
+    def count():
+        sigs[0].next = sigs[0] + 1
+
+    def stage(a, b):
+        @always_comb
+        def logic():
+            b.next = a + 1
+        return logic
+
+    return count, [stage(sigs[i], sigs[i + 1]) for i in range(n)]
+
+
+def edges(n, clock):
+    """ Processes that wait on a clock edge and another edge. """
+    enable = Signal(bool(0))
+    sigs = [Signal(modbv(0)[8:]) for i in range(n)]
+
+    def stage(s):
+        @always(clock.posedge, enable.negedge)
+        def logic():
+            s.next = s + 1
+        return logic
+
+    return [stage(s) for s in sigs]
+
+
+def monitors(n, clock):
+    """ Testbench processes that wait on a tuple of signals. """
+    count = Signal(modbv(0)[8:])
+    sigs = [Signal(modbv(0)[8:]) for i in range(n)]
+
+    @always(clock.posedge)
+    def counter():
+        count.next = count + 1
+
+    def monitor(s):
+        @instance
+        def logic():
+            while True:
+                yield clock, count, s
+        return logic
+
+    return counter, [monitor(s) for s in sigs]
+
+
+def delays(n, clock):
+    """ Processes that wake up after a delay. """
+    sigs = [Signal(modbv(0)[8:]) for i in range(n)]
+
+    def stage(s):
+        @always(delay(10))
+        def logic():
+            s.next = s + 1
+        return logic
+
+    return [stage(s) for s in sigs]
+
+
+def bench(design, n):
+    clock = Signal(bool(0))
+
+    @always(delay(5))
+    def clkgen():
+        clock.next = not clock
+
+    return design(n, clock), clkgen
+
+
+def measure(design):
+    sim = Simulation(bench(design, PROCESSES))
+    t0 = time.time()
+    sim.run(CYCLES * 10, quiet=1)
+    t1 = time.time()
+    sim.quit()
+    return t1 - t0
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        PROCESSES = int(sys.argv[1])
+    for design in (combs, edges, monitors, delays):
+        print("%-8s %8.2f" % (design.__name__, measure(design)))
@@ -0,0 +1,72 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Compare generator clocks with Clock sources """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+from myhdl import *
+
+CLOCKS = 100
+CYCLES = 2000
+
+
+def genclock(clk, half):
+
+    @instance
+    def clkgen():
+        while True:
+            yield delay(half)
+            clk.next = not clk
+
+    return clkgen
+
+
+def bench(native):
+    clocks = [Signal(bool(0)) for i in range(CLOCKS)]
+    procs = []
+    for i, clk in enumerate(clocks):
+        # related periods: 10, 20 and 40
+        half = 5 << (i % 3)
+        if native:
+            procs.append(Clock(clk, 2 * half))
+        else:
+            procs.append(genclock(clk, half))
+    return procs
+
+
+def timeit(native):
+    sim = Simulation(bench(native))
+    t0 = time.time()
+    sim.run(CYCLES * 10, quiet=1)
+    t1 = time.time()
+    sim.quit()
+    return t1 - t0
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        CLOCKS = int(sys.argv[1])
+    tg = timeit(False)
+    tc = timeit(True)
+    print("%d clocks, %d cycles: generator %.2f s, Clock %.2f s" %
+          (CLOCKS, CYCLES, tg, tc))
@@ -0,0 +1,122 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Compare the event-driven, cycle-based and compiled simulation engines """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+from myhdl import *
+
+CYCLES = 100000
+
+
+@block
+def lfsr24(lfsr, enable, clock, reset):
+
+    @always_seq(clock.posedge, reset=reset)
+    def logic():
+        if enable:
+            lfsr.next = lfsr << 1
+            lfsr.next[0] = lfsr[23] ^ lfsr[22] ^ lfsr[21] ^ lfsr[16]
+
+    return logic
+
+
+@block
+def adder(s, a, inc):
+
+    @always_comb
+    def add():
+        s.next = a + inc
+
+    return add
+
+
+@block
+def pipeline(dout, clock, reset, depth=8):
+
+    stages = [Signal(modbv(0)[16:]) for i in range(depth)]
+    sums = [Signal(modbv(0)[16:]) for i in range(depth)]
+
+    @always_seq(clock.posedge, reset=reset)
+    def regs():
+        stages[0].next = sums[depth - 1]
+        for i in range(1, depth):
+            stages[i].next = sums[i - 1]
+
+    adders = [adder(sums[i], stages[i], i + 1) for i in range(depth)]
+
+    @always_comb
+    def out():
+        dout.next = concat(sums[depth - 1][8:], sums[0][8:])
+
+    return regs, adders, out
+
+
+@block
+def clkgen(clock):
+
+    @instance
+    def gen():
+        while True:
+            yield delay(5)
+            clock.next = not clock
+
+    return gen
+
+
+def lfsr24_bench():
+    lfsr = Signal(modbv(1)[24:])
+    enable = Signal(bool(1))
+    clock = Signal(bool(0))
+    reset = ResetSignal(0, active=1, isasync=True)
+    return lfsr24(lfsr, enable, clock, reset), clock
+
+
+def pipeline_bench():
+    dout = Signal(intbv(0)[16:])
+    clock = Signal(bool(0))
+    reset = ResetSignal(0, active=1, isasync=False)
+    return pipeline(dout, clock, reset), clock
+
+
+def measure(bench, engine):
+    dut, clock = bench()
+    if engine == 'event':
+        sim = Simulation(dut, clkgen(clock))
+    else:
+        sim = CycleSimulation(dut, compiled=(engine == 'compiled'))
+    t0 = time.time()
+    sim.run(CYCLES * 10, quiet=1)
+    t1 = time.time()
+    sim.quit()
+    return t1 - t0
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        CYCLES = int(sys.argv[1])
+    engines = ('event', 'cycle', 'compiled')
+    print("%-10s" % "design" + "".join("%10s" % e for e in engines))
+    for name, bench in (("lfsr24", lfsr24_bench), ("pipeline", pipeline_bench)):
+        print("%-10s" % name +
+              "".join("%10.2f" % measure(bench, e) for e in engines))
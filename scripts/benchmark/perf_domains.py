@@ -0,0 +1,69 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Time many registers on a single clock """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+from myhdl import *
+
+REGISTERS = 5000
+CYCLES = 200
+
+
+@block
+def register(q, d, clock, reset):
+
+    @always_seq(clock.posedge, reset=reset)
+    def logic():
+        q.next = d
+
+    return logic
+
+
+@block
+def bench(n):
+    clock = Signal(bool(0))
+    reset = ResetSignal(0, active=1, isasync=True)
+    regs = [Signal(modbv(0)[8:]) for i in range(n + 1)]
+    chain = [register(regs[i + 1], regs[i], clock, reset) for i in range(n)]
+
+    @instance
+    def clkgen():
+        while True:
+            yield delay(5)
+            clock.next = not clock
+            if clock:
+                regs[0].next = regs[0] + 1
+
+    return chain, clkgen
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        REGISTERS = int(sys.argv[1])
+    sim = Simulation(bench(REGISTERS))
+    t0 = time.time()
+    sim.run(CYCLES * 10, quiet=1)
+    t1 = time.time()
+    sim.quit()
+    print("%d registers, %d cycles: %.2f s" % (REGISTERS, CYCLES, t1 - t0))
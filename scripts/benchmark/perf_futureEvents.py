@@ -0,0 +1,53 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Measure the cost of the future event list for many pending delays """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import random
+import sys
+import time
+from random import randrange
+random.seed(1) # random, but deterministic
+
+from myhdl import *
+
+
+STEPS = 20
+
+
+def sleeper():
+    for i in range(STEPS):
+        yield delay(randrange(1, 100))
+
+
+def bench(n):
+    return [sleeper() for i in range(n)]
+
+
+if __name__ == '__main__':
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 5000, 10000, 20000]
+    print("%10s %10s %10s" % ("pending", "events", "seconds"))
+    for n in sizes:
+        sim = Simulation(bench(n))
+        t0 = time.time()
+        sim.run(quiet=1)
+        t1 = time.time()
+        print("%10d %10d %10.2f" % (n, n * STEPS, t1 - t0))
@@ -22,6 +22,7 @@ from __future__ import absolute_import
 
 
 import random
+import time
 from random import randrange
 random.seed(1) # random, but deterministic
 
@@ -62,11 +63,27 @@ def bench(genFunc, waiterType):
     return gen_inst_s, _Waiter(stimulus())
 
 
-gen = SignalGen2
+def construction(n):
+    """ Time the construction of a simulation of n generator instances """
+    a, b, c, d = [Signal(intbv()) for i in range(4)]
+    s = [Signal(intbv()) for i in range(n)]
+    gens = [SignalFunc2(a, b, c, d, s[i]) for i in range(n)]
+    t0 = time.time()
+    sim = Simulation(gens)
+    t1 = time.time()
+    sim.quit()
+    return t1 - t0
 
-waiter = _Waiter
 
-sim = Simulation(bench(gen, waiter))
-sim.run()
+if __name__ == '__main__':
+    gen = SignalFunc2
 
+    waiter = _Waiter
 
+    sim = Simulation(bench(gen, waiter))
+    t0 = time.time()
+    sim.run()
+    print("simulation: %.2f s" % (time.time() - t0))
+
+    for n in (1000, 10000):
+        print("construction of %d instances: %.2f s" % (n, construction(n)))
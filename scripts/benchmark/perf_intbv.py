@@ -0,0 +1,75 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Measure the memory and time to build many intbv registers """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import time
+import tracemalloc
+
+from myhdl import Signal, concat, intbv, modbv
+
+REGISTERS = 200000
+
+
+def registers(n):
+    # the usual declarations: by slicing, with bounds, and memories
+    regs = [Signal(intbv(0)[32:]) for i in range(n // 2)]
+    regs += [Signal(modbv(0, min=-128, max=128)) for i in range(n // 4)]
+    regs += [Signal(intbv(0)[8:]) for i in range(n // 4)]
+    return regs
+
+
+def values(n):
+    return [intbv(0)[32:] for i in range(n)]
+
+
+def memory(build, n):
+    tracemalloc.start()
+    objs = build(n)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return size
+
+
+def elaboration(n):
+    t0 = time.time()
+    registers(n)
+    return time.time() - t0
+
+
+def operations(n):
+    a = intbv(0x12345678)[32:]
+    b = modbv(0xabcd)[16:]
+    t0 = time.time()
+    for i in range(n):
+        a[16:8]
+        b[12:]
+        concat(a[8:], b[4:], True)
+    return time.time() - t0
+
+
+if __name__ == '__main__':
+    print("registers: %d" % REGISTERS)
+    print("memory, signals: %.1f MB" % (memory(registers, REGISTERS) / 1e6))
+    print("memory, values: %.1f MB" % (memory(values, REGISTERS) / 1e6))
+    print("elaboration: %.2f s" % elaboration(REGISTERS))
+    print("slice and concat: %.2f s" % operations(REGISTERS))
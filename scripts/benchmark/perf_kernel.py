@@ -0,0 +1,63 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Compare the pure Python and the C simulation kernels """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+import myhdl._Simulation
+from myhdl import *
+
+from test_timer import test_timer
+from test_lfsr24 import test_lfsr24
+from test_longdiv import test_longdiv
+from timer import timer_sig, timer_var
+from perf_futureEvents import bench as sleepers
+
+DURATION = 200000
+
+_simrunc = myhdl._Simulation._simrunc
+
+
+def measure(bench, kernel):
+    myhdl._Simulation._simrunc = kernel
+    sim = Simulation(bench())
+    t0 = time.time()
+    sim.run(DURATION, quiet=1)
+    t1 = time.time()
+    sim.quit()
+    return t1 - t0
+
+
+if __name__ == '__main__':
+    if _simrunc is None:
+        sys.exit("The C kernel is not built: run 'python setup.py build_ext -i'")
+    if len(sys.argv) > 1:
+        DURATION = int(sys.argv[1])
+    print("%-12s %10s %10s" % ("design", "python", "c"))
+    for name, bench in (("timer_sig", lambda: test_timer(timer_sig)),
+                        ("timer_var", lambda: test_timer(timer_var)),
+                        ("lfsr24", test_lfsr24),
+                        ("longdiv", test_longdiv),
+                        ("sleepers", lambda: sleepers(5000))):
+        print("%-12s %10.2f %10.2f" % (name, measure(bench, None),
+                                       measure(bench, _simrunc)))
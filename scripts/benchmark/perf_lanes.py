@@ -0,0 +1,78 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Compare N compiled simulations with one simulation of N lanes """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+from myhdl import *
+
+from perf_compiled import lfsr24
+
+CYCLES = 20000
+
+
+def seeds(n):
+    return [(i * 7919 + 1) % (1 << 24) or 1 for i in range(n)]
+
+
+def bench():
+    lfsr = Signal(modbv(1)[24:])
+    enable = Signal(bool(1))
+    clock = Signal(bool(0))
+    reset = ResetSignal(0, active=1, isasync=True)
+    return lfsr24(lfsr, enable, clock, reset), lfsr
+
+
+def separate(n):
+    results = []
+    t0 = time.time()
+    for seed in seeds(n):
+        dut, lfsr = bench()
+        sim = CycleSimulation(dut, compiled=True)
+        lfsr.next = seed
+        sim.run(CYCLES * 10, quiet=1)
+        results.append(int(lfsr))
+        sim.quit()
+    return time.time() - t0, results
+
+
+def lanes(n):
+    t0 = time.time()
+    dut, lfsr = bench()
+    sim = CycleSimulation(dut, lanes=n)
+    sim.drive(lfsr, seeds(n))
+    sim.run(CYCLES * 10, quiet=1)
+    results = [int(v) for v in sim.values(lfsr)]
+    sim.quit()
+    return time.time() - t0, results
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        CYCLES = int(sys.argv[1])
+    print("%-6s %10s %10s %8s" % ("lanes", "compiled", "lanes", "speedup"))
+    for n in (1, 10, 100, 1000):
+        t1, r1 = separate(n)
+        t2, r2 = lanes(n)
+        assert r1 == r2
+        print("%-6d %10.2f %10.2f %8.1f" % (n, t1, t2, t1 / t2))
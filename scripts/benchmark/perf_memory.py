@@ -0,0 +1,85 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Compare a Memory with a list of signals, for a large RAM """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import time
+import tracemalloc
+
+from myhdl import *
+
+DEPTH = 1 << 18
+CYCLES = 20000
+
+
+def signals(depth):
+    return [Signal(intbv(0)[32:]) for i in range(depth)]
+
+
+def memory(depth):
+    return Memory(intbv(0)[32:], depth)
+
+
+def size(build, depth):
+    tracemalloc.start()
+    mem = build(depth)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del mem
+    return size
+
+
+@block
+def ram(clk, addr, dout, mem):
+
+    @always(clk.posedge)
+    def logic():
+        mem[addr].next = addr
+        dout.next = mem[addr ^ 1]
+
+    return logic
+
+
+def simulation(build, depth, cycles):
+    clk = Signal(bool(0))
+    addr = Signal(intbv(0, min=0, max=depth))
+    dout = Signal(intbv(0)[32:])
+
+    @always(clk.negedge)
+    def step():
+        addr.next = (addr + 9973) % depth
+
+    t0 = time.time()
+    sim = Simulation(Clock(clk, 10), step, ram(clk, addr, dout, build(depth)))
+    t1 = time.time()
+    sim.run(cycles * 10, quiet=1)
+    t2 = time.time()
+    sim.quit()
+    return t1 - t0, t2 - t1
+
+
+if __name__ == '__main__':
+    print("depth: %d words" % DEPTH)
+    for name, build in (("list of signals", signals), ("Memory", memory)):
+        print("%s:" % name)
+        print("  memory: %.1f MB" % (size(build, DEPTH) / 1e6))
+        print("  elaboration: %.2f s, simulation: %.2f s" %
+              simulation(build, DEPTH, CYCLES))
@@ -0,0 +1,120 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Compare one Simulation with a PartitionedSimulation of clock domains """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+from myhdl import *
+
+DOMAINS = 4
+REGISTERS = 300
+DURATION = 20000
+# delay of the synchronizers between the domains
+LOOKAHEAD = 20
+
+
+@block
+def domain(clock, period, ptr, other, n):
+    """ Register pipeline that passes a gray coded pointer on """
+    regs = [Signal(modbv(0)[16:]) for i in range(n)]
+    count = Signal(modbv(0)[8:])
+
+    @always(clock.posedge)
+    def head():
+        regs[0].next = regs[0] * 5 + other + 1
+        count.next = count + 1
+        ptr.next = count ^ (count >> 1)
+
+    stages = [stage(clock, regs[i + 1], regs[i]) for i in range(n - 1)]
+
+    return Clock(clock, period), head, stages
+
+
+@block
+def stage(clock, q, d):
+
+    @always(clock.posedge)
+    def logic():
+        q.next = d ^ (d >> 3)
+
+    return logic
+
+
+@block
+def sync(d, s):
+
+    @always(s)
+    def logic():
+        d.next = s
+
+    return logic
+
+
+def signals():
+    clocks = [Signal(bool(0)) for i in range(DOMAINS)]
+    ptrs = [Signal(intbv(0)[8:]) for i in range(DOMAINS)]
+    return clocks, ptrs
+
+
+def periods():
+    # unrelated clock periods
+    return [10 + 4 * i for i in range(DOMAINS)]
+
+
+def single():
+    clocks, ptrs = signals()
+    synced = [Signal(intbv(0)[8:], delay=LOOKAHEAD) for i in range(DOMAINS)]
+
+    procs = [sync(synced[i], ptrs[i]) for i in range(DOMAINS)]
+    for i, period in enumerate(periods()):
+        procs.append(domain(clocks[i], period, ptrs[i],
+                            synced[i - 1], REGISTERS))
+    sim = Simulation(procs)
+    t0 = time.time()
+    sim.run(DURATION, quiet=1)
+    t1 = time.time()
+    sim.quit()
+    return t1 - t0
+
+
+def partitioned():
+    clocks, ptrs = signals()
+    parts = [domain(clocks[i], period, ptrs[i], ptrs[i - 1], REGISTERS)
+             for i, period in enumerate(periods())]
+    sim = PartitionedSimulation(parts, lookahead=LOOKAHEAD)
+    t0 = time.time()
+    sim.run(DURATION, quiet=1)
+    t1 = time.time()
+    sim.quit()
+    return t1 - t0
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        DOMAINS = int(sys.argv[1])
+    print("%d cores, %d domains of %d registers, lookahead %d" %
+          (len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity')
+           else 1, DOMAINS, REGISTERS, LOOKAHEAD))
+    print("Simulation:            %.2f s" % single())
+    print("PartitionedSimulation: %.2f s" % partitioned())
@@ -0,0 +1,68 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Measure signal assignments, and a counter simulation """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import time
+
+from myhdl import *
+
+N = 1000000
+
+
+def assignments(sig, n):
+    t0 = time.time()
+    for i in range(n):
+        sig.next = i
+    return time.time() - t0
+
+
+@block
+def counters(clk, regs):
+
+    @always(clk.posedge)
+    def logic():
+        for r in regs:
+            r.next = r + 3
+
+    return Clock(clk, 10), logic
+
+
+def simulation(n):
+    clk = Signal(bool(0))
+    regs = [Signal(modbv(0)[16:]) for i in range(100)] + \
+        [Signal(modbv(0, min=-2**15, max=2**15)) for i in range(100)] + \
+        [Signal(intbv(0, min=0, max=2**32)) for i in range(100)]
+    sim = Simulation(counters(clk, regs))
+    t0 = time.time()
+    sim.run(n // 30, quiet=1)
+    sim.quit()
+    return time.time() - t0
+
+
+if __name__ == '__main__':
+    sigs = [("intbv[32:]", Signal(intbv(0)[32:])),
+            ("modbv[16:]", Signal(modbv(0)[16:])),
+            ("signed modbv", Signal(modbv(0, min=-2**15, max=2**15))),
+            ("modbv(min=3, max=1000)", Signal(modbv(3, min=3, max=1000)))]
+    for name, sig in sigs:
+        print("%s: %.2f s" % (name, assignments(sig, N)))
+    print("simulation: %.2f s" % simulation(N))
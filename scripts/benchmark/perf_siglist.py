@@ -0,0 +1,86 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Count the number of signal updates in the benchmark designs """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import sys
+import time
+
+import myhdl
+from myhdl import *
+from myhdl._Signal import _Signal
+
+from test_timer import test_timer
+from test_lfsr24 import test_lfsr24
+from test_longdiv import test_longdiv
+from timer import timer_sig, timer_var
+
+DURATION = 200000
+
+_calls = [0]
+_update = _Signal._update
+
+
+def _countingUpdate(self):
+    _calls[0] += 1
+    return _update(self)
+
+_Signal._update = _countingUpdate
+
+
+def test_bitrev(width=32):
+
+    din = Signal(intbv(0)[width:])
+    dout = Signal(intbv(0)[width:])
+
+    @always_comb
+    def logic():
+        for i in range(width):
+            dout.next[i] = din[width-1-i]
+
+    @instance
+    def stimulus():
+        while True:
+            yield delay(10)
+            din.next = (din + 12345) % 2**width
+
+    return logic, stimulus
+
+
+def measure(name, bench):
+    _calls[0] = 0
+    sim = Simulation(bench)
+    t0 = time.time()
+    sim.run(DURATION, quiet=1)
+    t1 = time.time()
+    sim.quit()
+    print("%-12s %12d %10.2f" % (name, _calls[0], t1 - t0))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        DURATION = int(sys.argv[1])
+    print("%-12s %12s %10s" % ("design", "_update", "seconds"))
+    measure("timer_sig", test_timer(timer_sig))
+    measure("timer_var", test_timer(timer_var))
+    measure("lfsr24", test_lfsr24())
+    measure("longdiv", test_longdiv())
+    measure("bitrev", test_bitrev())
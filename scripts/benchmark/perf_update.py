@@ -0,0 +1,86 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Measure the size of signals, and the update of a 100k-signal design """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import time
+import tracemalloc
+
+from myhdl import *
+
+SIGNALS = 100000
+CYCLES = 20
+
+
+def size(build, n):
+    tracemalloc.start()
+    sigs = build(n)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del sigs
+    return size / n
+
+
+def updates(n, rounds):
+    sigs = [Signal(intbv(0)[32:]) for i in range(n)]
+    t0 = time.time()
+    for r in range(1, rounds + 1):
+        for s in sigs:
+            s._next._val = r
+            s._update()
+    return n * rounds / (time.time() - t0)
+
+
+@block
+def registers(clk, regs, n):
+
+    first, last = regs[0], regs[n - 1]
+
+    # only the last register is read by another process
+    @always(clk.posedge)
+    def logic():
+        for i in range(n - 1, 0, -1):
+            regs[i].next = regs[i - 1] + 1
+
+    @always_comb
+    def output():
+        first.next = last
+
+    return Clock(clk, 10), logic, output
+
+
+def simulation(n, cycles):
+    clk = Signal(bool(0))
+    regs = [Signal(modbv(0)[32:]) for i in range(n)]
+    sim = Simulation(registers(clk, regs, n))
+    t0 = time.time()
+    sim.run(cycles * 10, quiet=1)
+    sim.quit()
+    return time.time() - t0
+
+
+if __name__ == '__main__':
+    print("bytes per signal, intbv: %d" %
+          size(lambda n: [Signal(intbv(0)[32:]) for i in range(n)], SIGNALS))
+    print("bytes per signal, bool: %d" %
+          size(lambda n: [Signal(bool(0)) for i in range(n)], SIGNALS))
+    print("_update: %.2f M/s" % (updates(SIGNALS, 10) / 1e6))
+    print("simulation: %.2f s" % simulation(SIGNALS, CYCLES))
@@ -0,0 +1,62 @@
+#  This file is part of the myhdl library, a Python package for using
+#  Python as a Hardware Description Language.
+#
+#  Copyright (C) 2003-2008 Jan Decaluwe
+#
+#  The myhdl library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public License as
+#  published by the Free Software Foundation; either version 2.1 of the
+#  License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library; if not, write to the Free Software
+#  Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+""" Measure the propagation of signals with transaction-level values """
+from __future__ import absolute_import
+from __future__ import print_function
+
+import time
+from collections import namedtuple
+
+import myhdl
+from myhdl import Signal
+
+N = 200000
+
+Packet = namedtuple('Packet', 'addr data kind last')
+
+
+class Fixed(object):
+
+    """ Minimal fixed-point value, read-only once built """
+
+    def __init__(self, val, frac=8):
+        self.val = val
+        self.frac = frac
+
+    def __myhdl_freeze__(self):
+        return self
+
+
+def propagate(sig, values, n):
+    t0 = time.time()
+    for i in range(n):
+        sig.next = values[i & 1]
+        sig._update()
+    return time.time() - t0
+
+
+if __name__ == '__main__':
+    if hasattr(myhdl, 'immutable'):
+        myhdl.immutable(Packet)
+    packets = [Packet(i, 2 * i, 'write', False) for i in range(2)]
+    fixed = [Fixed(i) for i in range(2)]
+    print("float: %.2f s" % propagate(Signal(0.0), [0.5, 1.5], N))
+    print("tuple record: %.2f s" % propagate(Signal(packets[0]), packets, N))
+    print("fixed-point: %.2f s" % propagate(Signal(fixed[0]), fixed, N))
@@ -2,6 +2,7 @@
 
 import ast
 import fnmatch
+import platform
 import re
 import os
 import sys
@@ -14,9 +15,9 @@ if sys.version_info < (2, 6) or (3, 0) <= sys.version_info < (3, 4):
 
 # Prefer setuptools over distutils
 try:
-    from setuptools import setup
+    from setuptools import setup, Extension
 except ImportError:
-    from distutils.core import setup
+    from distutils.core import setup, Extension
 
 
 _version_re = re.compile(r'__version__\s+=\s+(.*)')
@@ -33,6 +34,13 @@ for base, dir, files in os.walk('cosimulation'):
         if good:
             cosim_data[base].extend(os.path.join(base, f) for f in good)
 
+# The C simulation kernel is optional: if it can't be built, the
+# simulator uses the pure Python event loop.
+ext_modules = []
+if platform.python_implementation() == 'CPython':
+    ext_modules.append(Extension('myhdl._simrunc', ['myhdl/_simrunc.c'],
+                                 optional=True))
+
 setup(
     name="myhdl",
     version=version,
@@ -42,6 +50,7 @@ setup(
     author_email="jan@jandecaluwe.com",
     url="http://www.myhdl.org",
     packages=['myhdl', 'myhdl.conversion'],
+    ext_modules=ext_modules,
     data_files=[(os.path.join(data_root, k), v) for k, v in cosim_data.items()],
     license="LGPL",
     platforms='any',